@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Length Check + Continuation for LeadHorizon Blog Automation
+Counts words per H2 section of a generated article. When sections are missing or too
+short, asks the model to continue instead of regenerating: each request passes back
+the `context` tokens Ollama returned with the generation (saved in
+output/llm_context_article.json), so the prompt and research are not prefilled again
+and only the new tokens are decoded. Missing sections are inserted before the closing
+(call-to-action) section; short sections get extra H3 subsections at their end.
+Loops until the article meets its targets or the token/time budget is spent.
+
+Usage: generate_blog.sh pipes the response through it:
+  article_continuation.py < response > response   (always prints a usable response)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from ollama_client import OllamaClient, OllamaError
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MIN_WORDS = 1500
+DEFAULT_SECTION_WORDS = 200
+DEFAULT_SECTIONS = 6
+DEFAULT_TOKEN_BUDGET = 2000
+DEFAULT_TIME_BUDGET = 180
+
+# Tokens asked for per continuation request (capped by what is left of the budget)
+STEP_TOKENS = 700
+MAX_STEPS = 8
+
+
+def context_path(ctx):
+    return os.path.join(ctx.output_dir, 'llm_context_article.json')
+
+
+def response_hash(text):
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+def save_contexts(ctx, response, article=None, outline=None, sections=None):
+    """Remember the context tokens behind a response: the whole generation (single
+    pass), or the outline and each section by heading (section mode)"""
+    data = {"response": response_hash(response), "article": article, "outline": outline,
+            "sections": sections or {}}
+    os.makedirs(ctx.output_dir, exist_ok=True)
+    tmp_path = context_path(ctx) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, context_path(ctx))
+
+
+def load_contexts(ctx, response):
+    """Saved contexts if they belong to this exact response (not a cached or older one)"""
+    try:
+        with open(context_path(ctx), 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get("response") == response_hash(response) else None
+
+
+def word_count(html):
+    return len(re.sub(r'<[^>]+>', ' ', html).split())
+
+
+def split_sections(content):
+    """(lead, [(heading, section html)]) of the <content> body, split at each <h2>"""
+    starts = [m.start() for m in re.finditer(r'<h2[\s>]', content, re.IGNORECASE)]
+    if not starts:
+        return content, []
+    sections = []
+    for i, start in enumerate(starts):
+        html = content[start:starts[i + 1] if i + 1 < len(starts) else len(content)]
+        heading = re.search(r'<h2[^>]*>(.*?)</h2>', html, re.DOTALL | re.IGNORECASE)
+        sections.append((re.sub(r'<[^>]+>', '', heading.group(1)).strip() if heading else '', html))
+    return content[:starts[0]], sections
+
+
+class LengthTargets:
+    """Article length and structure targets (LENGTH_* in config.sh)"""
+
+    def __init__(self, min_words=DEFAULT_MIN_WORDS, section_words=DEFAULT_SECTION_WORDS, sections=DEFAULT_SECTIONS):
+        self.min_words = min_words
+        self.section_words = section_words
+        self.sections = sections
+
+    def next_fix(self, sections):
+        """('add', None) for a missing section, ('extend', index) for the shortest short
+        one, or None when the article meets its targets"""
+        total = sum(word_count(html) for _, html in sections)
+        if len(sections) < self.sections:
+            return ('add', None)
+        short = [(word_count(html), i) for i, (_, html) in enumerate(sections)
+                 if word_count(html) < self.section_words]
+        if short:
+            return ('extend', min(short)[1])
+        if total < self.min_words:
+            return ('extend', min((word_count(html), i) for i, (_, html) in enumerate(sections))[1])
+        return None
+
+
+# Words of the introduction quoted when the model has only seen the outline
+LEAD_WORDS = 120
+
+
+def add_prompt(sections, lead=None):
+    """Prompt for one more section; lead (the article introduction) is quoted when the
+    context is only the outline exchange, so the model knows what was written from it"""
+    headings = '\n'.join(f"- {h2}" for h2, _ in sections)
+    if lead is None:
+        opening = "The article above is too short."
+    else:
+        intro = ' '.join(re.sub(r'<[^>]+>', ' ', lead).split()[:LEAD_WORDS])
+        opening = f"The article written from the outline above is too short. It opens with:\n\"{intro}\""
+    return f"""{opening}
+Write ONE more H2 section (250-350 words) on an aspect not yet covered by these sections:
+{headings}
+
+Start with <h2>, then 2 <h3> subsections with <p> paragraphs and a <ul> of at least 5 <li> items.
+Use ONLY <h2>, <h3>, <p>, <ul>, <li>, <strong>, <em>. No conclusion or call-to-action. Output only the new HTML."""
+
+
+def extend_prompt(heading):
+    return f"""The section "{heading}" above is too short. Write 2 more <h3> subsections for it (150-200 words in total) with <p> paragraphs and concrete Delhi NCR examples, without repeating what it already says.
+Use ONLY <h3>, <p>, <ul>, <li>, <strong>, <em>. Output only the new HTML, starting with <h3>."""
+
+
+def clean_fragment(text, start_tag):
+    text = re.sub(r'```(?:html)?', '', text)
+    text = re.sub(r'</?(?:content|title|meta_description|h1)[^>]*>', '', text, flags=re.IGNORECASE)
+    at = text.lower().find(start_tag)
+    return text[at:].strip() if at >= 0 else ''
+
+
+def continue_article(client, response, contexts, targets, token_budget, time_budget):
+    """The response with missing/short sections filled in by continuation requests"""
+    match = re.search(r'(<content>)(.*?)(</content>)', response, re.DOTALL | re.IGNORECASE)
+    if not match:
+        return response
+    lead, sections = split_sections(match.group(2))
+    if not sections:
+        return response
+
+    started = time.time()
+    used = 0
+    for _ in range(MAX_STEPS):
+        fix = targets.next_fix(sections)
+        if not fix:
+            break
+        left = token_budget - used
+        if left < 100 or time.time() - started > time_budget:
+            print(f"⏳ Continuation budget spent ({used} tokens, {time.time() - started:.0f}s)", file=sys.stderr)
+            break
+
+        action, index = fix
+        if action == 'add':
+            heading = None
+            context = contexts.get('article') or contexts.get('outline')
+            # section mode: the outline context has not seen the article itself
+            prompt = add_prompt(sections, None if contexts.get('article') else lead)
+            start_tag = '<h2'
+        else:
+            heading = sections[index][0]
+            context = contexts.get('sections', {}).get(heading) or contexts.get('article')
+            prompt, start_tag = extend_prompt(heading), '<h3'
+        if not context:
+            print("⚠️ No saved model context for this article; not continuing", file=sys.stderr)
+            break
+
+        remaining = max(1, int(time_budget - (time.time() - started)))
+        try:
+            result = client.generate(prompt, {"num_predict": min(STEP_TOKENS, left), "temperature": 0.7},
+                                     label='continuation', timeout=remaining, context=context)
+        except OllamaError as e:
+            print(f"⚠️ Continuation failed: {e}", file=sys.stderr)
+            break
+        used += result.get('eval_count', 0)
+        fragment = clean_fragment(result.get('response', ''), start_tag)
+        if not fragment:
+            print("⚠️ Continuation returned no usable HTML", file=sys.stderr)
+            break
+
+        # the next request continues from here, including what was just written
+        if action == 'add':
+            contexts['article' if contexts.get('article') else 'outline'] = result.get('context')
+            title = re.sub(r'<[^>]+>', '', fragment.split('</h2>')[0]).strip()
+            position = len(sections) - 1 if len(sections) > 1 else len(sections)
+            sections.insert(position, (title, fragment + '\n'))
+            print(f"➕ Added section \"{title}\" ({word_count(fragment)} words)", file=sys.stderr)
+        else:
+            if heading in contexts.get('sections', {}):
+                contexts['sections'][heading] = result.get('context')
+            else:
+                contexts['article'] = result.get('context')
+            sections[index] = (heading, sections[index][1].rstrip() + '\n' + fragment + '\n')
+            print(f"📝 Extended \"{heading}\" (+{word_count(fragment)} words)", file=sys.stderr)
+
+    content = lead + ''.join(html for _, html in sections)
+    total = sum(word_count(html) for _, html in sections)
+    print(f"📏 {len(sections)} sections, {total} words ({used} continuation tokens)", file=sys.stderr)
+    return response[:match.start(2)] + content + response[match.end(2):]
+
+
+def main():
+    response = sys.stdin.read()
+    ctx = RunContext.load()
+    config = ctx.config
+    targets = LengthTargets(
+        min_words=int(config.get('LENGTH_MIN_WORDS', '') or DEFAULT_MIN_WORDS),
+        section_words=int(config.get('LENGTH_SECTION_WORDS', '') or DEFAULT_SECTION_WORDS),
+        sections=int(config.get('LENGTH_SECTIONS', '') or DEFAULT_SECTIONS),
+    )
+    token_budget = int(config.get('LENGTH_TOKEN_BUDGET', '') or DEFAULT_TOKEN_BUDGET)
+    time_budget = int(config.get('LENGTH_TIME_BUDGET', '') or DEFAULT_TIME_BUDGET)
+
+    match = re.search(r'<content>(.*?)</content>', response, re.DOTALL | re.IGNORECASE)
+    if match and targets.next_fix(split_sections(match.group(1))[1]):
+        contexts = load_contexts(ctx, response)
+        if contexts:
+            response = continue_article(OllamaClient.from_context(ctx), response, contexts, targets,
+                                        token_budget, time_budget)
+        else:
+            print("⚠️ Article is below its length targets, but there is no saved model context to continue from",
+                  file=sys.stderr)
+    sys.stdout.write(response)
+
+
+if __name__ == "__main__":
+    main()
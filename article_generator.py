@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Outline-First Article Generator for LeadHorizon Blog Automation
+GENERATION_MODE="sections": instead of one long 4096-token decode, ask for a short
+outline (title, meta description, 6 H2 sections with their H3s) and then write every
+section as its own request, OLLAMA_NUM_PARALLEL at a time, so the article takes about
+as long as its slowest section. All section prompts start with the same text (brief,
+research, outline) and differ only in the final instruction, so each server slot
+re-uses the prefilled prefix.
+
+Prints the assembled <title>/<meta_description>/<content> response on stdout, in the
+same format as a single-pass generation; exit 1 when too few sections came back
+(generate_blog.sh then falls back to single-pass generation).
+
+Usage: article_generator.py --payload FILE [--timeout S] [--no-cache]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from article_continuation import save_contexts, split_sections
+from llm_cache import LLMCache, cache_key
+from ollama_client import OllamaClient, OllamaError
+from pipeline_context import RunContext
+
+NUM_SECTIONS = 6
+DEFAULT_PARALLEL = 4
+
+OUTLINE_OPTIONS = {"num_predict": 500, "temperature": 0.5}
+SECTION_OPTIONS = {"num_predict": 900, "temperature": 0.7}
+
+# Fewer usable sections than this and the article is not worth assembling
+MIN_SECTIONS = 4
+
+
+def shared_prefix(brief):
+    """Text every request starts with (kept identical so the server can re-use it)"""
+    return f"""You are an expert SEO content writer for LeadHorizon, a real estate digital marketing agency in Delhi NCR, India. Today's date is {brief.get('date', '')}.
+
+The article is about: "{brief.get('topic', '')}"
+Primary keyword: {brief.get('primary_keyword', '')}
+Secondary keywords: {brief.get('secondary_keywords', '')}
+Audience: builders and real estate developers in India.
+
+{brief.get('market_context', '')}
+{brief.get('research', '')}
+"""
+
+
+def outline_prompt(brief):
+    return shared_prefix(brief) + f"""
+Plan a long-form article of {NUM_SECTIONS} H2 sections, each with 2-3 H3 subsections.
+Use the primary keyword in the title and in at least two H2 headings.
+
+OUTPUT FORMAT (follow exactly, nothing else):
+<title>SEO Title under 60 chars</title>
+<meta_description>Compelling description under 155 chars</meta_description>
+<outline>
+## First H2 heading
+- H3 subsection
+- H3 subsection
+## Second H2 heading
+- H3 subsection
+- H3 subsection
+</outline>"""
+
+
+def parse_outline(text):
+    """(title, meta, [(h2, [h3, ...])]) from the outline response"""
+    title = re.search(r'<title>(.*?)</title>', text, re.DOTALL | re.IGNORECASE)
+    meta = re.search(r'<meta_description>(.*?)</meta_description>', text, re.DOTALL | re.IGNORECASE)
+    body = re.search(r'<outline>(.*?)(?:</outline>|$)', text, re.DOTALL | re.IGNORECASE)
+    sections = []
+    for line in (body.group(1) if body else text).splitlines():
+        line = re.sub(r'<[^>]+>', '', line).strip()
+        heading = re.match(r'^(?:##|\d+[.)])\s*(.+)$', line)
+        sub = re.match(r'^(?:[-*•]|###)\s*(.+)$', line)
+        if heading:
+            sections.append((heading.group(1).strip(' *'), []))
+        elif sub and sections:
+            sections[-1][1].append(sub.group(1).strip(' *'))
+    return (title.group(1).strip() if title else '', meta.group(1).strip() if meta else '',
+            sections[:NUM_SECTIONS])
+
+
+def outline_block(sections):
+    lines = []
+    for number, (h2, subs) in enumerate(sections, 1):
+        lines.append(f"{number}. {h2}")
+        lines.extend(f"   - {h3}" for h3 in subs)
+    return '\n'.join(lines)
+
+
+def section_prompt(brief, sections, index):
+    """Shared prefix + outline, then the one section to write"""
+    h2, subs = sections[index]
+    last = index == len(sections) - 1
+    return shared_prefix(brief) + f"""
+Article outline:
+{outline_block(sections)}
+
+Write ONLY section {index + 1}: "{h2}" (250-350 words).
+- Start with <h2>{h2}</h2>, then cover these H3 subsections: {', '.join(subs) or 'as fits the heading'}
+- Use realistic statistics and Delhi NCR examples (Gurgaon, Noida, Greater Noida)
+- Every list must have at least 5 <li> items
+- Use ONLY <h2>, <h3>, <p>, <ul>, <li>, <strong>, <em>; no markdown, no <h1>
+- Do not repeat other sections or write an introduction to the whole article
+{"- End with a strong call-to-action paragraph for LeadHorizon" if last else "- Do not write a conclusion or call-to-action"}"""
+
+
+def clean_section(text, h2):
+    """Section HTML starting with its own <h2>"""
+    text = re.sub(r'```(?:html)?', '', text)
+    text = re.sub(r'<h1[^>]*>.*?</h1>', '', text, flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r'</?(?:content|title|meta_description)>', '', text, flags=re.IGNORECASE).strip()
+    start = text.lower().find('<h2')
+    if start < 0:
+        text = f"<h2>{h2}</h2>\n{text}"
+    else:
+        text = text[start:]
+    return text
+
+
+class CachedGenerator:
+    """client.generate through the response cache (thread-safe: one file per entry)"""
+
+    def __init__(self, client, cache):
+        self.client = client
+        self.cache = cache
+        self.digest = client.model_digest() if cache.enabled else None
+        self.contexts = {}  # label -> context tokens of a fresh (uncached) generation
+
+    def __call__(self, prompt, options, label, timeout):
+        key = cache_key(self.client.model, prompt, options)
+        cached = self.cache.get(key, self.digest)
+        if cached is not None:
+            print(f"💾 [{label}] cached response", file=sys.stderr)
+            return cached
+        result = self.client.generate(prompt, options, label=label, timeout=timeout)
+        self.contexts[label] = result.get('context')
+        self.cache.put(key, result.get('response', ''), self.client.model, self.digest, label)
+        return result.get('response', '')
+
+
+def generate_article(generate, brief, parallel=DEFAULT_PARALLEL, timeout=300):
+    """Outline, then sections concurrently; returns (response, outline context,
+    {section heading: context}) or None"""
+    started = time.time()
+    title, meta, sections = parse_outline(generate(outline_prompt(brief), OUTLINE_OPTIONS, 'outline', timeout))
+    if len(sections) < MIN_SECTIONS:
+        print(f"❌ Outline has {len(sections)} sections, need at least {MIN_SECTIONS}", file=sys.stderr)
+        return None
+    print(f"🗂️ Outline: {len(sections)} sections ({time.time() - started:.0f}s)", file=sys.stderr)
+
+    def write(index):
+        began = time.time()
+        prompt = section_prompt(brief, sections, index)
+        for attempt in range(2):
+            try:
+                text = generate(prompt, SECTION_OPTIONS, f"section_{index + 1}", timeout)
+            except OllamaError as e:
+                print(f"⚠️ Section {index + 1} failed: {e}", file=sys.stderr)
+                continue
+            if text.strip():
+                return clean_section(text, sections[index][0]), time.time() - began
+        return None, time.time() - began
+
+    written = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        results = list(pool.map(write, range(len(sections))))
+    wall = time.time() - written
+    serial = sum(seconds for _, seconds in results)
+
+    parts = [html for html, _ in results if html]
+    contexts = getattr(generate, 'contexts', {})
+    section_contexts = {}
+    for index, (html, _) in enumerate(results):
+        context = contexts.get(f"section_{index + 1}")
+        if html and context:
+            section_contexts[split_sections(html)[1][0][0]] = context
+    if len(parts) < MIN_SECTIONS:
+        print(f"❌ Only {len(parts)} of {len(sections)} sections were written", file=sys.stderr)
+        return None
+    print(f"⚡ {len(parts)}/{len(sections)} sections in {wall:.0f}s "
+          f"(sequential would be ~{serial:.0f}s, {parallel} parallel)", file=sys.stderr)
+    article = (f"<title>{title}</title>\n<meta_description>{meta}</meta_description>\n"
+               f"<content>\n" + '\n\n'.join(parts) + "\n</content>")
+    return article, contexts.get('outline'), section_contexts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outline-first, section-parallel article generation")
+    parser.add_argument('--payload', required=True, help="JSON file with the article 'brief'")
+    parser.add_argument('--timeout', type=int, default=300, help="Limit per request")
+    parser.add_argument('--no-cache', action='store_true', help="Always call the model (skip the response cache)")
+    args = parser.parse_args()
+
+    ctx = RunContext.load()
+    client = OllamaClient.from_context(ctx)
+    cache = LLMCache.from_context(ctx)
+    cache.enabled = cache.enabled and not args.no_cache
+    parallel = int(ctx.config.get('OLLAMA_NUM_PARALLEL', '') or DEFAULT_PARALLEL)
+
+    with open(args.payload, 'r') as f:
+        brief = json.load(f).get('brief', {})
+
+    try:
+        generated = generate_article(CachedGenerator(client, cache), brief, parallel, args.timeout)
+    except OllamaError as e:
+        print(f"❌ Ollama call failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not generated:
+        sys.exit(1)
+    article, outline_context, section_contexts = generated
+    save_contexts(ctx, article, outline=outline_context, sections=section_contexts)
+    sys.stdout.write(article)
+
+
+if __name__ == "__main__":
+    main()
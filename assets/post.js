@@ -0,0 +1,17 @@
+// LeadHorizon blog post script: reading progress bar (the table of contents is static HTML).
+// Published as assets/post.<hash>.js by page_template.py.
+(function(){
+    var bar=document.getElementById('readingProgress');
+    if(!bar)return;
+    var queued=false;
+    function update(){
+        queued=false;
+        var max=document.documentElement.scrollHeight-window.innerHeight;
+        bar.style.transform='scaleX('+(max>0?Math.min(window.scrollY/max,1):0)+')';
+    }
+    // at most one update per frame; passive so scrolling never waits for it
+    window.addEventListener('scroll',function(){
+        if(!queued){queued=true;requestAnimationFrame(update);}
+    },{passive:true});
+    update();
+})();
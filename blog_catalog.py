@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Blog Catalog for LeadHorizon Blog Automation
+Fetches filename, mtime, title, category and keywords of every post in blog/
+with ONE remote invocation, streamed back as JSON lines (newest first)
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from html import unescape
+
+from pipeline_context import RunContext
+from remote_transport import TransportError
+
+# Runs on the server (python3 reading this script from stdin); reads only the
+# head of each page, where <title>, the meta tags and the hero badge live
+REMOTE_SCRIPT = r'''
+import json, os, re, sys
+root = sys.argv[1]
+head_bytes = int(sys.argv[2])
+patterns = {
+    "title": re.compile(r"<title>(.*?)</title>", re.S | re.I),
+    "category": re.compile(r'<span class="badge">(.*?)</span>', re.S),
+    "keywords": re.compile(r'<meta name="keywords" content="([^"]*)"', re.I),
+    "published": re.compile(r'<meta property="article:published_time" content="([^"]*)"', re.I),
+}
+entries = []
+for name in os.listdir(root):
+    if name.endswith(".html"):
+        path = os.path.join(root, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, name, path))
+entries.sort(reverse=True)
+for mtime, size, name, path in entries:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(head_bytes).decode("utf-8", "replace")
+    except OSError:
+        continue
+    record = {"filename": name, "path": root.rstrip("/") + "/" + name,
+              "mtime": int(mtime), "size": size}
+    for key, pattern in patterns.items():
+        match = pattern.search(head)
+        record[key] = match.group(1).strip() if match else ""
+    sys.stdout.write(json.dumps(record) + "\n")
+'''
+
+HEAD_BYTES = 65536
+
+
+def clean_title(title):
+    """Strip the ' | LeadHorizon' suffix the page template appends"""
+    title = re.sub(r'\s+', ' ', title).strip()
+    return re.split(r'\s*[|–-]\s*LeadHorizon', title)[0].strip()
+
+
+def iter_catalog(remote, blog_dir='blog'):
+    """Yield one metadata dict per remote post, newest first, as lines arrive"""
+    command = f"python3 - {blog_dir} {HEAD_BYTES}"
+    for line in remote.stream(command, input=REMOTE_SCRIPT):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        # pages rendered by page_template.py escape their fields (older ones did not)
+        record['title'] = clean_title(unescape(record.get('title', '')))
+        record['category'] = unescape(record.get('category', ''))
+        record['keywords'] = [k.strip() for k in unescape(record.get('keywords', '')).split(',') if k.strip()]
+        yield record
+
+
+def fetch_catalog(remote, blog_dir='blog'):
+    """Whole catalog as a list; empty if the server could not be read"""
+    try:
+        return list(iter_catalog(remote, blog_dir))
+    except TransportError as e:
+        print(f"  ⚠️ Could not read blog catalog: {e}")
+        return []
+
+
+def site_posts(ctx):
+    """Every post on the live site plus today's (not deployed yet), oldest first"""
+    posts = {}
+    for record in fetch_catalog(ctx.archive):
+        modified = datetime.fromtimestamp(record['mtime']).strftime('%Y-%m-%d') if record.get('mtime') else ''
+        record['published'] = record.get('published', '')[:10] or modified
+        record['modified'] = max(record['published'], modified)
+        posts[record['filename']] = record
+
+    blog = ctx.blog
+    if blog.get('filename'):
+        today = datetime.now().strftime('%Y-%m-%d')
+        posts[blog['filename']] = {
+            "filename": blog['filename'],
+            "path": f"blog/{blog['filename']}",
+            "title": blog.get('title', ''),
+            "category": blog.get('category', ''),
+            "keywords": [],
+            "published": today,
+            "modified": today,
+            "new": True,
+        }
+
+    ordered = sorted(posts.values(), key=lambda p: (p['published'], p['filename']))
+    for post in ordered:
+        post['slug'] = os.path.splitext(post['filename'])[0]
+    return ordered
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        catalog = fetch_catalog(ctx.remote)
+        for post in catalog:
+            print(f"{post['filename']}\t{post['category'] or '-'}\t{post['title']}")
+        print(f"📚 {len(catalog)} posts")
+        print(f"📊 {ctx.remote.stats.summary()}")
+    finally:
+        ctx.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
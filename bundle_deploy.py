@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Bundle Deploy for LeadHorizon Blog Automation (DEPLOY_MODE="bundle")
+Stages every changed artifact of a run (post, OG image, sitemap, listing, RSS,
+backlink patches, IndexNow key) into one compressed bundle with a JSON manifest,
+sends it in a single round trip and applies it on the server with staged files,
+checksum/conflict checks and atomic renames. The replaced files are kept as a
+backup, so the last deploy can be rolled back with --rollback.
+"""
+
+import argparse
+import io
+import json
+import os
+import shlex
+import shutil
+import sys
+import tarfile
+import threading
+from datetime import datetime
+
+import listing_builder
+import page_template
+import sitemap_builder
+from pipeline_context import RunContext
+from publish_history import record_post
+from remote_transport import TransportError
+from run_manifest import file_hash
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs on the server from the site root. Bundles, stages and backups live next to
+# (not inside) public_html, in ../.lh-deploy/<bundle id>/
+REMOTE_SCRIPT = r'''
+import hashlib, io, json, os, shutil, sys, tarfile, time
+DEPLOY_DIR = os.path.join("..", ".lh-deploy")
+KEEP = 5
+
+def sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def done(**result):
+    sys.stdout.write(json.dumps(result) + "\n")
+    sys.exit(0 if result.get("ok") else 1)
+
+def safe(rel):
+    return bool(rel) and not os.path.isabs(rel) and ".." not in rel.split("/")
+
+def replace(src, rel):
+    parent = os.path.dirname(rel)
+    if parent and not os.path.isdir(parent):
+        os.makedirs(parent)
+    tmp = rel + ".lh-tmp"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, rel)
+
+def restore(work, applied):
+    for rel, existed in reversed(applied):
+        if existed:
+            replace(os.path.join(work, "backup", rel), rel)
+        elif os.path.exists(rel):
+            os.remove(rel)
+
+def bundles():
+    if not os.path.isdir(DEPLOY_DIR):
+        return []
+    return sorted(d for d in os.listdir(DEPLOY_DIR) if os.path.isdir(os.path.join(DEPLOY_DIR, d)))
+
+def apply(bundle_id):
+    work = os.path.join(DEPLOY_DIR, bundle_id)
+    stage = os.path.join(work, "stage")
+    if os.path.exists(os.path.join(work, "rolled_back.json")):
+        done(ok=False, error="bundle " + bundle_id + " was rolled back; stage a new one")
+    # Only the stage of an earlier aborted attempt is discarded: backup/ holds the
+    # originals of a bundle that may already be live
+    shutil.rmtree(stage, ignore_errors=True)
+    os.makedirs(stage)
+    with tarfile.open(fileobj=io.BytesIO(sys.stdin.buffer.read()), mode="r:gz") as tar:
+        members = [m for m in tar.getmembers() if m.isreg() and safe(m.name)]
+        tar.extractall(stage, members=members)
+    with open(os.path.join(stage, "manifest.json")) as f:
+        files = json.load(f)["files"]
+
+    # Retry after the result of a successful apply was lost (e.g. the session dropped)
+    applied_path = os.path.join(work, "applied.json")
+    if os.path.exists(applied_path):
+        shutil.rmtree(stage, ignore_errors=True)
+        with open(applied_path) as f:
+            previous = json.load(f)
+        hashes = previous.get("sha256") or dict((rel, files.get(rel, {}).get("sha256")) for rel, _ in previous["files"])
+        if hashes != dict((rel, entry["sha256"]) for rel, entry in files.items()):
+            done(ok=False, error="bundle " + bundle_id + " was already applied with other files")
+        done(ok=True, id=bundle_id, files=len(previous["files"]), already=True)
+
+    # Verify everything before touching the live site
+    for rel, entry in files.items():
+        staged = os.path.join(stage, "files", rel)
+        if not safe(rel):
+            done(ok=False, error="unsafe path in bundle: " + rel)
+        if not os.path.isfile(staged) or sha256(staged) != entry["sha256"]:
+            done(ok=False, error="corrupt bundle entry: " + rel)
+        base = entry.get("base")
+        if base and (not os.path.exists(rel) or sha256(rel) != base):
+            done(ok=False, error="conflict: " + rel + " changed on the server since it was read")
+
+    # New content first (blog/, images/), then the pages that link to it
+    applied = []
+    try:
+        for rel in sorted(files, key=lambda r: ("/" not in r, r)):
+            existed = os.path.exists(rel)
+            if existed:
+                backup = os.path.join(work, "backup", rel)
+                if not os.path.isdir(os.path.dirname(backup)):
+                    os.makedirs(os.path.dirname(backup))
+                shutil.copy2(rel, backup)
+            replace(os.path.join(stage, "files", rel), rel)
+            applied.append([rel, existed])
+    except Exception as e:
+        restore(work, applied)
+        done(ok=False, error="apply failed and was reverted: %s" % e)
+
+    shutil.rmtree(stage, ignore_errors=True)
+    with open(os.path.join(work, "applied.json"), "w") as f:
+        json.dump({"id": bundle_id, "applied": time.time(), "files": applied,
+                   "sha256": dict((rel, entry["sha256"]) for rel, entry in files.items())}, f)
+    for old in bundles()[:-KEEP]:
+        shutil.rmtree(os.path.join(DEPLOY_DIR, old), ignore_errors=True)
+    done(ok=True, id=bundle_id, files=len(applied))
+
+def rollback(bundle_id):
+    live = [b for b in bundles() if os.path.exists(os.path.join(DEPLOY_DIR, b, "applied.json"))]
+    if not live:
+        done(ok=False, error="no applied bundle to roll back")
+    if bundle_id == "latest":
+        bundle_id = live[-1]
+    if bundle_id != live[-1]:
+        done(ok=False, error="only the newest applied bundle (%s) can be rolled back" % live[-1])
+    work = os.path.join(DEPLOY_DIR, bundle_id)
+    with open(os.path.join(work, "applied.json")) as f:
+        applied = json.load(f)["files"]
+    restore(work, applied)
+    os.rename(os.path.join(work, "applied.json"), os.path.join(work, "rolled_back.json"))
+    done(ok=True, id=bundle_id, files=len(applied))
+
+def listing():
+    result = []
+    for b in bundles():
+        for state in ("applied", "rolled_back"):
+            path = os.path.join(DEPLOY_DIR, b, state + ".json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    result.append({"id": b, "state": state, "files": [r for r, _ in json.load(f)["files"]]})
+                break
+        else:
+            result.append({"id": b, "state": "failed", "files": []})
+    done(ok=True, bundles=result)
+
+action = sys.argv[1]
+if action == "apply":
+    apply(sys.argv[2])
+elif action == "rollback":
+    rollback(sys.argv[2])
+else:
+    listing()
+'''
+
+class DeployBundle:
+    """Files staged for the next bundle deploy, kept on disk so --resume can pick them up"""
+
+    def __init__(self, root):
+        self.root = root
+        self.files_dir = os.path.join(root, 'files')
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"id": "", "created": "", "files": {}, "applied": ""}
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+
+    @property
+    def id(self):
+        return self.data["id"]
+
+    @property
+    def files(self):
+        return self.data["files"]
+
+    @property
+    def pending(self):
+        """True if files were staged since the last apply"""
+        return bool(self.data["files"]) and not self.data["applied"]
+
+    def path(self, rel_path):
+        return os.path.join(self.files_dir, rel_path)
+
+    def add(self, rel_path, local_path, base=None):
+        """Stage a copy of local_path to be written to rel_path on the site"""
+        rel_path = rel_path.lstrip('/')
+        target = self.path(rel_path)
+        with self.lock:
+            if self.data["applied"]:
+                # The previous bundle is live; start a new one (its backups stay on the server)
+                self._reset()
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(local_path, target)
+            if not self.data["id"]:
+                self.data["id"] = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+                self.data["created"] = datetime.now().isoformat()
+            self.data["files"][rel_path] = {
+                "sha256": file_hash(target),
+                "size": os.path.getsize(target),
+                "base": base,
+            }
+            self.save()
+
+    def pack(self):
+        """The bundle as tar.gz bytes: manifest.json plus files/<site path>"""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+            manifest = json.dumps({"id": self.id, "files": self.files}, indent=2).encode('utf-8')
+            info = tarfile.TarInfo('manifest.json')
+            info.size = len(manifest)
+            tar.addfile(info, io.BytesIO(manifest))
+            for rel_path in sorted(self.files):
+                tar.add(self.path(rel_path), arcname=f'files/{rel_path}')
+        return buffer.getvalue()
+
+    def mark_applied(self):
+        with self.lock:
+            self.data["applied"] = datetime.now().isoformat()
+            self.save()
+
+    def _reset(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.data = {"id": "", "created": "", "files": {}, "applied": ""}
+
+    def clear(self):
+        """Drop everything staged by a previous run"""
+        with self.lock:
+            self._reset()
+
+
+def run_remote(ctx, action, bundle_id='', data=b''):
+    """Run the server-side apply script; returns its JSON result"""
+    command = f"python3 -c {shlex.quote(REMOTE_SCRIPT)} {action} {shlex.quote(bundle_id)}"
+    result = ctx.remote.send(command, data)
+    lines = result.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1])
+    except (IndexError, ValueError):
+        return {"ok": False, "error": result.stderr.strip()[:200] or f"exit code {result.returncode}"}
+
+
+def apply_bundle(ctx):
+    """Send the staged bundle and apply it on the server; on success the mirror and
+    the deploy ledger are updated. Returns the server's result"""
+    bundle = ctx.bundle
+    payload = bundle.pack()
+    print(f"📤 Sending bundle ({len(payload):,} B compressed) and applying on server...")
+    try:
+        result = run_remote(ctx, 'apply', bundle.id, payload)
+    except TransportError as e:
+        result = {"ok": False, "error": str(e)}
+    if not result.get("ok"):
+        return result
+    if result.get("already"):
+        print("ℹ️ The server had already applied this bundle (the earlier result was lost)")
+
+    bundle.mark_applied()
+    ctx.defer_publish = False
+    for rel_path, entry in bundle.files.items():
+        ctx.mirror.note_upload(bundle.path(rel_path), rel_path)
+        ctx.ledger.record_sent(rel_path, entry['sha256'], entry['size'])
+    return result
+
+
+def run(ctx):
+    print("📦 Bundle Deploy")
+    print("=" * 50)
+
+    blog = ctx.blog
+    if not blog:
+        print("❌ No blog to deploy. Run generate_blog.sh first.")
+        sys.exit(1)
+
+    filename = blog.get('filename', '')
+    slug = blog.get('slug', '')
+    post_file = os.path.join(ctx.output_dir, filename)
+    if not filename or not os.path.exists(post_file):
+        print(f"❌ Post HTML not found: {post_file}")
+        sys.exit(1)
+
+    print(f"📤 Deploying: {filename}")
+    ctx.defer_publish = True
+    bundle = ctx.bundle
+
+    # the shared CSS/JS first: the post links their hashed names
+    for rel_path, local_path in page_template.asset_files(ctx.output_dir):
+        ctx.publish(rel_path, local_path)
+    ctx.publish(f'blog/{filename}', post_file)
+    image_file = os.path.join(ctx.output_dir, f'{slug}.jpg')
+    if slug and os.path.exists(image_file):
+        ctx.publish(f'images/{slug}.jpg', image_file)
+    else:
+        print("⚠️ No featured image found")
+
+    published, _ = sitemap_builder.publish_changed(ctx, sitemap_builder.build(ctx)[0])
+    for rel_path in published:
+        print(f"  📦 {rel_path}")
+    try:
+        published, _ = listing_builder.build_and_publish(ctx)
+        for rel_path in published:
+            print(f"  📦 {rel_path}")
+    except ValueError as e:
+        print(f"  ⚠️ Blog listing not updated: {e}")
+
+    try:
+        from indexnow import INDEXNOW_KEY, write_key_file
+        ctx.publish(f'{INDEXNOW_KEY}.txt', write_key_file())
+    except ImportError as e:
+        print(f"  ⚠️ IndexNow key not staged: {e}")
+
+    print("")
+    if not bundle.pending:
+        ctx.defer_publish = False
+        print("✅ Nothing changed since the last deploy, no upload needed")
+        return
+
+    print(f"🗂️ Bundle {bundle.id}: {len(bundle.files)} files")
+    for rel_path, entry in sorted(bundle.files.items()):
+        print(f"   {rel_path} ({entry['size']:,} B)")
+
+    result = apply_bundle(ctx)
+    if not result.get("ok"):
+        print(f"❌ Deploy failed, live site unchanged: {result.get('error')}")
+        sys.exit(1)
+
+    if blog.get('slug'):
+        record_post(ctx)
+
+    print(f"✅ Applied {result['files']} files atomically (bundle {bundle.id})")
+    print(f"↩️ Undo with: python3 bundle_deploy.py --rollback {bundle.id}")
+    print("")
+    print("🎉 Deployment complete!")
+    print(f"📄 Blog URL: {blog.get('url', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle deploy for the LeadHorizon blog")
+    parser.add_argument('--rollback', nargs='?', const='latest', metavar='BUNDLE_ID',
+                        help="Restore the files replaced by the newest applied bundle")
+    parser.add_argument('--list', action='store_true', help="List bundles kept on the server")
+    args = parser.parse_args()
+
+    ctx = RunContext.load()
+    try:
+        if args.list:
+            result = run_remote(ctx, 'list')
+            for entry in result.get('bundles', []):
+                print(f"{entry['id']}  {entry['state']:<12} {len(entry['files'])} files")
+        elif args.rollback:
+            result = run_remote(ctx, 'rollback', args.rollback)
+            if result.get("ok"):
+                print(f"↩️ Rolled back bundle {result['id']} ({result['files']} files restored)")
+                ctx.mirror.sync(ctx.remote)
+        else:
+            run(ctx)
+            result = {"ok": True}
+        if not result.get("ok"):
+            print(f"❌ {result.get('error')}")
+            sys.exit(1)
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
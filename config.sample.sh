@@ -26,6 +26,28 @@ SITE_NAME="YourSiteName"
 # Recommended: llama3.1:8b for better content quality (1000-1200 words)
 # Alternatives: mistral:latest (faster), llama3.2:latest (smaller)
 OLLAMA_MODEL="llama3.1:8b"
+# Every LLM call (market analysis and article) uses this one model over HTTP.
+# It is preloaded at the start of the run and kept in memory for OLLAMA_KEEP_ALIVE.
+OLLAMA_HOST="http://localhost:11434"
+OLLAMA_KEEP_ALIVE="30m"
+# "sections": outline first, then the 6 sections generated concurrently (wall time
+# ~ the slowest section). "single": one long streamed completion.
+# OLLAMA_NUM_PARALLEL should match the server's own OLLAMA_NUM_PARALLEL slots.
+GENERATION_MODE="sections"
+OLLAMA_NUM_PARALLEL=4
+# Length targets: missing/short H2 sections are filled in by continuing the
+# generation (reusing its context) within a token and time budget
+LENGTH_MIN_WORDS=1500
+LENGTH_SECTION_WORDS=200
+LENGTH_SECTIONS=6
+LENGTH_TOKEN_BUDGET=2000
+LENGTH_TIME_BUDGET=180
+# Single-pass articles are streamed; give up on a response that produces no token for this long
+LLM_STALL_SECONDS=60
+# Completed LLM responses are reused when model, prompt and options are unchanged
+# (reruns, template work). Set LLM_CACHE="off" or run with LLM_NO_CACHE=1 to bypass.
+LLM_CACHE="on"
+LLM_CACHE_MAX_MB=200
 
 # Google Indexing (Optional)
 # 1. Go to Google Cloud Console
@@ -38,3 +60,34 @@ GOOGLE_SERVICE_ACCOUNT_JSON=""
 # Perplexity API (for real-time market research)
 # Get API key from: https://www.perplexity.ai/settings/api
 PERPLEXITY_API_KEY=""
+
+# Pipeline (pipeline.py, started by run_daily.sh)
+# Maximum number of independent steps running at the same time
+PIPELINE_WORKERS="4"
+
+# Remote transport: "ssh" (one shared ControlMaster connection per run) or
+# "local:/path/to/site" to publish into a local directory (dry runs)
+REMOTE_TRANSPORT="ssh"
+
+# Deploy mode: "direct" (deploy.sh uploads and edits files one by one) or
+# "bundle" (every changed file is sent in one bundle and applied atomically;
+# undo the last deploy with: python3 bundle_deploy.py --rollback)
+DEPLOY_MODE="bundle"
+
+# Blog listing: posts per page on blog.html, blog/page/N.html and category pages
+LISTING_PAGE_SIZE="12"
+
+# Keyword auto-linking: max in-body links added to a new post
+AUTOLINK_MAX_LINKS="8"
+
+# Backlinks: newest links kept in each older post's "Also read" block
+MORE_READING_LINKS="5"
+
+# Topic selection: days before a primary keyword may be targeted again
+TOPIC_REPEAT_DAYS="90"
+
+# Near-duplicate check: estimated Jaccard at which a new post counts as a duplicate,
+# and what to do then ("abort" or "regenerate", up to DEDUP_MAX_REGENERATIONS times)
+DEDUP_THRESHOLD="0.8"
+DEDUP_ACTION="abort"
+DEDUP_MAX_REGENERATIONS="1"
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Check for LeadHorizon Blog
+Runs between generation and deploy: shingles the new article's text (5-word shingles),
+MinHashes it and looks it up in an on-disk LSH index of the whole archive
+(output/dedup_index.json, updated incrementally from the site mirror). Lookups touch
+only the matching band buckets. If an existing post is too similar, the post is
+regenerated (DEDUP_ACTION="regenerate") or the run stops before anything is published.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+from minhash import LSHIndex, MinHasher, similarity
+from pipeline_context import RunContext
+from related_index import text_of
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SHINGLE_WORDS = 5
+
+# 128 permutations in 32 bands of 4: pairs from Jaccard ~0.42 up become candidates
+NUM_PERM = 128
+BANDS = 32
+ROWS = 4
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_REGENERATIONS = 1
+
+# Bump when what gets shingled changes: the index is rebuilt
+TEXT_VERSION = 2
+
+_MINHASH = MinHasher(NUM_PERM, seed=17)
+_ARTICLE = re.compile(r'<!-- article:start -->(.*?)<!-- article:end -->', re.S)
+_LEGACY_ARTICLE = re.compile(r'<article\b[^>]*>(.*?)</article>', re.S | re.I)
+
+
+def shingles(text, k=SHINGLE_WORDS):
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    if len(words) < k:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def article_text(page):
+    """Text of the article itself: the region between the template's article markers
+    (the <article> element on older pages), so share bars, TOC, CTA and author box
+    shared by every post do not count"""
+    match = _ARTICLE.search(page) or _LEGACY_ARTICLE.search(page)
+    return text_of(match.group(1)) if match else ''
+
+
+def article_signature(page):
+    """MinHash signature of a post's article text; None when there is no text, which
+    is compared with nothing (every empty set is "the same")"""
+    items = shingles(article_text(page))
+    return _MINHASH.signature(items) if items else None
+
+
+class DedupIndex:
+    """Signature per archived post plus the LSH band buckets, both kept on disk"""
+
+    def __init__(self, path, data=None):
+        data = data or {}
+        self.path = path
+        self.posts = data.get("posts", {})  # filename -> {"sha256", "signature"}
+        self.lsh = LSHIndex(BANDS, ROWS, data.get("buckets"))
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if (data.get("num_perm"), data.get("bands"), data.get("text")) != (NUM_PERM, BANDS, TEXT_VERSION):
+            return cls(path)  # built with other parameters: start over
+        return cls(path, data)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"num_perm": NUM_PERM, "bands": BANDS, "text": TEXT_VERSION, "posts": self.posts,
+                       "buckets": self.lsh.to_json()}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.posts)
+
+    def set_post(self, filename, signature, sha256):
+        self.remove(filename)
+        self.posts[filename] = {"sha256": sha256, "signature": signature}
+        if signature:
+            self.lsh.add(filename, signature)
+
+    def remove(self, filename):
+        post = self.posts.pop(filename, None)
+        if post and post["signature"]:
+            self.lsh.remove(filename, post["signature"])
+
+    def similar(self, signature, exclude=(), limit=5):
+        """[(estimated Jaccard, filename)] of LSH candidates, most similar first"""
+        matches = []
+        for filename in self.lsh.query(signature):
+            if filename not in exclude:
+                matches.append((similarity(signature, self.posts[filename]["signature"]), filename))
+        return sorted(matches, reverse=True)[:limit]
+
+
+def index_path(ctx):
+    return os.path.join(ctx.output_dir, 'dedup_index.json')
+
+
+def update_index(ctx):
+    """Load the index and (re)hash only archive posts whose mirror copy changed"""
+    index = DedupIndex.load(index_path(ctx))
+    mirror = ctx.mirror
+    if not mirror.is_current():
+        return index, 0, 0  # no fresh mirror: check against what was indexed last time
+
+    live = {}
+    for rel_path, entry in mirror.files.items():
+        parts = rel_path.split('/')
+        if len(parts) == 2 and parts[0] == 'blog' and parts[1].endswith('.html'):
+            live[parts[1]] = (mirror.path(rel_path), entry['sha256'])
+
+    changed = removed = 0
+    for filename in [f for f in index.posts if f not in live]:
+        index.remove(filename)
+        removed += 1
+    for filename, (path, sha256) in live.items():
+        if index.posts.get(filename, {}).get("sha256") != sha256:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                index.set_post(filename, article_signature(f.read()), sha256)
+            changed += 1
+    if changed or removed:
+        index.save()
+    return index, changed, removed
+
+
+def check_post(index, local_html, filename):
+    """Most similar archive posts for the generated article"""
+    with open(local_html, 'r', encoding='utf-8') as f:
+        signature = article_signature(f.read())
+    return index.similar(signature, exclude={filename}) if signature else []
+
+
+def run(ctx):
+    print("🧬 Near-Duplicate Check")
+    print("=" * 50)
+
+    blog = ctx.blog
+    filename = blog.get('filename', '')
+    local_html = os.path.join(ctx.output_dir, filename)
+    if not filename or not os.path.isfile(local_html):
+        print("❌ No generated blog to check. Run generate_blog.sh first.")
+        sys.exit(1)
+
+    threshold = float(ctx.config.get('DEDUP_THRESHOLD', '') or DEFAULT_THRESHOLD)
+    action = ctx.config.get('DEDUP_ACTION', '') or 'abort'
+    regenerations = int(ctx.config.get('DEDUP_MAX_REGENERATIONS', '') or DEFAULT_REGENERATIONS)
+
+    index, changed, removed = update_index(ctx)
+    print(f"📚 Archive index: {len(index)} posts ({changed} hashed, {removed} removed)")
+
+    attempt = 0
+    while True:
+        matches = check_post(index, local_html, filename)
+        for score, other in matches:
+            print(f"  {score:.2f}  {other}")
+        if not matches or matches[0][0] < threshold:
+            print(f"✅ No near-duplicate (threshold {threshold:.2f})")
+            return
+
+        score, other = matches[0]
+        print(f"⚠️ {filename} is ~{score:.0%} the same as {other}")
+        if action != 'regenerate' or attempt >= regenerations:
+            print("❌ Not publishing a near-duplicate post")
+            sys.exit(1)
+
+        attempt += 1
+        print(f"🔁 Regenerating ({attempt}/{regenerations})...")
+        # a cached response would just return the same article again
+        result = subprocess.run(['bash', os.path.join(SCRIPT_DIR, 'generate_blog.sh')], cwd=SCRIPT_DIR,
+                                env=dict(os.environ, LLM_NO_CACHE='1'))
+        if result.returncode != 0:
+            print("❌ Regeneration failed")
+            sys.exit(1)
+        filename = ctx.blog.get('filename', filename)
+        local_html = os.path.join(ctx.output_dir, filename)
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Deploy Ledger for LeadHorizon Blog Automation
+Content-hash record of every file last pushed to the server (output/deploy_ledger.json).
+ctx.publish() consults it so reruns and backfills only send files whose bytes changed,
+and it keeps per-day totals of bytes sent vs. skipped for the run report.
+
+CLI (used by deploy.sh):  python3 deploy_ledger.py publish <site path> <local file> [<site path> <local file>...]
+  (every pair goes through one RunContext, so one SSH connection and one mirror update)
+"""
+
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+from pipeline_context import RunContext
+from remote_transport import TransportError
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_PATH = os.path.join(SCRIPT_DIR, 'output', 'deploy_ledger.json')
+
+# Days of transfer totals kept in the ledger
+KEEP_DAYS = 30
+
+
+def _today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+class DeployLedger:
+    """Last pushed sha256/size per site path, shared safely between the pipeline and deploy.sh"""
+
+    def __init__(self, path=LEDGER_PATH):
+        self.path = path
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock across processes; yields the current data and saves it afterwards"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self.load()
+            yield data
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("files", {})
+        data.setdefault("runs", {})
+        return data
+
+    def matches(self, rel_path, digest):
+        """True if this exact content was the last thing pushed to rel_path"""
+        entry = self.load()["files"].get(rel_path)
+        return bool(entry) and entry.get("sha256") == digest
+
+    def _count(self, data, key, size):
+        totals = data["runs"].setdefault(_today(), {"sent": 0, "sent_files": 0, "skipped": 0, "skipped_files": 0})
+        totals[key] += size
+        totals[key + "_files"] += 1
+        for day in sorted(data["runs"])[:-KEEP_DAYS]:
+            del data["runs"][day]
+
+    def record_sent(self, rel_path, digest, size):
+        with self._locked() as data:
+            data["files"][rel_path] = {"sha256": digest, "size": size, "pushed": datetime.now().isoformat()}
+            self._count(data, "sent", size)
+
+    def record_skipped(self, rel_path, size):
+        with self._locked() as data:
+            self._count(data, "skipped", size)
+
+    def totals(self, day=None):
+        """Bytes/files sent and skipped on a given day (default today)"""
+        return self.load()["runs"].get(day or _today())
+
+    def summary(self, day=None):
+        totals = self.totals(day)
+        if not totals:
+            return None
+        return (f"{totals['sent']:,} B sent ({totals['sent_files']} files), "
+                f"{totals['skipped']:,} B skipped ({totals['skipped_files']} unchanged files)")
+
+
+def main():
+    pairs = sys.argv[2:]
+    if len(sys.argv) < 4 or sys.argv[1] != 'publish' or len(pairs) % 2:
+        print("Usage: deploy_ledger.py publish <site path> <local file> [<site path> <local file>...]")
+        sys.exit(2)
+
+    ctx = RunContext.load()
+    try:
+        for rel_path, local_path in zip(pairs[::2], pairs[1::2]):
+            try:
+                status = ctx.publish(rel_path, local_path)
+            except (TransportError, OSError) as e:
+                print(f"❌ Upload of {rel_path} failed: {e}")
+                sys.exit(1)
+            if status == "unchanged":
+                print(f"⏭️ {rel_path} unchanged on server, skipped")
+            else:
+                print(f"✅ {rel_path} {status}")
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,10 @@ source "$(dirname "$0")/config.sh"
 # Create output directory
 mkdir -p "$OUTPUT_DIR"
 
-# Get random topic from topics file (skip comments and empty lines)
-get_random_topic() {
-    # Use gshuf on macOS, shuf on Linux
-    if command -v gshuf &> /dev/null; then
-        grep -v "^#" "$TOPICS_FILE" | grep -v "^$" | gshuf -n 1
-    else
-        grep -v "^#" "$TOPICS_FILE" | grep -v "^$" | shuf -n 1
-    fi
+# Get the next usable topic from topics file (skip comments, empty lines and published topics)
+get_unused_topic() {
+    # First topic (in file order) not published recently and not already live
+    python3 "$(dirname "$0")/publish_history.py" pick "$TOPICS_FILE"
 }
 
 # Generate slug from title
@@ -31,19 +27,35 @@ YEAR=$(date +%Y)
 TREND_TOPIC_FILE="$OUTPUT_DIR/today_topic.json"
 if [ -f "$TREND_TOPIC_FILE" ]; then
     echo "📈 Using trend-based topic..."
-    TOPIC=$(python3 -c "import json; d=json.load(open('$TREND_TOPIC_FILE')); print(d.get('topic',''))")
-    PRIMARY_KEYWORD=$(python3 -c "import json; d=json.load(open('$TREND_TOPIC_FILE')); print(d.get('primary_keyword',''))")
-    SECONDARY_KEYWORDS=$(python3 -c "import json; d=json.load(open('$TREND_TOPIC_FILE')); print(d.get('secondary_keywords',''))")
-    MARKET_ANALYSIS=$(python3 -c "import json; d=json.load(open('$TREND_TOPIC_FILE')); print(d.get('market_analysis',''))")
-    CATEGORY=$(python3 -c "import json; d=json.load(open('$TREND_TOPIC_FILE')); print(d.get('category','Real Estate'))")
-    # Get Perplexity research if available
-    PERPLEXITY_RESEARCH=$(python3 -c "import json; d=json.load(open('$TREND_TOPIC_FILE')); print(d.get('perplexity_research',''))" 2>/dev/null || echo "")
+    # Read every field in one pass (shell-quoted assignments, safe to eval)
+    eval "$(python3 - "$TREND_TOPIC_FILE" << 'PYTOPIC'
+import json
+import shlex
+import sys
+
+d = json.load(open(sys.argv[1]))
+fields = [
+    ("TOPIC", "topic", ""),
+    ("PRIMARY_KEYWORD", "primary_keyword", ""),
+    ("SECONDARY_KEYWORDS", "secondary_keywords", ""),
+    ("MARKET_ANALYSIS", "market_analysis", ""),
+    ("CATEGORY", "category", "Real Estate"),
+    ("PERPLEXITY_RESEARCH", "perplexity_research", ""),
+]
+for var, key, default in fields:
+    print(f"{var}={shlex.quote(str(d.get(key, default)))}")
+PYTOPIC
+)"
     if [ -n "$PERPLEXITY_RESEARCH" ]; then
         echo "🔬 Using Perplexity research data..."
     fi
 else
-    echo "📝 Using random topic from list..."
-    TOPIC_LINE=$(get_random_topic)
+    echo "📝 Using next unused topic from list..."
+    TOPIC_LINE=$(get_unused_topic)
+    if [ -z "$TOPIC_LINE" ]; then
+        echo "❌ Every topic in topics.txt was published recently"
+        exit 1
+    fi
     TOPIC=$(echo "$TOPIC_LINE" | cut -d'|' -f1)
     PRIMARY_KEYWORD=$(echo "$TOPIC_LINE" | cut -d'|' -f2)
     SECONDARY_KEYWORDS=$(echo "$TOPIC_LINE" | cut -d'|' -f3)
@@ -78,6 +90,12 @@ echo "🔑 Primary Keyword: $PRIMARY_KEYWORD"
 SLUG=$(generate_slug "$TOPIC")
 FILENAME="${SLUG}.html"
 
+# Never spend a generation on a post that would overwrite or repeat a published one
+if [ "$FORCE_TOPIC" != "1" ] && ! python3 "$(dirname "$0")/publish_history.py" check "$SLUG" "$PRIMARY_KEYWORD"; then
+    echo "   (set FORCE_TOPIC=1 to publish it anyway)"
+    exit 1
+fi
+
 echo "📄 Filename: $FILENAME"
 
 # Prompt for Ollama
@@ -205,13 +223,21 @@ OUTPUT FORMAT (follow exactly):
 </ul>
 </content>"""
 
+# Model and keep_alive are set by ollama_client.py ($OLLAMA_MODEL)
+# "brief" feeds article_generator.py (GENERATION_MODE="sections")
 payload = {
-    "model": "$OLLAMA_MODEL",
     "prompt": prompt,
-    "stream": False,
     "options": {
         "num_predict": 4096,
         "temperature": 0.7
+    },
+    "brief": {
+        "topic": """$TOPIC""",
+        "primary_keyword": """$PRIMARY_KEYWORD""",
+        "secondary_keywords": """$SECONDARY_KEYWORDS""",
+        "date": "$TODAY_DATE",
+        "market_context": """$MARKET_CONTEXT""",
+        "research": research_section
     }
 }
 
@@ -221,10 +247,24 @@ with open("$PAYLOAD_FILE", "w") as f:
 print("Payload created")
 PYPAYLOAD
 
-# Call Ollama API (max 5 min timeout to prevent hanging)
+# Call Ollama API: outline + parallel sections, or one streamed completion
+# (max 5 min; a cut-off stream keeps its complete sections)
 echo "📡 Calling Ollama API..."
-API_RESPONSE=$(curl -s --max-time 300 http://localhost:11434/api/generate -d @"$PAYLOAD_FILE" 2>/dev/null)
-RESPONSE=$(echo "$API_RESPONSE" | python3 -c "import sys,json; d=json.load(sys.stdin); print(d.get('response',''))" 2>/dev/null)
+RESPONSE=""
+if [ "$GENERATION_MODE" = "sections" ]; then
+    RESPONSE=$(python3 "$(dirname "$0")/article_generator.py" --payload "$PAYLOAD_FILE" --timeout 300)
+    if [ -z "$RESPONSE" ]; then
+        echo "⚠️ Section generation failed. Falling back to single-pass generation..."
+    fi
+fi
+if [ -z "$RESPONSE" ]; then
+    RESPONSE=$(python3 "$(dirname "$0")/llm_stream.py" --label article --payload "$PAYLOAD_FILE" --timeout 300)
+fi
+
+# Fill in missing or short H2 sections by continuing from the model's context
+if [ -n "$RESPONSE" ]; then
+    RESPONSE=$(printf '%s' "$RESPONSE" | python3 "$(dirname "$0")/article_continuation.py")
+fi
 
 # Debug: Show response length
 echo "📊 Response length: ${#RESPONSE} characters"
@@ -232,132 +272,9 @@ echo "📊 Response length: ${#RESPONSE} characters"
 # Cleanup
 rm -f "$PAYLOAD_FILE"
 
-# Extract parts from response using Python for reliability
-# Save response to temp file first
-RESPONSE_FILE="/tmp/ollama_response_$$.txt"
-echo "$RESPONSE" > "$RESPONSE_FILE"
-
-# Extract using Python
-EXTRACTION_RESULT=$(python3 - "$RESPONSE_FILE" << 'PYEXTRACT'
-import re
-import sys
-
-# Read response from file passed as argument
-response_file = sys.argv[1]
-with open(response_file, "r") as f:
-    response = f.read()
-
-# Extract title
-title_match = re.search(r'<title>(.*?)</title>', response, re.DOTALL | re.IGNORECASE)
-title = title_match.group(1).strip() if title_match else ""
-
-# Extract meta description
-meta_match = re.search(r'<meta_description>(.*?)</meta_description>', response, re.DOTALL | re.IGNORECASE)
-meta = meta_match.group(1).strip() if meta_match else ""
-
-# Extract content - get everything between <content> tags
-content_match = re.search(r'<content>(.*?)</content>', response, re.DOTALL | re.IGNORECASE)
-if content_match:
-    content = content_match.group(1).strip()
-else:
-    # If no content tags, use the whole response but clean it up
-    content = response
-    # Remove the title and meta tags from content
-    content = re.sub(r'<title>.*?</title>', '', content, flags=re.DOTALL | re.IGNORECASE)
-    content = re.sub(r'<meta_description>.*?</meta_description>', '', content, flags=re.DOTALL | re.IGNORECASE)
-    content = content.strip()
-
-# CLEANUP: Remove any remaining <content> tags
-content = re.sub(r'</?content>', '', content, flags=re.IGNORECASE)
-
-# CLEANUP: Remove any H1 tags (page already has H1 in hero)
-content = re.sub(r'<h1[^>]*>.*?</h1>', '', content, flags=re.DOTALL | re.IGNORECASE)
-
-# Convert markdown headings to HTML
-content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
-content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
-
-# Convert markdown bold/italic to HTML
-content = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', content)
-content = re.sub(r'(?<!\*)\*([^*]+)\*(?!\*)', r'<em>\1</em>', content)
-
-# Convert markdown bullet lists to HTML
-lines = content.split('\n')
-new_lines = []
-in_list = False
-for line in lines:
-    stripped = line.strip()
-    # Check for bullet point (*, -, or numbered)
-    bullet_match = re.match(r'^[\*\-]\s+(.+)$', stripped)
-    num_match = re.match(r'^\d+\.\s+(.+)$', stripped)
-
-    if bullet_match:
-        if not in_list:
-            new_lines.append('<ul>')
-            in_list = True
-        new_lines.append(f'<li>{bullet_match.group(1)}</li>')
-    elif num_match:
-        if not in_list:
-            new_lines.append('<ol>')
-            in_list = 'ol'
-        new_lines.append(f'<li>{num_match.group(1)}</li>')
-    else:
-        if in_list:
-            if in_list == 'ol':
-                new_lines.append('</ol>')
-            else:
-                new_lines.append('</ul>')
-            in_list = False
-        new_lines.append(line)
-
-if in_list:
-    new_lines.append('</ul>' if in_list != 'ol' else '</ol>')
-
-content = '\n'.join(new_lines)
-
-# Wrap standalone text paragraphs in <p> tags
-# Split by double newlines and wrap if not already tagged
-paragraphs = re.split(r'\n\s*\n', content)
-wrapped = []
-for p in paragraphs:
-    p = p.strip()
-    if not p:
-        continue
-    # Check if already has HTML tags
-    if re.match(r'^<(h[2-6]|p|ul|ol|li|div|blockquote)', p):
-        wrapped.append(p)
-    elif p.startswith('<'):
-        wrapped.append(p)
-    else:
-        # Wrap in <p> if it's plain text
-        wrapped.append(f'<p>{p}</p>')
-
-content = '\n\n'.join(wrapped)
-
-# Clean up any double tags or empty paragraphs
-content = re.sub(r'<p>\s*</p>', '', content)
-content = re.sub(r'<p>\s*<(h[2-6]|ul|ol)', r'<\1', content)
-content = re.sub(r'</(h[2-6]|ul|ol)>\s*</p>', r'</\1>', content)
-
-print("---TITLE_START---")
-print(title)
-print("---TITLE_END---")
-print("---META_START---")
-print(meta)
-print("---META_END---")
-print("---CONTENT_START---")
-print(content)
-print("---CONTENT_END---")
-PYEXTRACT
-)
-
-# Parse the extraction result
-SEO_TITLE=$(echo "$EXTRACTION_RESULT" | sed -n '/---TITLE_START---/,/---TITLE_END---/p' | grep -v "^---" | head -1)
-META_DESC=$(echo "$EXTRACTION_RESULT" | sed -n '/---META_START---/,/---META_END---/p' | grep -v "^---" | head -1)
-CONTENT=$(echo "$EXTRACTION_RESULT" | sed -n '/---CONTENT_START---/,/---CONTENT_END---/p' | grep -v "^---")
-
-# Cleanup temp file
-rm -f "$RESPONSE_FILE"
+# Title, meta description and sanitized article HTML in one pass
+# (markdown → HTML, paragraphs, lists, tag whitelist; see llm_html.py)
+eval "$(printf '%s' "$RESPONSE" | python3 "$(dirname "$0")/llm_html.py" - --shell)"
 
 # Fallback if extraction fails
 if [ -z "$SEO_TITLE" ]; then
@@ -380,18 +297,6 @@ if [ $READ_TIME -lt 1 ]; then READ_TIME=1; fi
 
 echo "📊 Word count: $WORD_COUNT, Read time: $READ_TIME min"
 
-# Generate tags from secondary keywords + category
-TAGS_HTML=""
-IFS=',' read -ra TAG_ARRAY <<< "$SECONDARY_KEYWORDS"
-for tag in "${TAG_ARRAY[@]}"; do
-    tag=$(echo "$tag" | xargs) # trim whitespace
-    if [ -n "$tag" ]; then
-        TAGS_HTML="${TAGS_HTML}<span class=\"blog-tag\">${tag}</span>"
-    fi
-done
-# Add category as first tag
-TAGS_HTML="<span class=\"blog-tag blog-tag-primary\">${CATEGORY}</span>${TAGS_HTML}"
-
 # Download unique featured image from Unsplash
 echo "🖼️ Downloading unique featured image..."
 FEATURED_IMAGE="${SLUG}.jpg"
@@ -472,231 +377,41 @@ fi
 ALT_TAG="${SEO_TITLE} - ${PRIMARY_KEYWORD} Guide for Real Estate Developers | LeadHorizon Delhi NCR"
 echo "✅ Featured image: $FEATURED_IMAGE"
 
-# Create the HTML file
-cat > "$OUTPUT_DIR/$FILENAME" << HTMLEOF
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <!-- Meta Pixel Code -->
-    <script>
-    !function(f,b,e,v,n,t,s)
-    {if(f.fbq)return;n=f.fbq=function(){n.callMethod?
-    n.callMethod.apply(n,arguments):n.queue.push(arguments)};
-    if(!f._fbq)f._fbq=n;n.push=n;n.loaded=!0;n.version='2.0';
-    n.queue=[];t=b.createElement(e);t.async=!0;
-    t.src=v;s=b.getElementsByTagName(e)[0];
-    s.parentNode.insertBefore(t,s)}(window, document,'script',
-    'https://connect.facebook.net/en_US/fbevents.js');
-    fbq('init', '1757208528507004');
-    fbq('track', 'PageView');
-    </script>
-    <noscript><img height="1" width="1" style="display:none"
-    src="https://www.facebook.com/tr?id=1757208528507004&ev=PageView&noscript=1"
-    /></noscript>
-    <!-- End Meta Pixel Code -->
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>${SEO_TITLE} | LeadHorizon</title>
-    <meta name="description" content="${META_DESC}">
-    <meta name="keywords" content="${PRIMARY_KEYWORD}, ${SECONDARY_KEYWORDS}">
-    <link rel="canonical" href="${SITE_URL}/blog/${FILENAME}">
-    <link rel="icon" type="image/svg+xml" href="../favicon.svg">
-
-    <meta property="og:type" content="article">
-    <meta property="og:title" content="${SEO_TITLE}">
-    <meta property="og:description" content="${META_DESC}">
-    <meta property="og:url" content="${SITE_URL}/blog/${FILENAME}">
-    <meta property="og:image" content="${SITE_URL}/images/${SLUG}.jpg">
-    <meta property="article:published_time" content="${TODAY}T10:00:00+05:30">
-
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@700;800&family=Poppins:wght@400;500;600&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-    <link rel="stylesheet" href="../style.css?v=11">
-
-    <style>
-        /* Reading Progress Bar */
-        .reading-progress{position:fixed;top:0;left:0;width:0;height:3px;background:linear-gradient(90deg,var(--gold),var(--primary));z-index:9999;transition:width .1s}
-
-        /* Hero */
-        .blog-article-hero{background:linear-gradient(135deg,var(--primary) 0%,var(--primary-dark) 100%);padding:150px 0 80px;color:var(--white)}.blog-article-hero .badge{background:var(--gold);color:var(--dark)}.blog-article-hero h1{font-family:'Montserrat',sans-serif;font-size:2.8rem;margin:20px 0;line-height:1.3}.blog-meta-info{display:flex;gap:25px;margin-top:25px;font-size:.95rem;opacity:.9}.blog-meta-info i{margin-right:8px}
-
-        /* Tags */
-        .blog-tags{display:flex;flex-wrap:wrap;gap:8px;margin-top:20px}.blog-tag{display:inline-block;padding:5px 14px;border-radius:20px;font-size:.8rem;font-weight:500;background:rgba(255,255,255,.15);color:var(--white);border:1px solid rgba(255,255,255,.25)}.blog-tag-primary{background:var(--gold);color:var(--dark);border-color:var(--gold);font-weight:600}
-
-        /* Featured Image */
-        .featured-image{width:100%;max-width:800px;margin:0 auto -40px;padding:0 20px;position:relative;z-index:10}.featured-image img{width:100%;height:400px;object-fit:cover;border-radius:15px;box-shadow:0 10px 40px rgba(0,0,0,0.2)}
-
-        /* Social Share Bar */
-        .social-share-bar{display:flex;align-items:center;gap:12px;padding:20px 0;margin:30px 0;border-top:1px solid #eee;border-bottom:1px solid #eee}.social-share-bar span{font-size:.9rem;font-weight:600;color:var(--dark)}.share-btn{display:inline-flex;align-items:center;justify-content:center;width:40px;height:40px;border-radius:50%;border:none;cursor:pointer;font-size:1rem;color:#fff;transition:transform .2s,opacity .2s}.share-btn:hover{transform:scale(1.1);opacity:.9}.share-btn.whatsapp{background:#25D366}.share-btn.facebook{background:#1877F2}.share-btn.linkedin{background:#0A66C2}.share-btn.twitter{background:#1DA1F2}.share-btn.copy-link{background:var(--dark);font-size:.85rem}
-
-        /* Table of Contents */
-        .toc-container{background:linear-gradient(135deg,#f8f9fa,#fff);border:1px solid #e9ecef;border-left:4px solid var(--primary);border-radius:0 12px 12px 0;padding:25px 30px;margin:0 0 40px}.toc-container h4{font-family:'Montserrat',sans-serif;font-size:1.1rem;color:var(--dark);margin-bottom:15px;display:flex;align-items:center;gap:8px}.toc-container h4 i{color:var(--primary)}.toc-container ol{margin:0;padding-left:20px;counter-reset:toc}.toc-container li{margin-bottom:10px;line-height:1.6}.toc-container a{color:var(--text-light);text-decoration:none;font-size:.95rem;transition:color .2s}.toc-container a:hover{color:var(--primary)}
-
-        /* Article Content */
-        .article-content{padding:80px 0;max-width:800px;margin:0 auto}.article-content h2{font-family:'Montserrat',sans-serif;font-size:1.8rem;color:var(--dark);margin:50px 0 20px}.article-content h3{font-size:1.3rem;color:var(--dark);margin:35px 0 15px}.article-content p{color:var(--text-light);font-size:1.05rem;line-height:1.9;margin-bottom:20px}.article-content ul,.article-content ol{color:var(--text-light);margin:20px 0 20px 25px;line-height:2}.article-content a{color:var(--primary);text-decoration:underline}
-
-        /* Key Takeaway & Stats */
-        .key-takeaway{background:linear-gradient(135deg,rgba(128,0,0,.1) 0%,rgba(128,0,0,.05) 100%);border-left:4px solid var(--primary);padding:25px 30px;margin:30px 0;border-radius:0 10px 10px 0}.key-takeaway h4{color:var(--primary);margin-bottom:10px}.key-takeaway p{margin:0;color:var(--text)}.stat-box{background:var(--dark);color:var(--white);padding:30px;border-radius:15px;text-align:center;margin:30px 0}.stat-box .number{font-family:'Montserrat',sans-serif;font-size:3rem;color:var(--gold)}
-
-        /* CTA, Author, Related */
-        .article-cta{background:linear-gradient(135deg,#800000 0%,#4a0000 100%);color:var(--white);padding:50px;border-radius:15px;text-align:center;margin:50px 0}.article-cta h3{color:var(--white);margin-bottom:15px}.article-cta p{color:rgba(255,255,255,.9);margin-bottom:25px}.author-box{display:flex;gap:20px;padding:30px;background:#f8f9fa;border-radius:15px;margin:50px 0}.author-avatar{width:80px;height:80px;background:linear-gradient(135deg,#800000 0%,#4a0000 100%);border-radius:50%;display:flex;align-items:center;justify-content:center;color:var(--white);font-size:1.5rem;font-weight:700}.related-posts{background:#f8f9fa;padding:40px;border-radius:15px;margin:40px 0}.related-posts h3{margin-bottom:20px;color:var(--dark)}.related-posts ul{list-style:none;margin:0;padding:0}.related-posts li{margin-bottom:15px}.related-posts a{color:var(--primary);font-weight:500;text-decoration:none;display:flex;align-items:center;gap:10px}.related-posts a:hover{text-decoration:underline}.related-posts i{color:#d4af37}
-
-        @media(max-width:768px){.blog-article-hero h1{font-size:1.8rem}.blog-meta-info{flex-wrap:wrap}.author-box{flex-direction:column;text-align:center}.featured-image img{height:250px}.social-share-bar{flex-wrap:wrap}.toc-container{padding:20px}}
-    </style>
-
-    <script type="application/ld+json">
-    {"@context":"https://schema.org","@type":"Article","headline":"${SEO_TITLE}","description":"${META_DESC}","image":"${SITE_URL}/images/${SLUG}.jpg","author":{"@type":"Organization","name":"LeadHorizon"},"publisher":{"@type":"Organization","name":"LeadHorizon","logo":{"@type":"ImageObject","url":"${SITE_URL}/logo.png"}},"datePublished":"${TODAY}","dateModified":"${TODAY}","mainEntityOfPage":{"@type":"WebPage","@id":"${SITE_URL}/blog/${FILENAME}"}}
-    </script>
-</head>
-<body>
-    <header>
-        <div class="container header-inner">
-            <a href="../index.html" class="logo">Lead<span>Horizon</span></a>
-            <button class="mobile-toggle" aria-label="Menu"><i class="fas fa-bars"></i></button>
-            <nav><ul><li><a href="../index.html">Home</a></li><li><a href="../blog.html">Blog</a></li><li><a href="../contact.html">Contact</a></li><li><a href="#" class="btn btn-gradient open-contact-form">Get Started</a></li></ul></nav>
-        </div>
-    </header>
-
-    <!-- Reading Progress Bar -->
-    <div class="reading-progress" id="readingProgress"></div>
-
-    <section class="blog-article-hero">
-        <div class="container">
-            <span class="badge">${CATEGORY}</span>
-            <h1>${SEO_TITLE}</h1>
-            <div class="blog-meta-info">
-                <span><i class="fas fa-calendar"></i> ${TODAY_DISPLAY}</span>
-                <span><i class="fas fa-clock"></i> ${READ_TIME} min read</span>
-            </div>
-            <div class="blog-tags">${TAGS_HTML}</div>
-        </div>
-    </section>
-
-    <div class="featured-image">
-        <img src="../images/${SLUG}.jpg" alt="${ALT_TAG}" loading="lazy">
-    </div>
-
-    <article class="article-content container">
-
-        <!-- Social Share Bar -->
-        <div class="social-share-bar">
-            <span><i class="fas fa-share-alt"></i> Share:</span>
-            <button class="share-btn whatsapp" onclick="window.open('https://wa.me/?text='+encodeURIComponent(document.title+' '+window.location.href),'_blank')" title="Share on WhatsApp"><i class="fab fa-whatsapp"></i></button>
-            <button class="share-btn facebook" onclick="window.open('https://www.facebook.com/sharer/sharer.php?u='+encodeURIComponent(window.location.href),'_blank')" title="Share on Facebook"><i class="fab fa-facebook-f"></i></button>
-            <button class="share-btn linkedin" onclick="window.open('https://www.linkedin.com/sharing/share-offsite/?url='+encodeURIComponent(window.location.href),'_blank')" title="Share on LinkedIn"><i class="fab fa-linkedin-in"></i></button>
-            <button class="share-btn twitter" onclick="window.open('https://twitter.com/intent/tweet?url='+encodeURIComponent(window.location.href)+'&text='+encodeURIComponent(document.title),'_blank')" title="Share on X"><i class="fab fa-x-twitter"></i></button>
-            <button class="share-btn copy-link" onclick="navigator.clipboard.writeText(window.location.href);this.innerHTML='<i class=\\'fas fa-check\\'></i>';setTimeout(()=>this.innerHTML='<i class=\\'fas fa-link\\'></i>',2000)" title="Copy Link"><i class="fas fa-link"></i></button>
-        </div>
-
-        <!-- Table of Contents (auto-generated via JS) -->
-        <div class="toc-container" id="tocContainer">
-            <h4><i class="fas fa-list"></i> Table of Contents</h4>
-            <ol id="tocList"></ol>
-        </div>
-
-        ${CONTENT}
-
-        <!-- Social Share Bar (bottom) -->
-        <div class="social-share-bar">
-            <span><i class="fas fa-share-alt"></i> Share this article:</span>
-            <button class="share-btn whatsapp" onclick="window.open('https://wa.me/?text='+encodeURIComponent(document.title+' '+window.location.href),'_blank')" title="Share on WhatsApp"><i class="fab fa-whatsapp"></i></button>
-            <button class="share-btn facebook" onclick="window.open('https://www.facebook.com/sharer/sharer.php?u='+encodeURIComponent(window.location.href),'_blank')" title="Share on Facebook"><i class="fab fa-facebook-f"></i></button>
-            <button class="share-btn linkedin" onclick="window.open('https://www.linkedin.com/sharing/share-offsite/?url='+encodeURIComponent(window.location.href),'_blank')" title="Share on LinkedIn"><i class="fab fa-linkedin-in"></i></button>
-            <button class="share-btn twitter" onclick="window.open('https://twitter.com/intent/tweet?url='+encodeURIComponent(window.location.href)+'&text='+encodeURIComponent(document.title),'_blank')" title="Share on X"><i class="fab fa-x-twitter"></i></button>
-            <button class="share-btn copy-link" onclick="navigator.clipboard.writeText(window.location.href);this.innerHTML='<i class=\\'fas fa-check\\'></i>';setTimeout(()=>this.innerHTML='<i class=\\'fas fa-link\\'></i>',2000)" title="Copy Link"><i class="fas fa-link"></i></button>
-        </div>
-
-        <div class="related-posts">
-            <h3><i class="fas fa-book-open"></i> Related Articles</h3>
-            <ul>
-                <li><a href="real-estate-seo-guide.html"><i class="fas fa-arrow-right"></i> Real Estate SEO Guide: Rank #1 on Google</a></li>
-                <li><a href="facebook-ads-real-estate.html"><i class="fas fa-arrow-right"></i> Facebook Ads for Real Estate: Generate 100+ Leads Daily</a></li>
-                <li><a href="reduce-cost-per-lead.html"><i class="fas fa-arrow-right"></i> How to Reduce Cost Per Lead by 40%</a></li>
-            </ul>
-        </div>
-
-        <div class="article-cta">
-            <h3>Ready to Boost Your Real Estate Marketing?</h3>
-            <p>LeadHorizon specializes in generating high-quality leads for builders and developers. Get a free audit and discover how we can help you grow.</p>
-            <a href="../contact.html" class="btn btn-gold">Get Free Audit</a>
-        </div>
-
-        <div class="author-box">
-            <div class="author-avatar">LH</div>
-            <div class="author-info">
-                <h4>LeadHorizon Team</h4>
-                <p>LeadHorizon is Delhi NCR's premier digital marketing agency for real estate. We help builders generate more leads at lower costs through data-driven strategies.</p>
-            </div>
-        </div>
-    </article>
-
-    <footer>
-        <div class="container">
-            <div class="footer-grid">
-                <div class="footer-about"><a href="../index.html" class="logo">Lead<span>Horizon</span></a><p>Premier digital marketing for real estate.</p></div>
-                <div><h4>Services</h4><ul><li><a href="../seo-for-real-estate.html">SEO</a></li><li><a href="../ppc-advertising.html">PPC</a></li></ul></div>
-                <div><h4>Company</h4><ul><li><a href="../blog.html">Blog</a></li><li><a href="../contact.html">Contact</a></li></ul></div>
-                <div><h4>Contact</h4><ul class="footer-contact"><li><i class="fas fa-phone-alt"></i> +91-7011066532</li></ul></div>
-            </div>
-            <div class="footer-bottom"><p>&copy; ${YEAR} LeadHorizon</p></div>
-        </div>
-    </footer>
-
-    <a href="https://wa.me/917011066532" class="whatsapp-float" target="_blank"><i class="fab fa-whatsapp"></i></a>
-    <script src="../script.js?v=3" defer></script>
-
-    <!-- TOC Generator + Reading Progress -->
-    <script>
-    document.addEventListener('DOMContentLoaded',function(){
-        // Auto-generate Table of Contents from H2 headings
-        var headings=document.querySelectorAll('.article-content h2');
-        var tocList=document.getElementById('tocList');
-        var tocContainer=document.getElementById('tocContainer');
-        if(headings.length>1&&tocList){
-            headings.forEach(function(h,i){
-                var id='section-'+(i+1);
-                h.id=id;
-                var li=document.createElement('li');
-                var a=document.createElement('a');
-                a.href='#'+id;
-                a.textContent=h.textContent;
-                li.appendChild(a);
-                tocList.appendChild(li);
-            });
-        }else if(tocContainer){
-            tocContainer.style.display='none';
-        }
-
-        // Reading Progress Bar
-        var progressBar=document.getElementById('readingProgress');
-        if(progressBar){
-            window.addEventListener('scroll',function(){
-                var scrollTop=window.scrollY;
-                var docHeight=document.documentElement.scrollHeight-window.innerHeight;
-                var progress=(scrollTop/docHeight)*100;
-                progressBar.style.width=progress+'%';
-            });
-        }
-    });
-    </script>
-</body>
-</html>
-HTMLEOF
+# Render the page from templates/post.html (tags, escaping, JSON-LD and the links to
+# the shared content-hashed CSS/JS in output/assets/ are handled by page_template.py)
+export SEO_TITLE META_DESC PRIMARY_KEYWORD SECONDARY_KEYWORDS CATEGORY SLUG FILENAME TODAY TODAY_DISPLAY YEAR READ_TIME ALT_TAG
+if ! printf '%s' "$CONTENT" | python3 "$(dirname "$0")/page_template.py" render "$OUTPUT_DIR/$FILENAME"; then
+    echo "❌ Page rendering failed"
+    exit 1
+fi
 
 echo "✅ Blog generated: $OUTPUT_DIR/$FILENAME"
 
-# Save metadata for other scripts
-cat > "$OUTPUT_DIR/latest_blog.json" << JSONEOF
-{
-    "filename": "${FILENAME}",
-    "title": "${SEO_TITLE}",
-    "slug": "${SLUG}",
-    "date": "${TODAY}",
-    "category": "${CATEGORY}",
-    "url": "${SITE_URL}/blog/${FILENAME}"
+# Save metadata for other scripts (json.dump: titles and keywords may hold quotes or backslashes)
+if ! TOPIC="$TOPIC" SITE_URL="$SITE_URL" python3 - "$OUTPUT_DIR/latest_blog.json" << 'PYMETA'
+import json, os, sys
+
+env = os.environ.get
+metadata = {
+    "filename": env("FILENAME", ""),
+    "title": env("SEO_TITLE", ""),
+    "topic": env("TOPIC", ""),
+    "slug": env("SLUG", ""),
+    "date": env("TODAY", ""),
+    "category": env("CATEGORY", ""),
+    "primary_keyword": env("PRIMARY_KEYWORD", ""),
+    "secondary_keywords": env("SECONDARY_KEYWORDS", ""),
+    "url": f"{env('SITE_URL', '')}/blog/{env('FILENAME', '')}",
 }
-JSONEOF
+path = sys.argv[1]
+with open(path + ".tmp", "w", encoding="utf-8") as f:
+    json.dump(metadata, f, indent=4, ensure_ascii=False)
+    f.write("\n")
+os.replace(path + ".tmp", path)
+PYMETA
+then
+    echo "❌ Could not save metadata"
+    exit 1
+fi
 
 echo "✅ Metadata saved: $OUTPUT_DIR/latest_blog.json"
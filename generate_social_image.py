@@ -4,7 +4,6 @@ Auto Social Image Generator for LeadHorizon Blog
 Creates branded 1200x630 OG images for social sharing using Pillow
 """
 
-import json
 import os
 import sys
 import textwrap
@@ -17,6 +16,8 @@ except ImportError:
     PILLOW_AVAILABLE = False
     print("⚠️ Pillow not installed. Run: pip3 install Pillow")
 
+from pipeline_context import RunContext
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Brand Colors
@@ -165,30 +166,21 @@ def create_social_image(title, category, slug, output_dir):
     print(f"✅ Social image generated: {output_path}")
     return output_path
 
-def main():
+def run(ctx):
     print("🎨 Social Image Generator")
     print("=" * 50)
 
     # Load blog data
-    blog_file = os.path.join(SCRIPT_DIR, 'output', 'latest_blog.json')
-    topic_file = os.path.join(SCRIPT_DIR, 'output', 'today_topic.json')
-
-    if not os.path.exists(blog_file):
+    blog_data = ctx.blog
+    if not blog_data:
         print("❌ No blog metadata found.")
         sys.exit(1)
 
-    with open(blog_file, 'r') as f:
-        blog_data = json.load(f)
-
-    category = "Market Trends"
-    if os.path.exists(topic_file):
-        with open(topic_file, 'r') as f:
-            topic_data = json.load(f)
-            category = topic_data.get('category', category)
+    category = ctx.topic.get('category', "Market Trends")
 
     title = blog_data.get('title', 'New Blog Post')
     slug = blog_data.get('slug', 'blog-post')
-    output_dir = os.path.join(SCRIPT_DIR, 'output')
+    output_dir = ctx.output_dir
 
     print(f"📄 Title: {title}")
     print(f"📂 Category: {category}")
@@ -202,6 +194,10 @@ def main():
         print(f"📐 Size: 1200x630 (OG standard)")
     else:
         print("❌ Image generation failed")
+        sys.exit(1)
+
+def main():
+    run(RunContext.load())
 
 if __name__ == "__main__":
     main()
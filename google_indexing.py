@@ -11,7 +11,6 @@ Setup required:
 5. Set GOOGLE_SERVICE_ACCOUNT_JSON in config.sh
 """
 
-import json
 import os
 import sys
 from datetime import datetime
@@ -25,19 +24,7 @@ except ImportError:
     GOOGLE_LIBS_AVAILABLE = False
     print("⚠️ Google libraries not installed. Run: pip3 install google-auth google-api-python-client")
 
-def load_config():
-    """Load configuration from config.sh"""
-    config = {}
-    config_path = os.path.join(os.path.dirname(__file__), 'config.sh')
-
-    with open(config_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key] = value.strip('"').strip("'")
-
-    return config
+from pipeline_context import RunContext
 
 def submit_url_to_google(url, service_account_file):
     """Submit URL to Google Indexing API"""
@@ -98,21 +85,15 @@ def ping_search_engines(url, sitemap_url):
         except Exception as e:
             print(f"⚠️ Ping failed: {ping_url.split('?')[0]} - {str(e)}")
 
-def main():
-    config = load_config()
+def run(ctx):
+    config = ctx.config
 
     # Load latest blog info
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, 'output')
-    latest_blog_file = os.path.join(output_dir, 'latest_blog.json')
-
-    if not os.path.exists(latest_blog_file):
+    blog_data = ctx.blog
+    if not blog_data:
         print("❌ No blog metadata found. Run generate_blog.sh first.")
         sys.exit(1)
 
-    with open(latest_blog_file, 'r') as f:
-        blog_data = json.load(f)
-
     blog_url = blog_data['url']
     site_url = config.get('SITE_URL', 'https://leadhorizon.co.in')
     sitemap_url = f"{site_url}/sitemap.xml"
@@ -139,5 +120,8 @@ def main():
     print("")
     print("✅ Indexing requests complete!")
 
+def main():
+    run(RunContext.load())
+
 if __name__ == "__main__":
     main()
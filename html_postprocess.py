@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+HTML Post-Processor for LeadHorizon Blog Automation
+Runs on every page page_template.py renders (new posts and archive re-renders),
+parsing the article once:
+- every <h2>/<h3> gets a stable id slugged from its text (an id it already has is
+  kept, so links to it keep working and processing twice changes nothing)
+- the table of contents is written into the page as a list of links to the <h2>s
+  (dropped when there are fewer than two), so it is there at first paint, without JS
+  and without the layout shift of a list filled in on DOMContentLoaded
+- whitespace is minified: comments other than the pipeline's block markers are
+  removed, runs of whitespace collapse to one space, and whitespace next to block
+  tags is dropped (<pre>, <textarea>, <script> and <style> are left as they are)
+
+CLI:
+  html_postprocess.py FILE...    process pages in place
+"""
+
+import os
+import re
+import sys
+import unicodedata
+from html import escape, unescape
+
+MAX_SLUG_LENGTH = 60
+MIN_TOC_ENTRIES = 2
+
+_ARTICLE = re.compile(r'(<!-- article:start -->)(.*?)(<!-- article:end -->)', re.S)
+_ARTICLE_ELEMENT = re.compile(r'(<article\b[^>]*>)(.*?)(</article>)', re.S | re.I)
+_HEADING = re.compile(r'<(h[23])\b([^>]*)>(.*?)</\1\s*>', re.S | re.I)
+_ID_ATTR = re.compile(r'(?<![\w-])id\s*=\s*"([^"]*)"', re.I)
+_TAG = re.compile(r'<[^>]+>')
+_TOC_LIST = re.compile(r'(<ol id="tocList"[^>]*>).*?(</ol>)', re.S)
+_TOC_CONTAINER = re.compile(r'\s*<nav class="toc-container"[^>]*>.*?</nav>', re.S)
+
+# Comments other scripts look for (block delimiters); every other comment is dropped
+_MARKER_COMMENT = re.compile(r'<!-- (?:[\w-]+:(?:start|end)|Related Articles) -->')
+_TOKEN = re.compile(r'<(pre|textarea|script|style)\b.*?</\1\s*>'
+                    r'|<!--.*?-->'
+                    r'|<(?:[^>"\']|"[^"]*"|\'[^\']*\')*>'
+                    r'|[^<]+|<', re.S | re.I)
+_TAG_NAME = re.compile(r'</?([a-zA-Z][\w-]*)')
+
+# Whitespace next to these tags never renders
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'meta', 'link', 'title', 'base', 'script', 'style', 'noscript',
+    'header', 'footer', 'nav', 'main', 'section', 'article', 'aside', 'div', 'p',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'th', 'td', 'caption', 'figure', 'figcaption',
+    'blockquote', 'pre', 'hr', 'form', 'fieldset', 'textarea',
+}
+
+
+def slugify(text):
+    """URL fragment for a heading: ascii, lower case, words joined by '-'"""
+    text = unicodedata.normalize('NFKD', unescape(_TAG.sub(' ', text)))
+    text = text.encode('ascii', 'ignore').decode('ascii').lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+    if len(slug) > MAX_SLUG_LENGTH:
+        slug = slug[:MAX_SLUG_LENGTH].rsplit('-', 1)[0]
+    return slug or 'section'
+
+
+def anchor_headings(content, taken):
+    """Content with an id on every <h2>/<h3>, plus [(id, heading text)] of the <h2>s;
+    taken is the set of ids already used on the page (updated)"""
+    entries = []
+
+    def add_id(match):
+        tag, attrs, inner = match.groups()
+        text = ' '.join(unescape(_TAG.sub(' ', inner)).split())
+        existing = _ID_ATTR.search(attrs)
+        if existing:
+            anchor = existing.group(1)
+        else:
+            base = anchor = slugify(inner)
+            number = 2
+            while anchor in taken:
+                anchor = f"{base}-{number}"
+                number += 1
+            taken.add(anchor)
+            attrs = f' id="{anchor}"' + attrs
+        if tag.lower() == 'h2':
+            entries.append((anchor, text))
+        return f'<{tag}{attrs}>{inner}</{tag}>'
+
+    return _HEADING.sub(add_id, content), entries
+
+
+def toc_items(entries):
+    return ''.join(f'<li><a href="#{anchor}">{escape(text)}</a></li>' for anchor, text in entries)
+
+
+def minify(html):
+    """html with comments (except block markers) and insignificant whitespace removed"""
+    tokens = []  # [kind, text, is_block]
+    for match in _TOKEN.finditer(html):
+        token = match.group(0)
+        if token.startswith('<!--'):
+            if _MARKER_COMMENT.fullmatch(token):
+                tokens.append(['tag', token, True])
+            continue
+        if match.group(1):
+            tokens.append(['tag', token, True])
+        elif token.startswith('<') and len(token) > 1:
+            name = _TAG_NAME.match(token)
+            block = not name or name.group(1).lower() in BLOCK_TAGS
+            tokens.append(['tag', re.sub(r'\s*\n\s*', ' ', token), block])
+        else:
+            text = re.sub(r'\s+', ' ', token)
+            if tokens and tokens[-1][0] == 'text':
+                tokens[-1][1] = re.sub(r'\s+', ' ', tokens[-1][1] + text)  # around a dropped comment
+            else:
+                tokens.append(['text', text, False])
+
+    out = []
+    for i, (kind, text, _) in enumerate(tokens):
+        if kind == 'text':
+            if i == 0 or tokens[i - 1][2]:
+                text = text.lstrip(' ')
+            if i == len(tokens) - 1 or tokens[i + 1][2]:
+                text = text.rstrip(' ')
+        out.append(text)
+    return ''.join(out) + '\n'
+
+
+def process(html):
+    """Heading ids, static TOC and minified whitespace for a rendered page"""
+    match = _ARTICLE.search(html) or _ARTICLE_ELEMENT.search(html)
+    if match:
+        taken = set(_ID_ATTR.findall(html))
+        content, entries = anchor_headings(match.group(2), taken)
+        html = html[:match.start(2)] + content + html[match.end(2):]
+        if len(entries) >= MIN_TOC_ENTRIES:
+            items = toc_items(entries)
+            html = _TOC_LIST.sub(lambda m: m.group(1) + items + m.group(2), html, count=1)
+        else:
+            html = _TOC_CONTAINER.sub('', html, count=1)
+    return minify(html)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1].startswith('-'):
+        print(__doc__.strip().split('CLI:')[1])
+        sys.exit(2)
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        processed = process(html)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(processed)
+        os.replace(tmp_path, path)
+        before, after = len(html.encode('utf-8')), len(processed.encode('utf-8'))
+        print(f"✨ {os.path.basename(path)}: {before:,} → {after:,} B")
+
+
+if __name__ == "__main__":
+    main()
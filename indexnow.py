@@ -4,26 +4,19 @@ IndexNow - Instant Indexing for Bing, Yandex, Seznam, Naver
 Submits new blog URLs for immediate crawling (free, no API key registration needed)
 """
 
-import json
 import os
 import sys
 import requests
 import uuid
 from datetime import datetime
 
+from pipeline_context import RunContext
+from remote_transport import TransportError
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 INDEXNOW_KEY = "a1b2c3d4e5f6g7h8i9j0leadhorizon2026"
 SITE_URL = "https://leadhorizon.co.in"
 
-def load_blog_data():
-    """Load latest blog metadata"""
-    blog_file = os.path.join(SCRIPT_DIR, 'output', 'latest_blog.json')
-    if not os.path.exists(blog_file):
-        print("❌ No blog metadata found.")
-        return None
-    with open(blog_file, 'r') as f:
-        return json.load(f)
-
 def submit_indexnow(url):
     """Submit URL to IndexNow API (reaches Bing, Yandex, Seznam, Naver)"""
 
@@ -68,48 +61,39 @@ def submit_indexnow(url):
 
     return success_count > 0
 
-def deploy_key_file():
-    """Deploy IndexNow key verification file to server"""
-    import subprocess
-
-    config = {}
-    config_path = os.path.join(SCRIPT_DIR, 'config.sh')
-    with open(config_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key] = value.strip('"').strip("'")
-
-    # Create key file locally
+def write_key_file():
+    """Create the IndexNow key verification file locally"""
     key_file = os.path.join(SCRIPT_DIR, 'output', f'{INDEXNOW_KEY}.txt')
     with open(key_file, 'w') as f:
         f.write(INDEXNOW_KEY)
+    return key_file
 
-    # Upload to server root
-    ssh_host = config.get('SSH_HOST', '')
-    ssh_port = config.get('SSH_PORT', '22')
-    ssh_user = config.get('SSH_USER', '')
-    ssh_pass = config.get('SSH_PASS', '')
-    remote_path = config.get('REMOTE_PATH', '')
-
-    if ssh_host and ssh_user:
-        cmd = f'sshpass -p "{ssh_pass}" scp -o StrictHostKeyChecking=no -P {ssh_port} "{key_file}" "{ssh_user}@{ssh_host}:{remote_path}/{INDEXNOW_KEY}.txt"'
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✅ IndexNow key file deployed to server")
-            return True
-        else:
-            print(f"⚠️ Key file upload failed: {result.stderr}")
-            return False
-    return False
+def deploy_key_file(ctx):
+    """Deploy IndexNow key verification file to server"""
+    key_file = write_key_file()
 
-def main():
+    # Upload to server root
+    remote = ctx.remote
+    if remote.kind == "ssh" and not (remote.host and remote.user):
+        return False
+    try:
+        status = ctx.publish(f'{INDEXNOW_KEY}.txt', key_file)
+    except TransportError as e:
+        print(f"⚠️ Key file upload failed: {e}")
+        return False
+    if status == "unchanged":
+        print("✅ IndexNow key file already deployed this run")
+    else:
+        print(f"✅ IndexNow key file deployed to server")
+    return True
+
+def run(ctx):
     print("🚀 IndexNow - Instant Indexing")
     print("=" * 50)
 
-    blog_data = load_blog_data()
+    blog_data = ctx.blog
     if not blog_data:
+        print("❌ No blog metadata found.")
         sys.exit(1)
 
     blog_url = blog_data.get('url', '')
@@ -118,7 +102,7 @@ def main():
 
     # Deploy key file (only needed once, but safe to repeat)
     print("🔑 Deploying verification key...")
-    deploy_key_file()
+    deploy_key_file(ctx)
     print("")
 
     # Submit to IndexNow
@@ -133,5 +117,12 @@ def main():
     print("")
     print("✅ IndexNow submission complete!")
 
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
 if __name__ == "__main__":
     main()
@@ -6,58 +6,28 @@ Adds 'Related Articles' section to new blog and updates old blogs with links to
 
 import json
 import os
-import sys
-import subprocess
 import re
+import sys
+import shlex
+import tempfile
 from datetime import datetime
+from html import escape
+
+from blog_catalog import fetch_catalog
+from html_postprocess import minify
+from pipeline_context import RunContext
+from link_graph import update_graph
+from related_index import update_index
+from remote_transport import TransportError
+from run_manifest import file_hash
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SITE_URL = "https://leadhorizon.co.in"
 
-def load_config():
-    config = {}
-    config_path = os.path.join(SCRIPT_DIR, 'config.sh')
-    with open(config_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key] = value.strip('"').strip("'")
-    return config
-
-def get_blog_list_from_server(config):
-    """Get list of existing blog files from server"""
-    ssh_host = config.get('SSH_HOST', '')
-    ssh_port = config.get('SSH_PORT', '22')
-    ssh_user = config.get('SSH_USER', '')
-    ssh_pass = config.get('SSH_PASS', '')
-    remote_path = config.get('REMOTE_PATH', '')
-
-    cmd = f'sshpass -p "{ssh_pass}" ssh -o StrictHostKeyChecking=no -p {ssh_port} "{ssh_user}@{ssh_host}" "ls -1t {remote_path}/blog/*.html 2>/dev/null | head -20"'
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=15)
-
-    if result.returncode == 0:
-        files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
-        return files
-    return []
-
-def get_blog_title_from_server(config, filepath):
-    """Extract title from a remote blog file"""
-    ssh_host = config.get('SSH_HOST', '')
-    ssh_port = config.get('SSH_PORT', '22')
-    ssh_user = config.get('SSH_USER', '')
-    ssh_pass = config.get('SSH_PASS', '')
-
-    cmd = f'sshpass -p "{ssh_pass}" ssh -o StrictHostKeyChecking=no -p {ssh_port} "{ssh_user}@{ssh_host}" "grep -o \'<title>[^<]*</title>\' {filepath} | head -1"'
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
-
-    if result.returncode == 0 and result.stdout.strip():
-        title = result.stdout.strip()
-        title = re.sub(r'</?title>', '', title)
-        # Remove site name suffix
-        title = re.split(r'\s*[|–-]\s*LeadHorizon', title)[0].strip()
-        return title
-    return None
+# Related posts are picked from the RELATED_POOL most similar ones; a post with no link
+# equity gets its similarity raised by up to UNDERLINKED_BOOST (50%)
+RELATED_POOL = 10
+UNDERLINKED_BOOST = 0.5
 
 def inject_related_articles_into_new_blog(blog_file, related_blogs):
     """Add Related Articles section to the new blog post before </body>"""
@@ -76,7 +46,7 @@ def inject_related_articles_into_new_blog(blog_file, related_blogs):
     cards = ""
     for blog in related_blogs[:3]:
         filename = os.path.basename(blog['path'])
-        title = blog['title']
+        title = escape(blog['title'])
         cards += f'''
                 <a href="{filename}" class="related-card">
                     <span class="related-icon"><i class="fas fa-newspaper"></i></span>
@@ -92,22 +62,10 @@ def inject_related_articles_into_new_blog(blog_file, related_blogs):
             {cards}
         </div>
     </div>
-    <style>
-    .related-card {{
-        display:flex;align-items:center;gap:15px;padding:15px 20px;background:#f9f5f0;
-        border-radius:8px;text-decoration:none;color:#1a1a1a;transition:all 0.3s;
-        border-left:3px solid #d4af37;
-    }}
-    .related-card:hover {{background:#800000;color:#fff;border-left-color:#d4af37;transform:translateX(5px);}}
-    .related-card:hover .related-icon,.related-card:hover .related-arrow {{color:#d4af37;}}
-    .related-icon {{color:#800000;font-size:1.2rem;flex-shrink:0;}}
-    .related-title {{flex:1;font-family:'Poppins',sans-serif;font-size:0.95rem;font-weight:500;}}
-    .related-arrow {{color:#800000;flex-shrink:0;}}
-    </style>
 '''
 
-    # Insert before </body>
-    content = content.replace('</body>', f'{related_html}\n</body>')
+    # Insert before </body>, as compact as the rest of the page
+    content = content.replace('</body>', minify(related_html) + '</body>')
 
     with open(blog_file, 'w', encoding='utf-8') as f:
         f.write(content)
@@ -115,83 +73,187 @@ def inject_related_articles_into_new_blog(blog_file, related_blogs):
     print(f"  ✅ Added {len(related_blogs[:3])} related articles to new blog")
     return True
 
-def add_backlink_to_old_blog(config, old_blog_path, new_title, new_filename):
-    """Add a link to the new blog in an older blog's Related Articles section"""
-    ssh_host = config.get('SSH_HOST', '')
-    ssh_port = config.get('SSH_PORT', '22')
-    ssh_user = config.get('SSH_USER', '')
-    ssh_pass = config.get('SSH_PASS', '')
-
-    # Check if old blog already links to new blog
-    check_cmd = f'sshpass -p "{ssh_pass}" ssh -o StrictHostKeyChecking=no -p {ssh_port} "{ssh_user}@{ssh_host}" "grep -c \'{new_filename}\' {old_blog_path} 2>/dev/null || echo 0"'
-    result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True, timeout=10)
-
-    if result.stdout.strip() != '0':
-        return False  # Already linked
-
-    # Add a simple "You might also like" link before </body> if no related section exists
-    backlink_html = f'<div style="max-width:800px;margin:20px auto;padding:10px 20px;"><p style="font-family:Poppins,sans-serif;font-size:0.9rem;color:#666;">📖 Also read: <a href="{new_filename}" style="color:#800000;font-weight:500;">{new_title}</a></p></div>'
-
-    escaped_html = backlink_html.replace("'", "'\\''").replace('"', '\\"')
-
-    cmd = f'sshpass -p "{ssh_pass}" ssh -o StrictHostKeyChecking=no -p {ssh_port} "{ssh_user}@{ssh_host}" "sed -i \\"/<\\/body>/i {escaped_html}\\" {old_blog_path}"'
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
+# Older posts carry one delimited block of links to newer posts, rewritten in place
+MORE_READING_START = '<!-- more-reading:start -->'
+MORE_READING_END = '<!-- more-reading:end -->'
+DEFAULT_MORE_READING_LINKS = 5
+
+_MORE_READING = re.compile(re.escape(MORE_READING_START) + r'.*?' + re.escape(MORE_READING_END) + r'\n?', re.S)
+# The single "Also read" divs earlier runs appended, one per backlink
+_LEGACY_BACKLINK = re.compile(r'<div style="max-width:800px;margin:20px auto;padding:10px 20px;"><p[^>]*>'
+                              r'📖 Also read: <a href="([^"]+)"[^>]*>(.*?)</a></p></div>\n?', re.S)
+_ENTRY = re.compile(r'<a href="([^"]+)"[^>]*>(.*?)</a>', re.S)
+
+# Runs on the server: writes every patched post (JSON on stdin) atomically, skipping
+# files that changed since they were read (base sha256 mismatch)
+REMOTE_WRITE_SCRIPT = r'''
+import hashlib, json, os, sys
+payload = json.load(sys.stdin)
+written, conflicts = [], []
+for rel, entry in sorted(payload["files"].items()):
+    if rel.startswith("/") or ".." in rel.split("/"):
+        conflicts.append(rel)
+        continue
+    try:
+        with open(rel, "rb") as f:
+            current = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        conflicts.append(rel)
+        continue
+    if entry.get("base") and entry["base"] != current:
+        conflicts.append(rel)
+        continue
+    tmp = rel + ".lh-tmp"
+    with open(tmp, "wb") as f:
+        f.write(entry["content"].encode("utf-8"))
+    os.chmod(tmp, os.stat(rel).st_mode & 0o777)
+    os.replace(tmp, rel)
+    written.append(rel)
+print(json.dumps({"written": written, "conflicts": conflicts}))
+'''
 
-    return result.returncode == 0
 
-def main():
+def more_reading_block(entries):
+    """The delimited 'Also read' block for a list of (filename, title HTML), newest first"""
+    items = ''.join(f'<li><a href="{filename}" style="color:#800000;font-weight:500;">{title}</a></li>'
+                    for filename, title in entries)
+    return (f'{MORE_READING_START}\n<div class="more-reading" style="max-width:800px;margin:20px auto;padding:10px 20px;">'
+            f'<p style="font-family:Poppins,sans-serif;font-size:0.9rem;color:#666;margin:0 0 6px;">📖 Also read:</p>'
+            f'<ul style="margin:0;padding-left:20px;font-family:Poppins,sans-serif;font-size:0.9rem;">{items}</ul>'
+            f'</div>\n{MORE_READING_END}\n')
+
+
+def update_more_reading(content, new_title, new_filename, limit=DEFAULT_MORE_READING_LINKS):
+    """Put the new post at the top of a page's more-reading block (created before </body>
+    if missing, legacy 'Also read' divs folded in); a page already listing it is left as is"""
+    entries = []
+    block = _MORE_READING.search(content)
+    if block:
+        entries += _ENTRY.findall(block.group(0))
+    entries += list(reversed(_LEGACY_BACKLINK.findall(content)))
+    if new_filename not in [filename for filename, _ in entries]:
+        entries.insert(0, (new_filename, escape(new_title)))
+
+    seen, kept = set(), []
+    for filename, title in entries:
+        if filename not in seen:
+            seen.add(filename)
+            kept.append((filename, title))
+    html = more_reading_block(kept[:limit])
+
+    content = _LEGACY_BACKLINK.sub('', content)
+    if _MORE_READING.search(content):
+        return _MORE_READING.sub(lambda m: html, content, count=1)
+    if '</body>' not in content:
+        return content
+    return content.replace('</body>', html + '</body>', 1)
+
+
+def update_backlinks(ctx, old_blog_paths, new_title, new_filename, limit=DEFAULT_MORE_READING_LINKS):
+    """Add the new post to the more-reading block of every older post in one batch;
+    returns (touched, conflicts) as lists of site paths"""
+    mirror = ctx.mirror
+    use_mirror = mirror.is_current()
+    with tempfile.TemporaryDirectory() as workdir:
+        if use_mirror:
+            sources = {rel: mirror.path(rel) for rel in old_blog_paths if mirror.exists(rel)}
+        else:
+            fetched = ctx.remote.download_many(old_blog_paths, workdir)
+            sources = {rel: os.path.join(workdir, rel) for rel in fetched}
+
+        patched = {}
+        for rel_path, source in sources.items():
+            with open(source, 'r', encoding='utf-8') as f:
+                content = f.read()
+            updated = update_more_reading(content, new_title, new_filename, limit)
+            if updated != content:
+                patched[rel_path] = (updated, file_hash(source))
+        if not patched:
+            return [], []
+
+        # Bundle deploy: the edits ship (and roll back) with today's bundle, never
+        # written live ahead of it (posts were downloaded above if the mirror is stale)
+        if ctx.defer_publish:
+            for rel_path, (content, base) in patched.items():
+                local_path = os.path.join(workdir, 'patched', rel_path)
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                with open(local_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                ctx.publish(rel_path, local_path, base=base)
+            return sorted(patched), []
+
+        payload = {"files": {rel: {"content": content, "base": base} for rel, (content, base) in patched.items()}}
+        result = ctx.remote.send(f"python3 -c {shlex.quote(REMOTE_WRITE_SCRIPT)}",
+                                 json.dumps(payload).encode('utf-8'))
+        try:
+            outcome = json.loads(result.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            raise TransportError(result.stderr.strip()[:200] or f"exit code {result.returncode}")
+
+        for rel_path in outcome["written"]:
+            local_path = os.path.join(workdir, 'patched', rel_path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, 'w', encoding='utf-8') as f:
+                f.write(patched[rel_path][0])
+            mirror.note_upload(local_path, rel_path)
+            ctx.ledger.record_sent(rel_path, file_hash(local_path), os.path.getsize(local_path))
+        return outcome["written"], outcome["conflicts"]
+
+def run(ctx):
     print("🔗 Internal Linking Engine")
     print("=" * 50)
 
-    config = load_config()
-
     # Load new blog data
-    blog_file_json = os.path.join(SCRIPT_DIR, 'output', 'latest_blog.json')
-    if not os.path.exists(blog_file_json):
+    blog_data = ctx.blog
+    if not blog_data:
         print("❌ No blog metadata found.")
         sys.exit(1)
 
-    with open(blog_file_json, 'r') as f:
-        blog_data = json.load(f)
-
     new_title = blog_data.get('title', '')
     new_filename = blog_data.get('filename', '')
     new_slug = blog_data.get('slug', '')
-    local_html = os.path.join(SCRIPT_DIR, 'output', new_filename)
+    local_html = os.path.join(ctx.output_dir, new_filename)
 
     print(f"📄 New Blog: {new_title}")
     print(f"📁 File: {new_filename}")
     print("")
 
-    # Get existing blogs from server
+    # Get existing blogs (local mirror when synced, else one round trip to the server)
     print("📥 Fetching existing blogs from server...")
-    remote_blogs = get_blog_list_from_server(config)
-    remote_path = config.get('REMOTE_PATH', '')
+    catalog = fetch_catalog(ctx.archive)
 
-    if not remote_blogs:
+    if not catalog:
         print("  ⚠️ No existing blogs found on server")
         print("✅ Internal linking complete (first blog)")
         return
 
-    # Filter out the current blog
+    # Rank by topic similarity (TF-IDF index), nudged towards posts with little link
+    # equity (link graph), topped up with the most recent posts
+    candidates = {post['filename']: post for post in catalog
+                  if post['filename'] != new_filename and post['title']}
     related_blogs = []
-    for blog_path in remote_blogs:
-        fname = os.path.basename(blog_path)
-        if fname == new_filename:
-            continue
-
-        title = get_blog_title_from_server(config, blog_path)
-        if title:
-            related_blogs.append({
-                'path': blog_path,
-                'filename': fname,
-                'title': title
-            })
-
+    if os.path.exists(local_html):
+        index, indexed, removed = update_index(ctx, {new_filename: local_html})
+        print(f"  🧮 Related index: {len(index)} posts ({indexed} indexed, {removed} removed)")
+        graph, _, _ = update_graph(ctx, {new_filename: local_html})
+        equity = graph.scores()
+        print(f"  🕸️ Link graph: {len(graph)} posts, {len(graph.orphans())} orphaned")
+
+        ranked = []
+        for filename, similarity in index.similar(new_filename, k=RELATED_POOL):
+            if filename in candidates:
+                boost = 1 + UNDERLINKED_BOOST * max(0.0, 1 - equity.get(filename, 0.0))
+                ranked.append((similarity * boost, similarity, filename))
+        for weight, similarity, filename in sorted(ranked, key=lambda r: (-r[0], r[2]))[:5]:
+            related_blogs.append(candidates[filename])
+            print(f"    {similarity:.3f} (equity {equity.get(filename, 0.0):.2f})  {candidates[filename]['title']}")
+    for post in candidates.values():
         if len(related_blogs) >= 5:
             break
+        if post not in related_blogs:
+            related_blogs.append(post)
 
-    print(f"  📚 Found {len(related_blogs)} existing blogs")
+    print(f"  📚 Found {len(candidates)} existing blogs")
     print("")
 
     # 1. Add related articles to new blog (local file before deploy)
@@ -202,16 +264,24 @@ def main():
         print(f"  ⚠️ Local HTML not found: {local_html}")
     print("")
 
-    # 2. Add backlinks in recent old blogs pointing to new blog
+    # 2. Add backlinks in related old blogs pointing to new blog (one batch)
     print("🔙 Adding backlinks in older blogs...")
-    backlink_count = 0
-    for blog in related_blogs[:3]:
-        if add_backlink_to_old_blog(config, blog['path'], new_title, new_filename):
-            print(f"  ✅ Backlink added in: {blog['filename']}")
-            backlink_count += 1
-
-    if backlink_count == 0:
+    limit = int(ctx.config.get('MORE_READING_LINKS', '') or DEFAULT_MORE_READING_LINKS)
+    try:
+        touched, conflicts = update_backlinks(ctx, [blog['path'] for blog in related_blogs[:3]],
+                                              new_title, new_filename, limit)
+    except TransportError as e:
+        print(f"  ⚠️ Backlink update failed: {e}")
+        touched, conflicts = [], []
+    for rel_path in touched:
+        print(f"  ✅ Backlink added in: {os.path.basename(rel_path)}")
+    for rel_path in conflicts:
+        print(f"  ⚠️ Skipped (changed on server since it was read): {os.path.basename(rel_path)}")
+    backlink_count = len(touched)
+
+    if backlink_count == 0 and not conflicts:
         print("  ℹ️ No new backlinks needed (already linked or no blogs)")
+    print(f"  📊 {backlink_count} files touched")
     print("")
 
     # Log
@@ -221,5 +291,12 @@ def main():
 
     print("✅ Internal linking complete!")
 
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
 if __name__ == "__main__":
     main()
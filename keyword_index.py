@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Keyword Cannibalization Index for LeadHorizon Blog
+Every published post's primary and secondary keyword phrases as normalized token sets
+with MinHash signatures (output/keyword_index.json), refreshed incrementally from the
+post catalog. An LSH band index answers "does a live page already target this
+keyword?" with a few dict lookups per candidate, so topic selection can reject or
+re-angle a topic before it costs a generation.
+"""
+
+import json
+import os
+import re
+import sys
+
+from blog_catalog import fetch_catalog
+from minhash import LSHIndex, MinHasher, jaccard
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Two phrases compete when their token sets overlap this much
+CONFLICT_JACCARD = 0.6
+
+# 63 permutations in 21 bands of 3: candidate pairs start around Jaccard 0.36, and a
+# pair at CONFLICT_JACCARD is found with >99% probability
+NUM_PERM = 63
+BANDS = 21
+ROWS = 3
+
+# Words every keyword on this site shares; they say nothing about the page's target
+STOPWORDS = set("""
+a an and the for of in on to with vs versus how what why best top guide tips complete ultimate
+real estate property properties india indian
+""".split())
+
+# Differentiating angles (title suffix, keyword suffix) tried in order on a colliding topic
+ANGLES = [
+    ("Luxury Housing Projects", "luxury housing buyers"),
+    ("Affordable Housing Projects", "affordable housing buyers"),
+    ("Delhi NCR Builders", "delhi ncr builders"),
+    ("Commercial Project Developers", "commercial project developers"),
+    ("Plotted Development Sales", "plotted development sales"),
+]
+
+_MINHASH = MinHasher(NUM_PERM)
+
+
+def tokens(phrase):
+    """Normalized token set: lower case, no stopwords or numbers, light plural fold"""
+    result = set()
+    for token in re.findall(r'[a-z0-9]+', phrase.lower()):
+        if token in STOPWORDS or token.isdigit():
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        result.add(token)
+    return result
+
+
+class KeywordIndex:
+    """Keyword phrases per post, with an in-memory LSH index over their signatures"""
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.posts = (data or {}).get("posts", {})  # filename -> {"keywords", "phrases": [[tokens, signature]]}
+        self.lsh = LSHIndex(BANDS, ROWS)
+        for filename, post in self.posts.items():
+            for i, (_, signature) in enumerate(post["phrases"]):
+                self.lsh.add((filename, i), signature)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r') as f:
+                return cls(path, json.load(f))
+        except (OSError, ValueError):
+            return cls(path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"posts": self.posts}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.posts)
+
+    def set_post(self, filename, keywords):
+        """Index a post's keywords: the primary phrase, plus secondary phrases of 2+ tokens"""
+        self.remove(filename)
+        phrases = []
+        for position, keyword in enumerate(keywords):
+            token_set = tokens(keyword)
+            if token_set and (position == 0 or len(token_set) > 1):
+                phrases.append([sorted(token_set), _MINHASH.signature(token_set)])
+        self.posts[filename] = {"keywords": list(keywords), "phrases": phrases}
+        for i, (_, signature) in enumerate(phrases):
+            self.lsh.add((filename, i), signature)
+
+    def remove(self, filename):
+        post = self.posts.pop(filename, None)
+        if post:
+            for i, (_, signature) in enumerate(post["phrases"]):
+                self.lsh.remove((filename, i), signature)
+
+    def conflicts(self, keyword, exclude=()):
+        """[(jaccard, filename, phrase)] of live pages targeting a phrase close to keyword"""
+        token_set = tokens(keyword)
+        if not token_set:
+            return []
+        found = {}
+        for filename, i in self.lsh.query(_MINHASH.signature(token_set)):
+            if filename in exclude:
+                continue
+            phrase = self.posts[filename]["phrases"][i][0]
+            score = jaccard(token_set, phrase)
+            if score >= CONFLICT_JACCARD and score > found.get(filename, (0,))[0]:
+                found[filename] = (score, ' '.join(phrase))
+        return sorted(((s, f, p) for f, (s, p) in found.items()), reverse=True)
+
+    def screen(self, line, exclude=()):
+        """A 'topic|primary|secondary' candidate as is, re-angled so it no longer competes
+        with a live page, or None"""
+        parts = line.split('|')
+        if len(parts) < 2 or not self.conflicts(parts[1], exclude):
+            return line
+        for title_suffix, keyword_suffix in ANGLES:
+            keyword = f"{parts[1].strip()} {keyword_suffix}"
+            if not self.conflicts(keyword, exclude):
+                return '|'.join([f"{parts[0].strip()} – {title_suffix}", keyword] + parts[2:])
+        return None
+
+
+def index_path(ctx):
+    return os.path.join(ctx.output_dir, 'keyword_index.json')
+
+
+def update_index(ctx):
+    """Load the index and re-index only posts whose keywords changed in the catalog"""
+    index = KeywordIndex.load(index_path(ctx))
+    catalog = fetch_catalog(ctx.archive)
+    if not catalog:
+        return index, 0, 0  # server unreachable: keep what we know
+
+    changed = removed = 0
+    live = set()
+    for post in catalog:
+        live.add(post['filename'])
+        if index.posts.get(post['filename'], {}).get("keywords") != post['keywords']:
+            index.set_post(post['filename'], post['keywords'])
+            changed += 1
+    for filename in [f for f in index.posts if f not in live]:
+        index.remove(filename)
+        removed += 1
+    if changed or removed:
+        index.save()
+    return index, changed, removed
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        index, changed, removed = update_index(ctx)
+    finally:
+        ctx.close()
+    print(f"🔑 Keyword index: {len(index)} posts ({changed} re-indexed, {removed} removed)")
+
+    for keyword in sys.argv[1:]:
+        hits = index.conflicts(keyword)
+        if not hits:
+            print(f"  ✅ \"{keyword}\": no competing page")
+        for score, filename, phrase in hits:
+            print(f"  ⚠️ \"{keyword}\" competes with {filename} (\"{phrase}\", {score:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Keyword Auto-Linker for LeadHorizon Blog
+Links the first mention of another post's primary/secondary keyword inside the new
+article's <p> text to that post. Keywords come from each published post's
+<meta name="keywords"> (primary keyword first, as written by generate_blog.sh); all of
+them go into one Aho-Corasick automaton, so the scan stays linear in the article text
+however many posts and keywords the site has.
+"""
+
+import os
+import re
+import sys
+from collections import deque
+from datetime import datetime
+from html import escape
+
+from blog_catalog import fetch_catalog
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Per-article caps (MAX_LINKS overridable with AUTOLINK_MAX_LINKS in config.sh)
+DEFAULT_MAX_LINKS = 8
+MAX_LINKS_PER_PARAGRAPH = 2
+MIN_KEYWORD_LENGTH = 4
+
+_PARAGRAPH = re.compile(r'(<p\b[^>]*>)(.*?)(</p>)', re.S | re.I)
+# Tags, and whole <a>...</a> elements, inside a paragraph are never linked into
+_SKIP = re.compile(r'<a\b.*?</a>|<[^>]+>', re.S | re.I)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over lower-cased keywords"""
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] = self.out[state] + (keyword,)
+
+        # Breadth-first failure links; outputs inherit the failure state's outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and char not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def finditer(self, text):
+        """Yield (start, end, keyword) for every whole-word occurrence in text"""
+        state = 0
+        lowered = text.lower()
+        for i, char in enumerate(lowered):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for keyword in self.out[state]:
+                start = i + 1 - len(keyword)
+                if (start == 0 or not lowered[start - 1].isalnum()) and \
+                        (i + 1 == len(lowered) or not lowered[i + 1].isalnum()):
+                    yield start, i + 1, keyword
+
+
+def keyword_targets(catalog, new_post):
+    """{lower-cased keyword: post} for every published post; a post's primary keyword wins
+    over another post's secondary one, otherwise the newest post wins"""
+    own = {k.lower() for k in [new_post.get('primary_keyword', '')] if k}
+    targets, rank = {}, {}
+    for post in catalog:  # newest first
+        if post['filename'] == new_post.get('filename'):
+            continue
+        for position, keyword in enumerate(post.get('keywords', [])):
+            keyword = re.sub(r'\s+', ' ', keyword).strip().lower()
+            if len(keyword) < MIN_KEYWORD_LENGTH or keyword in own:
+                continue
+            priority = 0 if position == 0 else 1
+            if keyword not in targets or priority < rank[keyword]:
+                targets[keyword] = post
+                rank[keyword] = priority
+    return targets
+
+
+def link_text(segment, matcher, targets, state, max_links):
+    """Link the first occurrence of each keyword in one plain-text run (caps in state)"""
+    # Leftmost-longest, non-overlapping matches
+    chosen, last_end = [], 0
+    for start, end, keyword in sorted(matcher.finditer(segment), key=lambda m: (m[0], -(m[1] - m[0]))):
+        if start < last_end:
+            continue
+        post = targets[keyword]
+        if keyword in state['keywords'] or post['filename'] in state['posts']:
+            continue
+        if state['total'] >= max_links or state['in_paragraph'] >= MAX_LINKS_PER_PARAGRAPH:
+            break
+        chosen.append((start, end, post))
+        state['keywords'].add(keyword)
+        state['linked'].append((keyword, post['filename']))
+        state['posts'].add(post['filename'])
+        state['total'] += 1
+        state['in_paragraph'] += 1
+        last_end = end
+
+    for start, end, post in reversed(chosen):
+        anchor = (f'<a href="{post["filename"]}" class="auto-link" title="{escape(post["title"], quote=True)}">'
+                  f'{segment[start:end]}</a>')
+        segment = segment[:start] + anchor + segment[end:]
+    return segment
+
+
+def autolink(content, targets, max_links=DEFAULT_MAX_LINKS):
+    """(new HTML, [(keyword, filename)]) with keywords linked in the article's paragraphs"""
+    if not targets:
+        return content, []
+    matcher = KeywordMatcher(targets)
+    state = {"keywords": set(), "posts": set(), "linked": [], "total": 0, "in_paragraph": 0}
+
+    # Only the article body; the hero, nav and footer keep their own links
+    article = re.search(r'<article\b.*?</article>', content, re.S | re.I)
+    lo, hi = (article.start(), article.end()) if article else (0, len(content))
+
+    def paragraph(match):
+        if state['total'] >= max_links:
+            return match.group(0)
+        state['in_paragraph'] = 0
+        inner, parts, pos = match.group(2), [], 0
+        for skip in _SKIP.finditer(inner):
+            parts.append(link_text(inner[pos:skip.start()], matcher, targets, state, max_links))
+            parts.append(skip.group(0))
+            pos = skip.end()
+        parts.append(link_text(inner[pos:], matcher, targets, state, max_links))
+        return match.group(1) + ''.join(parts) + match.group(3)
+
+    body = _PARAGRAPH.sub(paragraph, content[lo:hi])
+    return content[:lo] + body + content[hi:], state['linked']
+
+
+def run(ctx):
+    print("🔤 Keyword Auto-Linker")
+    print("=" * 50)
+
+    blog = ctx.blog
+    if not blog:
+        print("❌ No blog metadata found.")
+        sys.exit(1)
+    local_html = os.path.join(ctx.output_dir, blog.get('filename', ''))
+    if not os.path.isfile(local_html):
+        print(f"❌ Local HTML not found: {local_html}")
+        sys.exit(1)
+
+    with open(local_html, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if 'class="auto-link"' in content:
+        print("  ⏭️ Article already auto-linked")
+        return
+
+    targets = keyword_targets(fetch_catalog(ctx.archive), blog)
+    print(f"📚 {len(targets)} keywords from published posts")
+
+    max_links = int(ctx.config.get('AUTOLINK_MAX_LINKS', '') or DEFAULT_MAX_LINKS)
+    content, linked = autolink(content, targets, max_links)
+    if linked:
+        with open(local_html, 'w', encoding='utf-8') as f:
+            f.write(content)
+    for keyword, filename in linked:
+        print(f"  🔗 \"{keyword}\" → {filename}")
+
+    log_file = os.path.join(SCRIPT_DIR, 'internal_links_log.txt')
+    with open(log_file, 'a') as f:
+        f.write(f"{datetime.now().isoformat()} | {blog.get('filename', '')} | keyword_links:{len(linked)}\n")
+
+    print(f"✅ {len(linked)} keyword links added")
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
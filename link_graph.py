@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Internal Link Graph for LeadHorizon Blog
+Which post links to which (output/link_graph.json), parsed from each post's anchors and
+re-parsed only when a post's content hash changes. Exposes in/out-degree, orphaned
+posts (nothing links to them) and a PageRank-style link-equity score, computed with
+scipy sparse matrices when available and a pure-Python power iteration otherwise.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+try:
+    import numpy as np
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from pipeline_context import RunContext
+from run_manifest import file_hash
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DAMPING = 0.85
+TOLERANCE = 1e-9
+MAX_ITERATIONS = 100
+
+_HREF = re.compile(r'<a\b[^>]*?\bhref="([^"]+)"', re.I)
+
+
+def post_links(page, site_url=''):
+    """Blog filenames a post's anchors point at (relative, /blog/, ../blog/ or absolute)"""
+    targets = set()
+    for href in _HREF.findall(page):
+        href = href.split('#')[0].split('?')[0]
+        if site_url and href.startswith(site_url):
+            href = href[len(site_url):]
+        if href.startswith(('http://', 'https://', 'mailto:', 'tel:')) or not href.endswith('.html'):
+            continue
+        parts = [p for p in href.split('/') if p and p != '..' and p != '.']
+        if len(parts) == 1 or (len(parts) == 2 and parts[0] == 'blog'):
+            targets.add(parts[-1])
+    return targets
+
+
+def pagerank(nodes, edges):
+    """{node: score} (scores sum to 1) for a list of nodes and {node: set(targets)}"""
+    n = len(nodes)
+    if not n:
+        return {}
+    index = {node: i for i, node in enumerate(nodes)}
+    out_degree = [len(edges.get(node, ())) for node in nodes]
+
+    if SCIPY_AVAILABLE:
+        rows, cols, vals = [], [], []
+        for node in nodes:
+            src = index[node]
+            for target in edges.get(node, ()):
+                rows.append(index[target])
+                cols.append(src)
+                vals.append(1.0 / out_degree[src])
+        matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(n, n))
+        dangling = np.array([d == 0 for d in out_degree])
+        rank = np.full(n, 1.0 / n)
+        for _ in range(MAX_ITERATIONS):
+            new = DAMPING * (matrix @ rank + rank[dangling].sum() / n) + (1 - DAMPING) / n
+            done = np.abs(new - rank).sum() < TOLERANCE
+            rank = new
+            if done:
+                break
+        return {node: float(rank[index[node]]) for node in nodes}
+
+    incoming = [[] for _ in range(n)]
+    for node in nodes:
+        src = index[node]
+        for target in edges.get(node, ()):
+            incoming[index[target]].append(src)
+    dangling = [i for i in range(n) if not out_degree[i]]
+    rank = [1.0 / n] * n
+    for _ in range(MAX_ITERATIONS):
+        leaked = DAMPING * sum(rank[i] for i in dangling) / n
+        share = [rank[i] / out_degree[i] if out_degree[i] else 0.0 for i in range(n)]
+        new = [(1 - DAMPING) / n + leaked + DAMPING * sum(share[j] for j in incoming[i]) for i in range(n)]
+        done = sum(abs(a - b) for a, b in zip(new, rank)) < TOLERANCE
+        rank = new
+        if done:
+            break
+    return {node: rank[index[node]] for node in nodes}
+
+
+class LinkGraph:
+    """Per-post outgoing links with the content hash they were parsed from"""
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.posts = (data or {}).get("posts", {})  # filename -> {"sha256", "links"}
+        self._scores = None
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r') as f:
+                return cls(path, json.load(f))
+        except (OSError, ValueError):
+            return cls(path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"posts": self.posts}, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.posts)
+
+    def set_post(self, name, links, sha256=None):
+        self.posts[name] = {"sha256": sha256, "links": sorted(set(links) - {name})}
+        self._scores = None
+
+    def remove(self, name):
+        if self.posts.pop(name, None) is not None:
+            self._scores = None
+
+    def edges(self):
+        """{post: set(posts it links to)}, only links between known posts"""
+        return {name: {t for t in post["links"] if t in self.posts} for name, post in self.posts.items()}
+
+    def degrees(self):
+        """{post: (in-degree, out-degree)}"""
+        edges = self.edges()
+        in_degree = dict.fromkeys(self.posts, 0)
+        for targets in edges.values():
+            for target in targets:
+                in_degree[target] += 1
+        return {name: (in_degree[name], len(edges[name])) for name in self.posts}
+
+    def orphans(self):
+        return sorted(name for name, (in_degree, _) in self.degrees().items() if in_degree == 0)
+
+    def scores(self):
+        """Link-equity score per post, scaled so the average post scores 1.0"""
+        if self._scores is None:
+            ranks = pagerank(sorted(self.posts), self.edges())
+            self._scores = {name: rank * len(ranks) for name, rank in ranks.items()}
+        return self._scores
+
+
+def graph_path(ctx):
+    return os.path.join(ctx.output_dir, 'link_graph.json')
+
+
+def update_graph(ctx, extra=None):
+    """Load the graph and re-parse only posts whose mirror copy changed; extra is
+    {filename: local html path} for posts not deployed yet"""
+    graph = LinkGraph.load(graph_path(ctx))
+    parsed = removed = 0
+
+    sources = {}
+    mirror = ctx.mirror
+    if mirror.is_current():
+        for rel_path, entry in mirror.files.items():
+            parts = rel_path.split('/')
+            if len(parts) == 2 and parts[0] == 'blog' and parts[1].endswith('.html'):
+                sources[parts[1]] = (mirror.path(rel_path), entry['sha256'])
+        for name in [n for n in graph.posts if n not in sources and n not in (extra or {})]:
+            graph.remove(name)
+            removed += 1
+    for name, path in (extra or {}).items():
+        sources[name] = (path, file_hash(path))
+
+    for name, (path, sha256) in sources.items():
+        if sha256 and graph.posts.get(name, {}).get("sha256") != sha256:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                graph.set_post(name, post_links(f.read(), ctx.site_url), sha256)
+            parsed += 1
+
+    if parsed or removed:
+        graph.save()
+    return graph, parsed, removed
+
+
+def main():
+    ctx = RunContext.load()
+    blog = ctx.blog
+    extra = {}
+    if blog.get('filename') and os.path.exists(os.path.join(ctx.output_dir, blog['filename'])):
+        extra[blog['filename']] = os.path.join(ctx.output_dir, blog['filename'])
+
+    started = time.time()
+    graph, parsed, removed = update_graph(ctx, extra)
+    degrees = graph.degrees()
+    scores = graph.scores()
+    elapsed = time.time() - started
+
+    print("🕸️ Internal Link Graph")
+    print("=" * 50)
+    print(f"📚 {len(graph)} posts, {sum(out for _, out in degrees.values())} internal links "
+          f"({parsed} parsed, {removed} removed) in {elapsed:.2f}s "
+          f"[{'scipy' if SCIPY_AVAILABLE else 'pure Python'}]")
+    print("")
+    print("🏆 Most link equity:")
+    for name in sorted(scores, key=lambda n: -scores[n])[:10]:
+        print(f"  {scores[name]:6.2f}  in:{degrees[name][0]:<4} out:{degrees[name][1]:<4} {name}")
+
+    orphans = graph.orphans()
+    print("")
+    print(f"🏝️ Orphaned posts (no internal links point at them): {len(orphans)}")
+    for name in orphans[:20]:
+        print(f"  - {name}")
+    if len(orphans) > 20:
+        print(f"  ... and {len(orphans) - 20} more")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Blog Listing Builder for LeadHorizon Blog
+Renders the blog listing from the post catalog into fixed-size pages instead of
+prepending a card to blog.html on every deploy:
+  blog.html                          newest posts
+  blog/page/N.html                   archive pages, numbered from the oldest post so
+                                     a new post only changes the last one
+  blog/category/<slug>.html (+ /page/N.html)   the same per category
+The live blog.html is the template (everything around its blog-grid). Pages whose
+content signature did not change are neither re-rendered nor uploaded.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from html import escape
+
+from blog_catalog import site_posts
+from pipeline_context import RunContext
+from remote_transport import TransportError
+from run_manifest import file_hash
+from site_mirror import live_hashes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PAGE_SIZE = 12
+
+LIVE_PATTERNS = ['blog.html', 'blog/page/*.html', 'blog/category/*.html', 'blog/category/*/page/*.html']
+
+LISTING_CARD = """
+                <article class="blog-card fade-in">
+                    <div class="blog-image">
+                        <img src="images/{image}" alt="{title} - Real Estate Digital Marketing Guide | LeadHorizon" loading="lazy">
+                        <span class="blog-category">{category}</span>
+                    </div>
+                    <div class="blog-content">
+                        <h3><a href="blog/{filename}">{title}</a></h3>
+                        <p>Expert insights and strategies for real estate developers from LeadHorizon.</p>
+                        <a href="blog/{filename}" class="blog-link">Read More <i class="fas fa-arrow-right"></i></a>
+                    </div>
+                </article>"""
+
+NAV_START = '<!-- listing-nav:start -->'
+NAV_END = '<!-- listing-nav:end -->'
+
+_GRID_OPEN = re.compile(r'<div class="blog-grid"[^>]*>')
+_DIV_TAG = re.compile(r'<div\b|</div>')
+_NAV_BLOCK = re.compile(r'\s*' + re.escape(NAV_START) + r'.*?' + re.escape(NAV_END), re.S)
+# href/src/action values relative to the site root in blog.html (not absolute, root-relative,
+# a #fragment or ?query, or empty)
+_RELATIVE_URL = re.compile(r'(\s(?:href|src|action)=["\'])(?![a-zA-Z][\w+.-]*:|[/#?"\'])', re.I)
+
+# Part of every page signature: bump when render_page output changes so pages re-render
+RENDER_VERSION = 2
+
+
+def category_slug(category):
+    return re.sub(r'[^a-z0-9]+', '-', category.lower()).strip('-') or 'uncategorized'
+
+
+def split_template(html):
+    """(text up to and including the blog-grid opening tag, text from its closing tag on)"""
+    match = _GRID_OPEN.search(html)
+    if not match:
+        return None
+    depth = 1
+    for tag in _DIV_TAG.finditer(html, match.end()):
+        depth += 1 if tag.group(0) == '<div' else -1
+        if depth == 0:
+            suffix = _NAV_BLOCK.sub('', html[tag.start():], count=1)
+            return html[:match.end()], suffix
+    return None
+
+
+def render_card(post):
+    return LISTING_CARD.format(
+        image=f"{post['slug']}.jpg",
+        title=escape(post['title'], quote=True),
+        category=escape(post.get('category') or 'Market Trends'),
+        filename=post['filename'],
+    )
+
+
+def render_nav(newer, older, label, categories=()):
+    """Pagination links (and category links on the main listing) below the grid"""
+    links = []
+    if newer:
+        links.append(f'<a href="{newer}" class="blog-link"><i class="fas fa-arrow-left"></i> Newer Articles</a>')
+    links.append(f'<span style="margin:0 15px;color:#666;">{label}</span>')
+    if older:
+        links.append(f'<a href="{older}" class="blog-link">Older Articles <i class="fas fa-arrow-right"></i></a>')
+    html = (f'\n        {NAV_START}\n        <nav class="blog-pagination" style="text-align:center;margin:40px 0;">'
+            + ''.join(links) + '</nav>')
+    if categories:
+        chips = ' · '.join(f'<a href="blog/category/{category_slug(c)}.html">{escape(c)}</a>' for c in categories)
+        html += f'\n        <p class="blog-categories" style="text-align:center;">Browse by topic: {chips}</p>'
+    return html + f'\n        {NAV_END}'
+
+
+def render_page(template, page, site_url):
+    """Full HTML of one listing page"""
+    prefix, suffix = template
+    nested = page['path'] != 'blog.html'
+    if nested:
+        prefix = re.sub(r'<title>.*?</title>', lambda m: f"<title>{escape(page['title'])}</title>", prefix,
+                        count=1, flags=re.S)
+        prefix = re.sub(r'(<link rel="canonical" href=")[^"]*', lambda m: m.group(1) + f"{site_url}/{page['path']}",
+                        prefix, count=1)
+    cards = ''.join(render_card(post) for post in page['posts'])
+    close, rest = suffix[:len('</div>')], suffix[len('</div>'):]
+    html = prefix + cards + '\n            ' + close + page['nav'] + rest
+    if nested:
+        # Links written relative to the site root become root-relative; no <base>, so
+        # #fragment links still point into the page itself
+        html = _RELATIVE_URL.sub(r'\1/', html)
+    return html
+
+
+def paginate(posts, main_path, archive_path, name, page_size, categories=()):
+    """Pages for one listing: the newest page_size posts at main_path, then fixed
+    archive pages of page_size posts counted from the oldest"""
+    if not posts:
+        return []
+    chunks = [posts[i:i + page_size] for i in range(0, len(posts), page_size)]
+    total = len(chunks)
+    newest = list(reversed(posts[-page_size:]))
+    pages = [{
+        "path": main_path,
+        "posts": newest,
+        "title": f"{name} | LeadHorizon",
+        "nav": render_nav(None, archive_path.format(n=total - 1) if total > 1 else None,
+                          f"Latest {len(newest)} of {len(posts)} articles", categories),
+    }]
+    for n, chunk in enumerate(chunks, 1):
+        newer = archive_path.format(n=n + 1) if n < total else main_path
+        older = archive_path.format(n=n - 1) if n > 1 else None
+        pages.append({
+            "path": archive_path.format(n=n),
+            "posts": list(reversed(chunk)),
+            "title": f"{name} - Page {n} | LeadHorizon",
+            "nav": render_nav(newer, older, f"Page {n} of {total}"),
+        })
+    return pages
+
+
+def plan_pages(posts, page_size):
+    """Every listing page: the main listing plus one listing per category"""
+    categories = sorted({p['category'] for p in posts if p.get('category')})
+    pages = paginate(posts, 'blog.html', 'blog/page/{n}.html', 'Blog', page_size, categories)
+    for category in categories:
+        slug = category_slug(category)
+        in_category = [p for p in posts if p.get('category') == category]
+        pages += paginate(in_category, f'blog/category/{slug}.html', f'blog/category/{slug}/page/{{n}}.html',
+                          f'{category} Articles', page_size)
+    return pages
+
+
+def signature(page, template_hash):
+    """Everything a page's HTML depends on"""
+    content = {
+        "render": RENDER_VERSION,
+        "template": template_hash,
+        "title": page['title'],
+        "nav": page['nav'],
+        "posts": [[p['filename'], p['title'], p.get('category', '')] for p in page['posts']],
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_template(ctx):
+    """Grid template from the live blog.html (site mirror or server)"""
+    with tempfile.TemporaryDirectory() as workdir:
+        local_path = os.path.join(workdir, 'blog.html')
+        try:
+            ctx.archive.download('blog.html', local_path)
+        except TransportError:
+            return None
+        with open(local_path, 'r', encoding='utf-8') as f:
+            return split_template(f.read())
+
+
+def build_and_publish(ctx):
+    """Render and publish the listing pages that changed; returns (published, skipped)"""
+    template = load_template(ctx)
+    if not template:
+        raise ValueError("blog.html has no <div class=\"blog-grid\"> to render into")
+    template_hash = hashlib.sha256(''.join(template).encode('utf-8')).hexdigest()
+    page_size = int(ctx.config.get('LISTING_PAGE_SIZE', '') or DEFAULT_PAGE_SIZE)
+
+    out_dir = os.path.join(ctx.output_dir, 'listing')
+    state_path = os.path.join(out_dir, 'state.json')
+    state = ctx.read_json(state_path)
+    live = live_hashes(ctx, LIVE_PATTERNS)
+
+    published, skipped = [], []
+    pages = plan_pages(site_posts(ctx), page_size)
+    # Archive and category pages before blog.html, so its links never point at a missing page
+    for page in sorted(pages, key=lambda p: (p['path'] == 'blog.html', p['path'])):
+        sig = signature(page, template_hash)
+        known = state.get(page['path'], {})
+        if known.get('signature') == sig and live.get(page['path']) == known.get('sha256'):
+            skipped.append(page['path'])
+            continue
+        local_path = os.path.join(out_dir, page['path'])
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, 'w', encoding='utf-8') as f:
+            f.write(render_page(template, page, ctx.site_url))
+        digest = file_hash(local_path)
+        if live.get(page['path']) != digest:
+            ctx.publish(page['path'], local_path)
+            published.append(page['path'])
+        else:
+            skipped.append(page['path'])
+        state[page['path']] = {"signature": sig, "sha256": digest}
+
+    ctx.write_json(state_path, state)
+    return published, skipped
+
+
+def run(ctx):
+    print("📝 Blog Listing Builder")
+    print("=" * 50)
+
+    try:
+        published, skipped = build_and_publish(ctx)
+    except (TransportError, ValueError) as e:
+        print(f"❌ Listing update failed: {e}")
+        sys.exit(1)
+
+    for path in published:
+        print(f"  📤 {path}")
+    print(f"✅ Blog listing updated: {len(published)} pages published, {len(skipped)} unchanged")
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache for LeadHorizon Blog Automation
+Content-addressed store of completed LLM responses (output/llm_cache/), keyed by model,
+a hash of the prompt and the sampling options. Each entry also keeps the model's digest:
+after an `ollama pull` swaps the weights, old entries stop matching. A rerun with
+the same prompt (after a deploy failure, or while iterating on the HTML template or
+post-processing) gets the earlier generation back instantly instead of decoding again.
+
+Bounded to LLM_CACHE_MAX_MB; the least recently used entries are evicted first.
+Bypass with LLM_NO_CACHE=1 (environment) or LLM_CACHE="off" (config.sh).
+
+CLI:
+  llm_cache.py            entries and size
+  llm_cache.py clear      remove every entry
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MAX_MB = 200
+
+
+def cache_key(model, prompt, options):
+    """sha256 over model, prompt hash and canonical options"""
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    material = json.dumps({"model": model, "prompt": prompt_hash, "options": options or {}}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """One JSON file per response under root/<key[:2]>/; file mtime is the LRU clock"""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, enabled=True):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    @classmethod
+    def from_context(cls, ctx):
+        max_mb = float(ctx.config.get('LLM_CACHE_MAX_MB', '') or DEFAULT_MAX_MB)
+        enabled = (os.environ.get('LLM_NO_CACHE', '') in ('', '0')
+                   and ctx.config.get('LLM_CACHE', '').lower() != 'off')
+        return cls(os.path.join(ctx.output_dir, 'llm_cache'), int(max_mb * 1024 * 1024), enabled)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + '.json')
+
+    def get(self, key, digest=None):
+        """Cached response text, or None. A known digest must match the entry's; with
+        the server unreachable (digest None) the entry is trusted"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if digest and entry.get('digest') and entry['digest'] != digest:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry.get('response')
+
+    def put(self, key, response, model, digest=None, label=''):
+        if not self.enabled or not response:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"model": model, "digest": digest, "label": label,
+                       "created": time.strftime('%Y-%m-%dT%H:%M:%S'), "response": response}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self):
+        """[(mtime, size, path)] of every entry, oldest first"""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.json'):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, st.st_size, path))
+        return sorted(found)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        removed = 0
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+def main():
+    ctx = RunContext.load()
+    cache = LLMCache.from_context(ctx)
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+
+    if command == 'clear':
+        print(f"🧹 Removed {cache.clear()} cached LLM responses")
+    elif not command:
+        entries = cache.entries()
+        size = sum(s for _, s, _ in entries)
+        print(f"💾 LLM cache: {len(entries)} responses, {size / 1024 / 1024:.1f} of "
+              f"{cache.max_bytes / 1024 / 1024:.0f} MB ({'enabled' if cache.enabled else 'bypassed'})")
+    else:
+        print(__doc__.strip().split('CLI:')[1])
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
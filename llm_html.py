@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+LLM Output → HTML for LeadHorizon Blog Automation
+Turns the model's mixed markdown/HTML response into sanitized article HTML in one
+left-to-right pass over a token stream, and returns title, meta description and content
+together (replaces the temp-file + regex chain + sed extraction in generate_blog.sh).
+
+- markdown headings (#/##/###), bullet and numbered lists, **bold** and *italic*
+- plain text lines become <p> paragraphs (blank line = new paragraph)
+- only article tags survive (h2-h4, p, lists, strong/em, a[href], blockquote, tables);
+  h1, script and style are dropped with their content, other tags are unwrapped, text
+  is escaped, unclosed tags are closed, empty paragraphs disappear
+- cost is linear in the response size: no backtracking regexes over the whole
+  document, no intermediate copies per rule
+
+Usage:
+  llm_html.py RESPONSE_FILE [--shell]    JSON {title, meta, content}, or shell assignments
+  llm_html.py --bench                    timing/memory on large and pathological inputs
+"""
+
+import argparse
+import json
+import re
+import shlex
+import sys
+import time
+import tracemalloc
+from html import escape
+
+# Tags kept in the article (b/i and h5/h6 are mapped onto these)
+BLOCK_TAGS = {'h2', 'h3', 'h4', 'p', 'ul', 'ol', 'li', 'blockquote', 'pre',
+              'table', 'thead', 'tbody', 'tr', 'th', 'td'}
+INLINE_TAGS = {'strong', 'em', 'a', 'code', 'br'}
+RENAME = {'b': 'strong', 'i': 'em', 'h5': 'h4', 'h6': 'h4'}
+# Elements whose text may sit directly inside them
+TEXT_CONTAINERS = {'h2', 'h3', 'h4', 'p', 'li', 'blockquote', 'pre', 'th', 'td'}
+# Elements removed together with everything inside them
+DROP_WITH_CONTENT = {'h1', 'script', 'style', 'iframe', 'object', 'noscript'}
+VOID_TAGS = {'br'}
+
+# Deeper nesting than this is not real article structure; extra opening tags are dropped
+MAX_DEPTH = 48
+
+_TOKEN = re.compile(r"""
+    (?P<tag></?(?P<name>[A-Za-z][A-Za-z0-9_-]{0,30})(?P<attrs>\s[^<>]{0,1000})?\s*/?>)
+  | (?P<nl>\r?\n)
+  | (?P<strong>\*\*)
+  | (?P<em>\*)
+  | (?P<entity>&(?:\#[0-9]{1,7}|\#x[0-9A-Fa-f]{1,6}|[A-Za-z][A-Za-z0-9]{1,31});)
+  | (?P<text>[^<\n*&]+)
+  | (?P<char>[<&])
+""", re.VERBOSE)
+
+_LINE_START = re.compile(r'[ \t]*(?:(?P<hashes>#{1,6})[ \t]+|(?P<bullet>[*\-•])[ \t]+|(?P<number>\d{1,3})[.)][ \t]+)')
+_HREF = re.compile(r'''\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''', re.IGNORECASE)
+_DROP_END = {name: re.compile(rf'</{name}\s*>', re.IGNORECASE) for name in DROP_WITH_CONTENT}
+
+
+class _Element:
+    __slots__ = ('tag', 'implicit', 'at', 'filled', 'marker')
+
+    def __init__(self, tag, implicit, at, filled, marker=None):
+        self.tag = tag
+        self.implicit = implicit  # opened by markdown/paragraph rules, not by an HTML tag
+        self.at = at  # index in the output of the opening tag
+        self.filled = filled  # text characters written before it opened
+        self.marker = marker  # '**' / '*' for markdown emphasis
+
+
+class _Converter:
+    """Single pass over the token stream with a stack of open elements"""
+
+    def __init__(self):
+        self.out = []
+        self.stack = []
+        self.containers = 0  # open TEXT_CONTAINERS in the stack
+        self.explicit_containers = 0  # ... of which opened by HTML tags
+        self.filled = 0  # non-whitespace text characters written so far
+
+    # --- stack -------------------------------------------------------------
+
+    def _open(self, tag, implicit=False, attrs='', marker=None):
+        if len(self.stack) >= MAX_DEPTH:
+            return False
+        self.stack.append(_Element(tag, implicit, len(self.out), self.filled, marker))
+        self.out.append(f'<{tag}{attrs}>')
+        if tag in TEXT_CONTAINERS:
+            self.containers += 1
+            self.explicit_containers += not implicit
+        return True
+
+    def _pop(self):
+        element = self.stack.pop()
+        if element.tag in TEXT_CONTAINERS:
+            self.containers -= 1
+            self.explicit_containers -= not element.implicit
+        if element.marker:
+            # markdown emphasis never closed: it was a literal asterisk after all
+            self.out[element.at] = element.marker
+        elif element.tag == 'p' and self.filled == element.filled:
+            del self.out[element.at:]  # empty paragraph
+        else:
+            if self.out[-1] == '\n' and element.tag in TEXT_CONTAINERS:
+                self.out.pop()  # no line break before a closing tag
+            self.out.append(f'</{element.tag}>')
+            if element.tag in BLOCK_TAGS:
+                self.out.append('\n')
+
+    def _close_to(self, depth):
+        while len(self.stack) > depth:
+            self._pop()
+
+    def _find(self, tag):
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].tag == tag:
+                return depth
+        return -1
+
+    def close_implicit(self, tags):
+        """Close the innermost implicit element among tags (and everything inside it)"""
+        for depth in range(len(self.stack) - 1, -1, -1):
+            element = self.stack[depth]
+            if element.implicit and element.tag in tags:
+                self._close_to(depth)
+                return True
+        return False
+
+    def _ensure_container(self):
+        """Text and inline tags need a block around them: a list item inside a bare
+        list, otherwise an implicit paragraph"""
+        if self.containers:
+            return
+        if self.stack and self.stack[-1].tag in ('ul', 'ol'):
+            self._open('li', implicit=True)
+        elif not self.stack or self.stack[-1].tag not in ('table', 'thead', 'tbody', 'tr'):
+            self._open('p', implicit=True)
+
+    # --- tokens ------------------------------------------------------------
+
+    def text(self, value):
+        if not value.strip() and not self.containers:
+            return  # whitespace between blocks
+        self._ensure_container()
+        self.out.append(escape(value, quote=False))
+        self.filled += len(value.strip())
+
+    def entity(self, value):
+        self._ensure_container()
+        self.out.append(value)
+        self.filled += 1
+
+    def emphasis(self, marker):
+        tag = 'strong' if marker == '**' else 'em'
+        depth = self._find(tag)
+        if depth >= 0 and self.stack[depth].marker == marker:
+            self.stack[depth].marker = None  # matched: a real element
+            self._close_to(depth)
+            return
+        self._ensure_container()
+        self._open(tag, marker=marker)
+
+    def start_tag(self, name, attrs):
+        if name in VOID_TAGS:
+            self._ensure_container()
+            self.out.append(f'<{name}>')
+            return
+        if name in INLINE_TAGS:
+            self._ensure_container()
+            self._open(name, attrs=_link_attrs(attrs) if name == 'a' else '')
+            return
+        # block element: close what cannot contain it
+        if name == 'li':
+            depth = max(self._find('ul'), self._find('ol'))
+            if depth < 0:
+                self._close_blocks_for_new_block()
+                self._open('ul', implicit=True)
+            else:
+                self._close_to(depth + 1)
+        elif name in ('tr', 'td', 'th', 'thead', 'tbody'):
+            parent = {'tr': ('table', 'thead', 'tbody'), 'td': ('tr',), 'th': ('tr',)}.get(name, ('table',))
+            depth = max(self._find(tag) for tag in parent)
+            if depth >= 0:
+                self._close_to(depth + 1)
+        else:
+            self._close_blocks_for_new_block()
+        self._open(name)
+
+    def _close_blocks_for_new_block(self):
+        while self.stack and (self.stack[-1].tag in INLINE_TAGS or self.stack[-1].tag in ('p', 'h2', 'h3', 'h4')
+                              or (self.stack[-1].implicit and self.stack[-1].tag in ('ul', 'ol', 'li'))):
+            self._pop()
+
+    def end_tag(self, name):
+        depth = self._find(name)
+        if depth >= 0:
+            self._close_to(depth)
+
+    def line_start(self, match):
+        """Markdown block syntax at the start of a line outside any HTML block"""
+        if match.group('hashes'):
+            self._close_blocks_for_new_block()
+            level = len(match.group('hashes'))
+            self._open('h2' if level <= 2 else 'h3' if level == 3 else 'h4', implicit=True)
+        else:
+            kind = 'ul' if match.group('bullet') else 'ol'
+            self.close_implicit(('p',))
+            depth = self._find(kind)
+            if depth < 0 or not self.stack[depth].implicit:
+                self.close_implicit(('ul', 'ol'))
+                self._close_blocks_for_new_block()
+                self._open(kind, implicit=True)
+            else:
+                self._close_to(depth + 1)
+            self._open('li', implicit=True)
+
+    def end_line(self, blank):
+        # markdown headings and list items end with their line
+        self.close_implicit(('h2', 'h3', 'h4', 'li'))
+        if blank:
+            self.close_implicit(('p', 'ul', 'ol'))
+
+    def finish(self):
+        self._close_to(0)
+        return ''.join(self.out).strip()
+
+
+def _link_attrs(attrs):
+    match = _HREF.search(attrs or '')
+    if not match:
+        return ''
+    href = next(g for g in match.groups() if g is not None).strip()
+    if not href.lower().startswith(('http://', 'https://', '/', '#')):
+        return ''
+    return f' href="{escape(href)}"'
+
+
+def convert_content(text):
+    """Sanitized article HTML for the body of a response"""
+    conv = _Converter()
+    pos = 0
+    end = len(text)
+    at_line_start = True
+    line_has_text = False
+    token = _TOKEN.match
+    while pos < end:
+        if at_line_start:
+            at_line_start = False
+            if not conv.explicit_containers:
+                marker = _LINE_START.match(text, pos)
+                if marker:
+                    conv.line_start(marker)
+                    pos = marker.end()
+                    line_has_text = True
+                    continue
+                if text[pos:pos + 1] not in ('\n', '\r'):
+                    conv.close_implicit(('ul', 'ol'))  # a plain line ends a markdown list
+        match = token(text, pos)
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'text':
+            value = match.group()
+            conv.text(value)
+            line_has_text = line_has_text or bool(value.strip())
+        elif kind == 'nl':
+            conv.end_line(blank=not line_has_text)
+            if conv.containers:
+                conv.out.append('\n')
+            at_line_start = True
+            line_has_text = False
+        elif kind == 'tag':
+            line_has_text = True
+            closing = match.group('tag').startswith('</')
+            name = match.group('name').lower()
+            if name in DROP_WITH_CONTENT:
+                if not closing:
+                    drop_end = _DROP_END[name].search(text, pos)
+                    pos = drop_end.end() if drop_end else end
+                continue
+            name = RENAME.get(name, name)
+            if name not in BLOCK_TAGS and name not in INLINE_TAGS:
+                continue  # unknown tag: unwrap, keep its text
+            if closing:
+                conv.end_tag(name)
+            else:
+                conv.start_tag(name, match.group('attrs'))
+        elif kind == 'strong' or kind == 'em':
+            line_has_text = True
+            conv.emphasis(match.group())
+        elif kind == 'entity':
+            line_has_text = True
+            conv.entity(match.group())
+        else:  # a lone '<' or '&'
+            conv.text(match.group())
+            line_has_text = True
+    return conv.finish()
+
+
+def _section(response, lower, name):
+    """(start, end) of the text inside <name>...</name>; an unclosed section runs to the end"""
+    start = lower.find(f'<{name}>')
+    if start < 0:
+        return None
+    start += len(name) + 2
+    end = lower.find(f'</{name}>', start)
+    return start, end if end >= 0 else len(response)
+
+
+def _plain(text):
+    return ' '.join(re.sub(r'<[^>]*>', ' ', text).replace('*', '').split())
+
+
+def convert(response):
+    """{"title", "meta", "content"} from a raw LLM response"""
+    lower = response.lower()
+    title = _section(response, lower, 'title')
+    meta = _section(response, lower, 'meta_description')
+    content = _section(response, lower, 'content')
+    if content:
+        body = response[content[0]:content[1]]
+    else:
+        # no <content> tags: everything except the title and meta sections
+        cut = sorted(span for span in (title, meta) if span)
+        parts, pos = [], 0
+        for start, end in cut:
+            parts.append(response[pos:max(pos, lower.rfind('<', 0, start))])
+            pos = lower.find('>', end) + 1 if lower.find('>', end) >= 0 else end
+        parts.append(response[pos:])
+        body = ''.join(parts)
+    return {
+        "title": _plain(response[title[0]:title[1]]) if title else '',
+        "meta": _plain(response[meta[0]:meta[1]]) if meta else '',
+        "content": convert_content(body),
+    }
+
+
+# --- benchmark -------------------------------------------------------------
+
+_SAMPLE = """<title>Real Estate SEO in 2026</title>
+<meta_description>How builders in Delhi NCR win **organic** leads.</meta_description>
+<content>
+## Why SEO Matters for Builders
+Buyers start on Google: **78%** of homebuyers research online & compare *projects* first.
+
+* Local pack visibility for "flats in Noida"
+* Project pages that load in under 2s
+- RERA details on every page
+1. Audit
+2. Fix
+
+<h3>Gurgaon example</h3>
+<p>A <a href="https://example.com" onclick="x()">developer</a> doubled site visits.</p>
+<script>alert(1)</script>
+</content>
+"""
+
+
+def _bench_cases():
+    body = _SAMPLE.split('<content>')[1].split('</content>')[0]
+    return [
+        ("typical response (1 article)", _SAMPLE),
+        ("large response (~200 KB)", "<content>" + body * 500 + "</content>"),
+        ("huge response (~2 MB)", "<content>" + body * 5000 + "</content>"),
+        ("200k asterisks", "<content>" + "*" * 200_000 + "</content>"),
+        ("100k unmatched '<'", "<content>" + "a < b " * 100_000 + "</content>"),
+        ("20k nested <strong>", "<content>" + "<strong>x" * 20_000 + "</content>"),
+        ("unterminated tags", "<content>" + ("<a href='" + "x" * 900) * 500),
+        ("1 MB single line", "<content>" + "word **bold** " * 75_000 + "</content>"),
+        ("50k list lines", "<content>\n" + "- item *x*\n" * 50_000 + "</content>"),
+    ]
+
+
+def bench():
+    print("📏 llm_html benchmark")
+    print("=" * 50)
+    for label, text in _bench_cases():
+        started = time.perf_counter()
+        result = convert(text)
+        elapsed = time.perf_counter() - started
+        # memory in a second run: tracing slows the conversion itself down
+        tracemalloc.start()
+        convert(text)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        size = len(text.encode('utf-8'))
+        print(f"{label:<30} {size / 1024:7.0f} KB {elapsed * 1000:8.1f} ms "
+              f"{size / 1024 / 1024 / max(elapsed, 1e-9):6.1f} MB/s  peak {peak / 1024 / 1024:5.1f} MB "
+              f"→ {len(result['content']) / 1024:.0f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an LLM response to article HTML")
+    parser.add_argument('response', nargs='?', help="Response file ('-' for stdin)")
+    parser.add_argument('--shell', action='store_true', help="Print SEO_TITLE/META_DESC/CONTENT assignments for eval")
+    parser.add_argument('--bench', action='store_true', help="Benchmark on large and pathological inputs")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench()
+        return
+    if not args.response:
+        parser.error("a response file is required")
+    if args.response == '-':
+        response = sys.stdin.read()
+    else:
+        with open(args.response, 'r', encoding='utf-8', errors='replace') as f:
+            response = f.read()
+
+    result = convert(response)
+    if args.shell:
+        print(f"SEO_TITLE={shlex.quote(result['title'])}")
+        print(f"META_DESC={shlex.quote(result['meta'])}")
+        print(f"CONTENT={shlex.quote(result['content'])}")
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
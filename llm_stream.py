@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Streaming Article Generation for LeadHorizon Blog Automation
+Consumes Ollama's NDJSON stream instead of waiting for one 4096-token response:
+- every token is appended to a spool file (output/llm_spool_<label>.txt) as it arrives,
+  so a crash or timeout keeps whatever was written
+- <title>, <meta_description> and <content> are reported as soon as each one closes,
+  with live tokens/s
+- a stall (no token for LLM_STALL_SECONDS) or runaway output (the model looping on the
+  same text, or writing on after </content>) ends the request early
+- a cut-off response is salvaged: an unclosed <content> is trimmed to its last complete
+  block and closed, so generate_blog.sh gets a usable partial article
+
+Usage: llm_stream.py --label article --payload FILE [--timeout S] [--no-cache]
+(prints the response, or the salvaged part, on stdout; exit 1 if nothing usable).
+Complete responses are cached by llm_cache.py; salvaged partial ones are not.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from article_continuation import save_contexts
+from llm_cache import LLMCache, cache_key
+from ollama_client import OllamaClient, OllamaError, OllamaStall
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SECTIONS = ("title", "meta_description", "content")
+
+DEFAULT_STALL_SECONDS = 60
+PROGRESS_SECONDS = 15
+
+# Runaway check: the last LOOP_WINDOW characters already occurring LOOP_REPEATS times
+# in the recent output means the model is stuck in a loop
+LOOP_WINDOW = 120
+LOOP_REPEATS = 3
+LOOP_LOOKBACK = 4000
+
+# Closing tags after which an article can be cut without leaving broken markup
+_BLOCK_END = re.compile(r'</(?:p|ul|ol|h[2-6]|table|blockquote|div)>', re.IGNORECASE)
+
+
+class SectionParser:
+    """Tracks which response sections have opened and closed while text streams in"""
+
+    def __init__(self):
+        self.text = ''
+        self.opened = {}  # section -> offset just after its opening tag
+        self.closed = {}  # section -> offset just after its closing tag
+        self.sections = {}  # section -> completed text
+        self._scan = 0
+
+    def feed(self, chunk):
+        """Add streamed text; returns the sections completed by it"""
+        self.text += chunk
+        completed = []
+        # re-scan a little before the new text: tags can be split across tokens
+        start = max(0, self._scan - len('</meta_description>'))
+        window = self.text[start:].lower()
+        for name in SECTIONS:
+            if name in self.sections:
+                continue
+            if name not in self.opened:
+                at = window.find(f'<{name}>')
+                if at < 0:
+                    continue
+                self.opened[name] = start + at + len(name) + 2
+            end = window.find(f'</{name}>', max(self.opened[name] - start, 0))
+            if end >= 0:
+                end += start
+                self.sections[name] = self.text[self.opened[name]:end].strip()
+                self.closed[name] = end + len(name) + 3
+                completed.append(name)
+        self._scan = len(self.text)
+        return completed
+
+    @property
+    def complete(self):
+        return all(name in self.sections for name in SECTIONS)
+
+    def salvage(self):
+        """The response with an unclosed <content> trimmed to its last whole block and
+        closed; None when there is no usable article text"""
+        if 'content' in self.sections:
+            return self.text
+        if 'content' not in self.opened:
+            return None
+        body = self.text[self.opened['content']:]
+        # a trailing heading whose section never arrived is dropped too
+        ends = [m for m in _BLOCK_END.finditer(body) if not m.group(0)[2:].lower().startswith('h')]
+        if not ends:
+            return None
+        return self.text[:self.opened['content']] + body[:ends[-1].end()] + '\n</content>'
+
+
+def loop_start(text):
+    """Offset where the text started repeating itself (its tail seen LOOP_REPEATS times
+    in the recent output), or -1"""
+    if len(text) < LOOP_WINDOW * LOOP_REPEATS:
+        return -1
+    tail = text[-LOOP_WINDOW:]
+    recent_from = max(0, len(text) - LOOP_LOOKBACK)
+    if not tail.strip() or text.count(tail, recent_from) < LOOP_REPEATS:
+        return -1
+    return text.find(tail, recent_from)
+
+
+def stream_generate(client, prompt, options, label, spool_path, timeout=300, stall_timeout=DEFAULT_STALL_SECONDS):
+    """Stream one completion into spool_path; returns (parser, status, final) where
+    status is done, length, timeout, stall, loop, overrun or error, and final is the
+    server's closing chunk (timings, context) or {} if the stream was cut"""
+    parser = SectionParser()
+    started = time.time()
+    last_progress = started
+    first_token = None
+    tokens = 0
+    final = {}
+    status = 'error'
+
+    os.makedirs(os.path.dirname(spool_path), exist_ok=True)
+    chunks = client.stream(prompt, options, stall_timeout=stall_timeout)
+    try:
+        with open(spool_path, 'w', encoding='utf-8') as spool:
+            for chunk in chunks:
+                if chunk.get('done'):
+                    final = chunk
+                    status = 'length' if chunk.get('done_reason') == 'length' else 'done'
+                    break
+                text = chunk.get('response', '')
+                if not text:
+                    continue
+                now = time.time()
+                first_token = first_token or now
+                tokens += 1
+                spool.write(text)
+                spool.flush()
+
+                for name in parser.feed(text):
+                    print(f"  ✓ <{name}> complete ({len(parser.sections[name].split())} words, "
+                          f"{tokens} tokens, {now - started:.0f}s)", file=sys.stderr)
+                if now - last_progress >= PROGRESS_SECONDS:
+                    rate = tokens / (now - first_token) if now > first_token else 0.0
+                    print(f"  ✍️ {tokens} tokens, {rate:.1f} tok/s", file=sys.stderr)
+                    last_progress = now
+
+                if parser.complete and len(parser.text) - parser.closed['content'] > LOOP_WINDOW:
+                    status = 'overrun'  # everything we need is in; the rest is chatter
+                    break
+                if tokens % 20 == 0:
+                    start = loop_start(parser.text)
+                    if start >= 0:
+                        parser.text = parser.text[:start + LOOP_WINDOW]  # keep one copy
+                        status = 'loop'
+                        break
+                if now - started > timeout:
+                    status = 'timeout'
+                    break
+    except OllamaStall:
+        status = 'stall'
+    except OllamaError as e:
+        print(f"❌ Ollama stream failed: {e}", file=sys.stderr)
+        status = 'error'
+    finally:
+        chunks.close()
+
+    if final:
+        client.record_metrics(label, final, status=status)
+    else:
+        # cut short: the server's own timings never arrived, so record what we measured
+        elapsed = time.time() - started
+        decode = time.time() - first_token if first_token else 0.0
+        client.record_metrics(label, {"eval_count": tokens, "eval_duration": int(decode * 1e9),
+                                      "total_duration": int(elapsed * 1e9)}, status=status)
+    return parser, status, final
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Stream one Ollama completion with a spool file")
+    arg_parser.add_argument('--label', default='article')
+    arg_parser.add_argument('--payload', required=True, help="JSON file with 'prompt' and optional 'options'")
+    arg_parser.add_argument('--timeout', type=int, default=300, help="Wall-clock limit for the whole response")
+    arg_parser.add_argument('--no-cache', action='store_true', help="Always call the model (skip the response cache)")
+    args = arg_parser.parse_args()
+
+    ctx = RunContext.load()
+    client = OllamaClient.from_context(ctx)
+    stall_timeout = int(ctx.config.get('LLM_STALL_SECONDS', '') or DEFAULT_STALL_SECONDS)
+    spool_path = os.path.join(ctx.output_dir, f'llm_spool_{args.label}.txt')
+
+    with open(args.payload, 'r') as f:
+        payload = json.load(f)
+
+    cache = LLMCache.from_context(ctx)
+    cache.enabled = cache.enabled and not args.no_cache
+    key = cache_key(client.model, payload['prompt'], payload.get('options'))
+    digest = client.model_digest() if cache.enabled else None
+    cached = cache.get(key, digest)
+    if cached is not None:
+        print(f"💾 [{args.label}] cached response ({len(cached)} chars)", file=sys.stderr)
+        sys.stdout.write(cached)
+        return
+
+    try:
+        parser, status, final = stream_generate(client, payload['prompt'], payload.get('options'), args.label,
+                                         spool_path, timeout=args.timeout, stall_timeout=stall_timeout)
+    except OllamaError as e:
+        print(f"❌ Ollama call failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if status in ('done', 'overrun') and parser.complete:
+        response = parser.text[:parser.closed['content']]
+        cache.put(key, response, client.model, digest, args.label)
+        save_contexts(ctx, response, article=final.get('context'))
+        sys.stdout.write(response)
+        return
+
+    salvaged = parser.salvage()
+    if status in ('done', 'overrun') and not salvaged:
+        sys.stdout.write(parser.text)  # untagged response: let the caller's fallback parsing try
+        return
+    if not salvaged:
+        print(f"❌ Generation ended ({status}) with no usable article; partial output in {spool_path}",
+              file=sys.stderr)
+        sys.exit(1)
+    words = len(re.sub(r'<[^>]+>', ' ', salvaged[parser.opened['content']:]).split())
+    print(f"⚠️ Generation ended early ({status}); keeping the partial article ({words} words)", file=sys.stderr)
+    save_contexts(ctx, salvaged, article=final.get('context'))
+    sys.stdout.write(salvaged)
+
+
+if __name__ == "__main__":
+    main()
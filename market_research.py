@@ -4,25 +4,11 @@ Market Research using Perplexity API
 Gathers real-time data and insights for blog content
 """
 
-import json
-import os
 import sys
 import requests
 from datetime import datetime
 
-def load_config():
-    """Load configuration from config.sh"""
-    config = {}
-    config_path = os.path.join(os.path.dirname(__file__), 'config.sh')
-
-    with open(config_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key] = value.strip('"').strip("'")
-
-    return config
+from pipeline_context import RunContext
 
 def research_topic(topic, primary_keyword, api_key):
     """Use Perplexity API to research the topic"""
@@ -90,26 +76,21 @@ Provide factual, data-driven insights that can be used in a professional blog po
             "research": ""
         }
 
-def main():
-    # Load config
-    config = load_config()
-    api_key = config.get('PERPLEXITY_API_KEY', '')
+def run(ctx):
+    api_key = ctx.config.get('PERPLEXITY_API_KEY', '')
 
     if not api_key:
         print("❌ Perplexity API key not configured")
         sys.exit(1)
 
     # Load today's topic
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    topic_file = os.path.join(script_dir, 'output', 'today_topic.json')
+    topic_file = ctx.topic_file
+    topic_data = dict(ctx.topic)
 
-    if not os.path.exists(topic_file):
+    if not topic_data:
         print("❌ No topic file found. Run trend_topics.sh first.")
         sys.exit(1)
 
-    with open(topic_file, 'r') as f:
-        topic_data = json.load(f)
-
     topic = topic_data.get('topic', '')
     primary_keyword = topic_data.get('primary_keyword', '')
 
@@ -134,8 +115,7 @@ def main():
         topic_data['perplexity_research'] = result['research']
         topic_data['research_date'] = datetime.now().isoformat()
 
-        with open(topic_file, 'w') as f:
-            json.dump(topic_data, f, indent=4, ensure_ascii=False)
+        ctx.write_json(topic_file, topic_data)
 
         print("")
         print(f"✅ Research saved to: {topic_file}")
@@ -145,8 +125,10 @@ def main():
         # Continue without research - blog will still generate
         topic_data['perplexity_research'] = ""
 
-        with open(topic_file, 'w') as f:
-            json.dump(topic_data, f, indent=4, ensure_ascii=False)
+        ctx.write_json(topic_file, topic_data)
+
+def main():
+    run(RunContext.load())
 
 if __name__ == "__main__":
     main()
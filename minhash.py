@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+MinHash + LSH helpers for LeadHorizon Blog Automation
+Signatures estimate Jaccard similarity of two sets from num_perm integers; LSH banding
+turns "which stored sets are similar to this one" into a few dict lookups. Used by the
+keyword cannibalization index and the near-duplicate check.
+"""
+
+import hashlib
+import random
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _hash(item):
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=4).digest(), 'big')
+
+
+def jaccard(a, b):
+    a, b = set(a), set(b)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class MinHasher:
+    """num_perm universal hash functions; the same seed always gives the same signatures"""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, items):
+        hashes = {_hash(item) for item in items}
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in self.params]
+
+
+class LSHIndex:
+    """Band buckets over signatures: keys whose signatures agree on a whole band are candidates"""
+
+    def __init__(self, bands, rows, buckets=None):
+        self.bands = bands
+        self.rows = rows
+        self.buckets = {bucket: set(keys) for bucket, keys in (buckets or {}).items()}
+
+    def _keys(self, signature):
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            yield f"{band}:" + ','.join(str(value) for value in rows)
+
+    def add(self, key, signature):
+        for bucket in self._keys(signature):
+            self.buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key, signature):
+        for bucket in self._keys(signature):
+            keys = self.buckets.get(bucket)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self.buckets[bucket]
+
+    def query(self, signature):
+        """Keys sharing at least one band with signature"""
+        found = set()
+        for bucket in self._keys(signature):
+            found |= self.buckets.get(bucket, set())
+        return found
+
+    def to_json(self):
+        """Buckets in a JSON-friendly form (string keys only); LSHIndex(bands, rows, buckets) reloads them"""
+        return {bucket: sorted(keys) for bucket, keys in self.buckets.items()}
+
+    def threshold(self):
+        """Similarity at which a pair becomes a candidate with probability ~1/2"""
+        return (1.0 / self.bands) ** (1.0 / self.rows)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Ollama Client for LeadHorizon Blog Automation
+One HTTP client and one model ($OLLAMA_MODEL) for every LLM call in the pipeline:
+- polls the server until it answers instead of sleeping a fixed time
+- preloads the model and keeps it resident (keep_alive) for the whole run, so the
+  market analysis and the article never swap models in and out of RAM
+- records each call's load / prompt / generation time in output/llm_metrics.jsonl,
+  with load_duration on its own so cold loads are visible
+
+CLI:
+  ollama_client.py serve                       start the server if needed, wait, preload
+  ollama_client.py generate --label NAME [--payload FILE | prompt on stdin] [--no-cache]
+                                               print the response text (cached by llm_cache.py)
+  ollama_client.py stats                       today's call metrics
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from llm_cache import LLMCache, cache_key
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_HOST = "http://localhost:11434"
+DEFAULT_MODEL = "llama3.1:8b"
+DEFAULT_KEEP_ALIVE = "30m"
+
+# A load longer than this counts as a cold start in the metrics
+COLD_LOAD_SECONDS = 1.0
+
+
+class OllamaError(Exception):
+    """Server unreachable or returned an error"""
+
+
+class OllamaStall(OllamaError):
+    """A streamed response stopped producing tokens"""
+
+
+def _seconds(ns):
+    return (ns or 0) / 1e9
+
+
+class OllamaClient:
+    """Thin JSON-over-HTTP client for the local Ollama server"""
+
+    def __init__(self, host=DEFAULT_HOST, model=DEFAULT_MODEL, keep_alive=DEFAULT_KEEP_ALIVE, metrics_path=None):
+        self.host = host.rstrip('/')
+        self.model = model
+        self.keep_alive = keep_alive
+        self.metrics_path = metrics_path
+        self._digest = None
+
+    @classmethod
+    def from_context(cls, ctx):
+        config = ctx.config
+        return cls(
+            host=config.get('OLLAMA_HOST', '') or DEFAULT_HOST,
+            model=config.get('OLLAMA_MODEL', '') or DEFAULT_MODEL,
+            keep_alive=config.get('OLLAMA_KEEP_ALIVE', '') or DEFAULT_KEEP_ALIVE,
+            metrics_path=os.path.join(ctx.output_dir, 'llm_metrics.jsonl'),
+        )
+
+    def _request(self, path, payload=None, timeout=10):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.host + path, data=data,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read().decode('utf-8') or '{}')
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode('utf-8', 'replace')[:200]
+            raise OllamaError(f"{path}: HTTP {e.code} {detail}")
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise OllamaError(f"{path}: {e}")
+
+    def is_ready(self):
+        try:
+            self._request('/api/tags', timeout=2)
+            return True
+        except OllamaError:
+            return False
+
+    def wait_ready(self, timeout=60):
+        """Poll with a short backoff until the server answers; False on timeout"""
+        deadline = time.time() + timeout
+        delay = 0.25
+        while True:
+            if self.is_ready():
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(min(delay, max(0.0, deadline - time.time())))
+            delay = min(delay * 2, 2.0)
+
+    def loaded_models(self):
+        """Models currently resident in memory"""
+        try:
+            return [m.get('name', '') for m in self._request('/api/ps').get('models', [])]
+        except OllamaError:
+            return []
+
+    def model_digest(self):
+        """Digest of the model's current weights (None if the server is unreachable)"""
+        if self._digest is None:
+            try:
+                models = self._request('/api/tags').get('models', [])
+            except OllamaError:
+                return None
+            self._digest = next((m.get('digest') for m in models
+                                 if self.model in (m.get('name'), m.get('model'))), None)
+        return self._digest
+
+    def preload(self, timeout=300):
+        """Load the model (an empty prompt only loads it) and pin it for keep_alive"""
+        result = self._request('/api/generate', {"model": self.model, "prompt": "", "keep_alive": self.keep_alive},
+                               timeout=timeout)
+        self.record_metrics('preload', result)
+        return _seconds(result.get('load_duration'))
+
+    def generate(self, prompt, options=None, label='generate', timeout=300, **extra):
+        """Non-streaming completion; returns the full response JSON"""
+        payload = {"model": self.model, "prompt": prompt, "stream": False, "keep_alive": self.keep_alive}
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+        result = self._request('/api/generate', payload, timeout=timeout)
+        self.record_metrics(label, result)
+        return result
+
+    def stream(self, prompt, options=None, stall_timeout=60, **extra):
+        """Yield Ollama's NDJSON chunks as they arrive. Raises OllamaStall when no chunk
+        arrives for stall_timeout seconds; closing the generator drops the connection,
+        which makes the server stop generating"""
+        payload = {"model": self.model, "prompt": prompt, "stream": True, "keep_alive": self.keep_alive}
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+        request = urllib.request.Request(self.host + '/api/generate', data=json.dumps(payload).encode('utf-8'),
+                                         headers={"Content-Type": "application/json"})
+        try:
+            response = urllib.request.urlopen(request, timeout=stall_timeout)
+        except urllib.error.HTTPError as e:
+            raise OllamaError(f"/api/generate: HTTP {e.code} {e.read().decode('utf-8', 'replace')[:200]}")
+        except (urllib.error.URLError, OSError) as e:
+            raise OllamaError(f"/api/generate: {e}")
+        with response:
+            while True:
+                try:
+                    line = response.readline()
+                except TimeoutError:
+                    raise OllamaStall(f"no output for {stall_timeout}s")
+                except OSError as e:
+                    raise OllamaError(f"/api/generate: {e}")
+                if not line:
+                    return
+                try:
+                    chunk = json.loads(line)
+                except ValueError:
+                    continue
+                if chunk.get('error'):
+                    raise OllamaError(f"/api/generate: {chunk['error']}")
+                yield chunk
+                if chunk.get('done'):
+                    return
+
+    def record_metrics(self, label, result, status=None):
+        """Append the call's timings to the metrics file and print them"""
+        entry = {
+            "time": datetime.now().isoformat(timespec='seconds'),
+            "label": label,
+            "model": self.model,
+            "load_s": round(_seconds(result.get('load_duration')), 3),
+            "prompt_tokens": result.get('prompt_eval_count', 0),
+            "prompt_s": round(_seconds(result.get('prompt_eval_duration')), 3),
+            "tokens": result.get('eval_count', 0),
+            "eval_s": round(_seconds(result.get('eval_duration')), 3),
+            "total_s": round(_seconds(result.get('total_duration')), 3),
+        }
+        entry["cold"] = entry["load_s"] >= COLD_LOAD_SECONDS
+        if status:
+            entry["status"] = status
+        rate = entry["tokens"] / entry["eval_s"] if entry["eval_s"] else 0.0
+        print(f"⏱️ [{label}] load {entry['load_s']:.1f}s{' (cold)' if entry['cold'] else ''}, "
+              f"prompt {entry['prompt_tokens']} tok/{entry['prompt_s']:.1f}s, "
+              f"output {entry['tokens']} tok/{entry['eval_s']:.1f}s ({rate:.1f} tok/s)", file=sys.stderr)
+        if self.metrics_path:
+            os.makedirs(os.path.dirname(self.metrics_path), exist_ok=True)
+            with open(self.metrics_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+
+def load_metrics(ctx, day=None):
+    """Metric entries recorded on a given day (default today)"""
+    day = day or datetime.now().strftime('%Y-%m-%d')
+    entries = []
+    try:
+        with open(os.path.join(ctx.output_dir, 'llm_metrics.jsonl'), 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('time', '').startswith(day):
+                    entries.append(entry)
+    except OSError:
+        pass
+    return entries
+
+
+def summary(ctx, day=None):
+    """One-line LLM summary for the run report (None if no calls)"""
+    entries = [e for e in load_metrics(ctx, day) if e.get('label') != 'preload' or e.get('cold')]
+    if not entries:
+        return None
+    load = sum(e['load_s'] for e in entries)
+    cold = sum(1 for e in entries if e.get('cold'))
+    tokens = sum(e['tokens'] for e in entries)
+    eval_s = sum(e['eval_s'] for e in entries)
+    rate = tokens / eval_s if eval_s else 0.0
+    return (f"{len(entries)} calls, model load {load:.1f}s ({cold} cold), "
+            f"{tokens} tokens in {eval_s:.1f}s ({rate:.1f} tok/s)")
+
+
+def serve(client, parallel=None):
+    """Make sure the server is up and the model resident; returns an exit code.
+    A server started here gets `parallel` request slots (OLLAMA_NUM_PARALLEL)"""
+    if not client.is_ready():
+        print("⚠️ Ollama not running. Starting Ollama...")
+        env = dict(os.environ)
+        if parallel:
+            env['OLLAMA_NUM_PARALLEL'] = str(parallel)
+        try:
+            subprocess.Popen(['ollama', 'serve'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             env=env, start_new_session=True)
+        except OSError as e:
+            print(f"❌ Could not start Ollama: {e}")
+            return 1
+        started = time.time()
+        if not client.wait_ready(timeout=60):
+            print("❌ Ollama did not become ready within 60s")
+            return 1
+        print(f"✅ Ollama ready after {time.time() - started:.1f}s")
+
+    if any(name == client.model for name in client.loaded_models()):
+        print(f"✅ {client.model} already resident (keep_alive {client.keep_alive})")
+        return 0
+    try:
+        load = client.preload()
+    except OllamaError as e:
+        print(f"❌ Could not load {client.model}: {e}")
+        return 1
+    print(f"✅ {client.model} loaded in {load:.1f}s (keep_alive {client.keep_alive})")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared Ollama client for the pipeline")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('serve', help="Start the server if needed, wait until ready, preload the model")
+    gen = sub.add_parser('generate', help="Run one completion and print the response text")
+    gen.add_argument('--label', default='generate', help="Name of the call in the metrics")
+    gen.add_argument('--payload', help="JSON file with 'prompt' and optional 'options' (else prompt on stdin)")
+    gen.add_argument('--num-predict', type=int, help="Maximum tokens to generate")
+    gen.add_argument('--temperature', type=float)
+    gen.add_argument('--timeout', type=int, default=300)
+    gen.add_argument('--no-cache', action='store_true', help="Always call the model (skip the response cache)")
+    sub.add_parser('stats', help="Show today's LLM call metrics")
+    args = parser.parse_args()
+
+    ctx = RunContext.load()
+    client = OllamaClient.from_context(ctx)
+
+    if args.command == 'serve':
+        sys.exit(serve(client, ctx.config.get('OLLAMA_NUM_PARALLEL', '')))
+
+    if args.command == 'stats':
+        for e in load_metrics(ctx):
+            print(f"{e['time']}  {e['label']:<16} load {e['load_s']:6.1f}s{'*' if e.get('cold') else ' '} "
+                  f"out {e['tokens']:5} tok / {e['eval_s']:6.1f}s")
+        print(f"🧠 {summary(ctx) or 'No LLM calls today'}")
+        sys.exit(0)
+
+    if args.payload:
+        with open(args.payload, 'r') as f:
+            payload = json.load(f)
+    else:
+        payload = {"prompt": sys.stdin.read()}
+    options = dict(payload.get('options') or {})
+    if args.num_predict is not None:
+        options['num_predict'] = args.num_predict
+    if args.temperature is not None:
+        options['temperature'] = args.temperature
+
+    cache = LLMCache.from_context(ctx)
+    cache.enabled = cache.enabled and not args.no_cache
+    key = cache_key(client.model, payload['prompt'], options)
+    digest = client.model_digest() if cache.enabled else None
+    cached = cache.get(key, digest)
+    if cached is not None:
+        print(f"💾 [{args.label}] cached response ({len(cached)} chars)", file=sys.stderr)
+        sys.stdout.write(cached)
+        return
+
+    try:
+        result = client.generate(payload['prompt'], options, label=args.label, timeout=args.timeout)
+    except OllamaError as e:
+        print(f"❌ Ollama call failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    cache.put(key, result.get('response', ''), client.model, digest, args.label)
+    sys.stdout.write(result.get('response', ''))
+
+
+if __name__ == "__main__":
+    main()
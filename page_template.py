@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Post Page Template for LeadHorizon Blog Automation
+Renders blog posts from templates/post.html. The template is compiled once into a
+Python function (a single ''.join over its literal chunks and fields), so a page
+renders in well under a millisecond and the whole archive re-renders in seconds.
+Placeholders: {{name}} is HTML-escaped, {{name|raw}} inserted as is and
+{{name|json}} written as a JSON string (for the JSON-LD block). Every rendered page
+then goes through html_postprocess.py (heading ids, static TOC, minified whitespace).
+
+The CSS and JS shared by every post live in assets/ and are published as
+assets/post.<hash>.css / .js: the name changes with the content, so browsers can
+cache them for a year (assets/.htaccess) and a post only links to them.
+
+CLI:
+  page_template.py render OUT            render the new post (fields exported by generate_blog.sh,
+                                         article HTML on stdin)
+  page_template.py assets                build the hashed assets; prints "site-path local-path" lines
+  page_template.py rerender [--publish]  re-render every generated post in the site mirror
+                                         (--publish sends the changed ones as one deploy bundle)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from html import escape, unescape
+
+from html_postprocess import process
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(SCRIPT_DIR, 'templates')
+ASSETS_DIR = os.path.join(SCRIPT_DIR, 'assets')
+SITE_URL = "https://leadhorizon.co.in"
+
+# Shared by every post, published under content-hashed names
+SHARED_ASSETS = ('post.css', 'post.js')
+# Cache headers for assets/ on the server (Apache), published as is
+ASSETS_HTACCESS = '.htaccess'
+
+# Cache-busting version of the site's own style.css / script.js until the mirror has
+# seen them (then the version is their content hash)
+FALLBACK_VERSIONS = {'style.css': '11', 'script.js': '3'}
+
+_PLACEHOLDER = re.compile(r'\{\{\s*(\w+)(?:\|(raw|json))?\s*\}\}')
+
+
+def escape_text(value):
+    """HTML-escape a raw text field (article HTML is inserted with |raw instead)"""
+    return escape(str(value), quote=True)
+
+
+def json_string(value):
+    """A field as a JSON string literal that is safe inside <script>"""
+    return json.dumps(str(value), ensure_ascii=False).replace('</', '<\\/')
+
+
+class Template:
+    """A template compiled to one render function; fields are passed as a dict"""
+
+    def __init__(self, text, name='<template>'):
+        literals, parts, self.fields = [], [], set()
+        pos = 0
+        for match in _PLACEHOLDER.finditer(text):
+            literals.append(text[pos:match.start()])
+            parts.append(f"_lit[{len(literals) - 1}]")
+            parts.append(f"_{match.group(2) or 'escape'}(f[{match.group(1)!r}])")
+            self.fields.add(match.group(1))
+            pos = match.end()
+        literals.append(text[pos:])
+        parts.append(f"_lit[{len(literals) - 1}]")
+        source = f"def render(f):\n    return ''.join(({', '.join(parts)},))\n"
+        namespace = {'_lit': tuple(literals), '_escape': escape_text, '_raw': str, '_json': json_string}
+        exec(compile(source, name, 'exec'), namespace)
+        self._render = namespace['render']
+
+    @classmethod
+    def load(cls, name='post.html'):
+        with open(os.path.join(TEMPLATES_DIR, name), 'r', encoding='utf-8') as f:
+            return cls(f.read(), name)
+
+    def render(self, fields):
+        missing = self.fields - set(fields)
+        if missing:
+            raise ValueError(f"template fields missing: {', '.join(sorted(missing))}")
+        return self._render(fields)
+
+
+# --- shared assets -----------------------------------------------------------
+
+def minify_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    return re.sub(r'\s*([{};,])\s*', r'\1', text).strip() + '\n'
+
+
+# The JS is published as written: stripping comments or indentation line by line
+# could change a string or template literal, and the script is small
+MINIFIERS = {'.css': minify_css, '.js': str}
+
+
+def build_assets(output_dir):
+    """{asset name: site path} of the shared assets, written to output/assets/ as
+    <stem>.<sha256[:10]><ext>; older builds are removed locally (the server keeps
+    them for pages rendered before)"""
+    target_dir = os.path.join(output_dir, 'assets')
+    os.makedirs(target_dir, exist_ok=True)
+    built = {}
+    for name in SHARED_ASSETS:
+        stem, ext = os.path.splitext(name)
+        with open(os.path.join(ASSETS_DIR, name), 'r', encoding='utf-8') as f:
+            data = MINIFIERS[ext](f.read()).encode('utf-8')
+        hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+        path = os.path.join(target_dir, hashed)
+        if not os.path.exists(path):
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        for old in os.listdir(target_dir):
+            if old != hashed and re.fullmatch(re.escape(stem) + r'\.[0-9a-f]{10}' + re.escape(ext), old):
+                os.remove(os.path.join(target_dir, old))
+        built[name] = f'assets/{hashed}'
+    return built
+
+
+def asset_files(output_dir):
+    """[(site path, local path)] to publish before any page that links the assets"""
+    files = [(rel_path, os.path.join(output_dir, rel_path)) for rel_path in build_assets(output_dir).values()]
+    files.append((f'assets/{ASSETS_HTACCESS}', os.path.join(ASSETS_DIR, ASSETS_HTACCESS)))
+    return files
+
+
+def site_version(ctx, rel_path):
+    """Cache-busting query value for a site-wide file: its live content hash"""
+    entry = ctx.mirror.files.get(rel_path) or {}
+    return entry['sha256'][:8] if entry.get('sha256') else FALLBACK_VERSIONS[rel_path]
+
+
+# --- rendering ---------------------------------------------------------------
+
+def tags_html(category, tags):
+    html = f'<span class="blog-tag blog-tag-primary">{escape_text(category)}</span>'
+    return html + ''.join(f'<span class="blog-tag">{escape_text(tag)}</span>' for tag in tags if tag)
+
+
+def render_post(ctx, post, assets=None, template=None):
+    """Post-processed page HTML for a post dict: title, meta, keywords, category, tags, slug, filename,
+    date, date_display, read_time, alt, year, content (+ optional modified, appended)"""
+    template = template or Template.load()
+    assets = assets or build_assets(ctx.output_dir)
+    site_url = (ctx.config.get('SITE_URL', '') or SITE_URL).rstrip('/')
+    fields = dict(post)
+    fields.update({
+        "url": f"{site_url}/blog/{post['filename']}",
+        "image_url": f"{site_url}/images/{post['slug']}.jpg",
+        "logo_url": f"{site_url}/logo.png",
+        "modified": post.get('modified') or post['date'],
+        "tags": tags_html(post['category'], post['tags']),
+        "appended": post.get('appended', ''),
+        "style_version": site_version(ctx, 'style.css'),
+        "script_version": site_version(ctx, 'script.js'),
+        "post_css": assets['post.css'],
+        "post_js": assets['post.js'],
+    })
+    return process(template.render(fields))
+
+
+def post_from_env(content):
+    """The post generate_blog.sh just wrote, from its exported variables"""
+    env = os.environ.get
+    primary, secondary = env('PRIMARY_KEYWORD', ''), env('SECONDARY_KEYWORDS', '')
+    return {
+        "title": env('SEO_TITLE', ''),
+        "meta": env('META_DESC', ''),
+        "keywords": f"{primary}, {secondary}",
+        "category": env('CATEGORY', ''),
+        "tags": [tag.strip() for tag in secondary.split(',')],
+        "slug": env('SLUG', ''),
+        "filename": env('FILENAME', ''),
+        "date": env('TODAY', ''),
+        "date_display": env('TODAY_DISPLAY', ''),
+        "read_time": env('READ_TIME', '1'),
+        "alt": env('ALT_TAG', ''),
+        "year": env('YEAR', ''),
+        "content": content.strip(),
+    }
+
+
+# --- archive re-render -------------------------------------------------------
+
+_FIELD_PATTERNS = {
+    "title": r'<h1>(.*?)</h1>',
+    # up to the next tag: the old heredoc did not escape quotes
+    "meta": r'<meta name="description" content="(.*?)">\s*<',
+    "keywords": r'<meta name="keywords" content="(.*?)">\s*<',
+    "category": r'<span class="badge">(.*?)</span>',
+    "date": r'<meta property="article:published_time" content="(\d{4}-\d{2}-\d{2})',
+    "modified": r'"dateModified":\s*"([^"]*)"',
+    "date_display": r'<i class="fas fa-calendar"></i>\s*(.*?)</span>',
+    "read_time": r'<i class="fas fa-clock"></i>\s*(\d+) min read',
+    "alt": r'<div class="featured-image">\s*<img [^\n]*?alt="(.*?)" loading="lazy">',
+    "year": r'&copy; (\d{4}) LeadHorizon',
+}
+_CONTENT = re.compile(r'<!-- article:start -->\s*(.*?)\s*<!-- article:end -->', re.S)
+_APPENDED = re.compile(r'<!-- post:end -->\s*(.*)</body>', re.S)
+# Pages written by the bash heredoc before this template existed
+_LEGACY_CONTENT = re.compile(r'<ol id="tocList"></ol>\s*</div>\s*(.*?)\s*<!-- Social Share Bar \(bottom\) -->', re.S)
+_LEGACY_APPENDED = re.compile(r'<!-- TOC Generator \+ Reading Progress -->\s*<script>.*?</script>\n?(.*)</body>', re.S)
+_LEGACY_CARD_STYLE = re.compile(r'[ \t]*<style>\s*\.related-card\b.*?</style>\n?', re.S)
+_TAGS = re.compile(r'<div class="blog-tags">(.*?)</div>', re.S)
+
+
+def parse_page(page, rel_path):
+    """The post dict of a page rendered from this template (or the old heredoc);
+    None for hand-written pages"""
+    if 'class="blog-article-hero"' not in page:
+        return None
+    content = _CONTENT.search(page)
+    appended = _APPENDED.search(page)
+    if not content:
+        content = _LEGACY_CONTENT.search(page)
+        appended = _LEGACY_APPENDED.search(page)
+    if not content:
+        return None
+
+    # Text fields back to raw text: render_post escapes them again
+    post = {}
+    for name, pattern in _FIELD_PATTERNS.items():
+        match = re.search(pattern, page, re.S)
+        post[name] = unescape(match.group(1).strip()) if match else ''
+    if not post['title'] or not post['date']:
+        return None
+    tags = _TAGS.search(page)
+    post['tags'] = [unescape(tag) for tag in re.findall(r'<span class="blog-tag">(.*?)</span>', tags.group(1))] if tags else []
+    post['filename'] = os.path.basename(rel_path)
+    image = re.search(r'<meta property="og:image" content="[^"]*/images/([^"/]+)\.jpg"', page)
+    post['slug'] = image.group(1) if image else os.path.splitext(post['filename'])[0]
+    post['year'] = post['year'] or post['date'][:4]
+    post['read_time'] = post['read_time'] or '1'
+    post['content'] = content.group(1)
+    post['appended'] = _LEGACY_CARD_STYLE.sub('', appended.group(1)) if appended else ''
+    return post
+
+
+def rerender(ctx, publish=False):
+    mirror = ctx.mirror
+    posts = [rel for rel in mirror.list('blog') if rel.endswith('.html') and rel.count('/') == 1]
+    if not posts:
+        print("❌ No posts in the site mirror; run site_mirror.py first")
+        sys.exit(1)
+    if not mirror.is_current():
+        print(f"⚠️ Mirror last synced {mirror.data.get('synced_at') or 'never'}; pages changed since are not seen")
+
+    template = Template.load()
+    assets = build_assets(ctx.output_dir)
+    out_dir = os.path.join(ctx.output_dir, 'rerender')
+    changed, skipped, unchanged = [], [], 0
+    bytes_before = bytes_after = 0
+    started = time.time()
+    for rel_path in posts:
+        page = mirror.read_text(rel_path)
+        post = parse_page(page, rel_path)
+        if not post:
+            skipped.append(rel_path)
+            continue
+        html = render_post(ctx, post, assets, template)
+        bytes_before += len(page.encode('utf-8'))
+        bytes_after += len(html.encode('utf-8'))
+        if html == page:
+            unchanged += 1
+            continue
+        target = os.path.join(out_dir, rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(html)
+        changed.append(rel_path)
+    elapsed = time.time() - started
+
+    rendered = len(changed) + unchanged
+    print(f"🧩 Re-rendered {rendered} posts in {elapsed:.2f}s "
+          f"({elapsed * 1000 / max(rendered, 1):.1f} ms each, parse + render + write)")
+    print(f"   {len(changed)} changed, {unchanged} unchanged, {len(skipped)} hand-written pages skipped")
+    if rendered:
+        print(f"   {bytes_before / 1024:.0f} KB → {bytes_after / 1024:.0f} KB of post HTML")
+    if not changed or not publish:
+        if changed:
+            print(f"📁 Changed pages written to {out_dir} (add --publish to deploy them)")
+        return
+
+    import bundle_deploy
+    if ctx.bundle.pending:
+        print("❌ A deploy bundle from an earlier run is still pending; finish it first (run_daily.sh --resume)")
+        sys.exit(1)
+    ctx.defer_publish = True
+    for rel_path, local_path in asset_files(ctx.output_dir):
+        ctx.publish(rel_path, local_path)
+    for rel_path in changed:
+        ctx.publish(rel_path, os.path.join(out_dir, rel_path), base=mirror.files[rel_path]['sha256'])
+    result = bundle_deploy.apply_bundle(ctx)
+    if not result.get("ok"):
+        print(f"❌ Re-render not deployed, live site unchanged: {result.get('error')}")
+        sys.exit(1)
+    print(f"✅ Applied {result['files']} files atomically (undo with: python3 bundle_deploy.py --rollback)")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    ctx = RunContext.load()
+
+    if command == 'render' and len(sys.argv) == 3:
+        post = post_from_env(sys.stdin.read())
+        html = render_post(ctx, post)
+        tmp_path = sys.argv[2] + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, sys.argv[2])
+        print(f"🧩 Page rendered ({len(html.encode('utf-8')) / 1024:.1f} KB, shared CSS/JS in assets/)")
+    elif command == 'assets':
+        for rel_path, local_path in asset_files(ctx.output_dir):
+            print(f"{rel_path} {local_path}")
+    elif command == 'rerender':
+        try:
+            rerender(ctx, publish='--publish' in sys.argv[2:])
+        finally:
+            ctx.close()
+    else:
+        print(__doc__.strip().split('CLI:')[1])
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,6 @@ Ping Services - Notify blog directories and search engines about new content
 Pings Pingomatic, Google, Bing, and other blog aggregators
 """
 
-import json
 import os
 import sys
 import urllib.request
@@ -12,6 +11,8 @@ import urllib.parse
 from datetime import datetime
 import xml.etree.ElementTree as ET
 
+from pipeline_context import RunContext
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SITE_URL = "https://leadhorizon.co.in"
 SITE_NAME = "LeadHorizon"
@@ -71,19 +72,16 @@ def ping_http(service_name, url):
         print(f"  ⚠️ {service_name}: {str(e)[:60]}")
         return False
 
-def main():
+def run(ctx):
     print("🔔 Blog Ping Services")
     print("=" * 50)
 
     # Load blog data
-    blog_file = os.path.join(SCRIPT_DIR, 'output', 'latest_blog.json')
-    if not os.path.exists(blog_file):
+    blog_data = ctx.blog
+    if not blog_data:
         print("❌ No blog metadata found.")
         sys.exit(1)
 
-    with open(blog_file, 'r') as f:
-        blog_data = json.load(f)
-
     blog_url = blog_data.get('url', '')
     blog_title = blog_data.get('title', 'New Post')
     print(f"📄 Blog: {blog_title}")
@@ -136,5 +134,8 @@ def main():
 
     print("✅ Ping services complete!")
 
+def main():
+    run(RunContext.load())
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner for LeadHorizon Blog Automation
+Runs the daily steps as a dependency graph: independent steps run concurrently,
+a failed step only stops the steps that depend on it.
+Python stages are imported once and called in-process with a shared RunContext;
+only the shell stages are started as subprocesses.
+Every run is checkpointed in output/runs/<date>.json; --resume skips steps whose
+inputs are unchanged and whose outputs are still valid.
+"""
+
+import argparse
+import glob
+import importlib
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from ollama_client import summary as llm_summary
+from pipeline_context import RunContext
+from run_manifest import RunManifest
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKERS = 4
+
+# Step states
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+_print_lock = threading.Lock()
+
+
+class Step:
+    """A single pipeline step and the steps it depends on"""
+
+    def __init__(self, name, label, command=None, deps=(), optional=False, module=None,
+                 config_keys=(), params=None, outputs=None, remote=False):
+        self.name = name
+        self.label = label
+        # Either a subprocess command or a module whose run(ctx) is called in-process
+        self.command = command
+        self.module = module
+        self.deps = list(deps)
+        # Optional steps may fail without blocking their dependents
+        self.optional = optional
+        # Checkpoint inputs (config values, extra params) and the files the step writes
+        self.config_keys = list(config_keys)
+        self.params = params
+        self.outputs = outputs
+        # Shell steps that talk to the server get the shared SSH master connection
+        self.remote = remote
+        self.status = PENDING
+        self.returncode = None
+        self.started = None
+        self.duration = 0.0
+        self.reason = ""
+        self.fingerprint = None
+        self.resumed = False
+
+    def sources(self):
+        """Script files whose contents are part of this step's inputs"""
+        if self.module:
+            return [os.path.join(SCRIPT_DIR, self.module + '.py')]
+        return [os.path.join(SCRIPT_DIR, arg) for arg in self.command or []
+                if arg.endswith(('.sh', '.py')) and os.path.exists(os.path.join(SCRIPT_DIR, arg))]
+
+
+def _topic_output(ctx):
+    return [ctx.topic_file]
+
+
+def _post_outputs(ctx):
+    """Generated post files named in latest_blog.json"""
+    blog = ctx.blog
+    paths = [ctx.blog_file]
+    if blog.get('filename'):
+        paths.append(os.path.join(ctx.output_dir, blog['filename']))
+    if blog.get('slug'):
+        paths.append(os.path.join(ctx.output_dir, f"{blog['slug']}.jpg"))
+    return paths
+
+
+def _post_html(ctx):
+    return [p for p in _post_outputs(ctx) if p.endswith('.html')]
+
+
+def _post_image(ctx):
+    return [p for p in _post_outputs(ctx) if p.endswith('.jpg')]
+
+
+def _today(ctx):
+    return {"date": datetime.now().strftime('%Y-%m-%d')}
+
+
+def build_steps(deploy_mode='direct'):
+    """Declare the daily pipeline: trend → research → generate → dedup → image/keywords/links (after mirror sync) → deploy → fan-out
+
+    In bundle mode the RSS feed is built before the deploy so it ships in the same bundle.
+    """
+    bundle = deploy_mode == 'bundle'
+    if bundle:
+        deploy = Step("deploy", "Server deployment (bundle)", module="bundle_deploy",
+                      deps=["image", "dedup", "links", "rss"], config_keys=["SSH_HOST", "REMOTE_PATH"])
+    else:
+        deploy = Step("deploy", "Server deployment", ["bash", "deploy.sh"], deps=["image", "dedup", "links"],
+                      config_keys=["SSH_HOST", "REMOTE_PATH"], remote=True)
+    return [
+        Step("trend", "Market trend analysis", ["bash", "trend_topics.sh"], optional=True,
+             params=_today, outputs=_topic_output),
+        Step("research", "Perplexity market research", module="market_research",
+             deps=["trend"], optional=True, config_keys=["PERPLEXITY_API_KEY"], outputs=_topic_output),
+        Step("generate", "Ollama blog generation", ["bash", "generate_blog.sh"], deps=["research"],
+             config_keys=["OLLAMA_MODEL", "GENERATION_MODE", "SITE_URL"], outputs=_post_outputs),
+        Step("mirror", "Site mirror sync", module="site_mirror", optional=True,
+             config_keys=["SSH_HOST", "REMOTE_PATH"], params=_today),
+        Step("dedup", "Near-duplicate check", module="dedup_check", deps=["generate", "mirror"],
+             config_keys=["DEDUP_THRESHOLD", "DEDUP_ACTION"], outputs=_post_outputs),
+        Step("image", "Social image (1200x630)", module="generate_social_image",
+             deps=["dedup"], optional=True, outputs=_post_image),
+        Step("keywords", "Keyword auto-linking", module="keyword_linker", deps=["dedup", "mirror"],
+             optional=True, config_keys=["AUTOLINK_MAX_LINKS"], outputs=_post_html),
+        Step("links", "Internal linking", module="internal_links", deps=["dedup", "mirror", "keywords"],
+             optional=True, config_keys=["SSH_HOST", "REMOTE_PATH"], outputs=_post_html),
+        deploy,
+        Step("indexing", "Google Indexing API", module="google_indexing", deps=["deploy"], optional=True),
+        Step("indexnow", "IndexNow (Bing/Yandex)", module="indexnow", deps=["deploy"], optional=True),
+        Step("social", "Social media sharing", module="social_share", deps=["deploy"], optional=True),
+        Step("ping", "Blog directory pings", module="ping_services", deps=["deploy"], optional=True),
+        Step("rss", "RSS feed update", module="generate_rss", optional=True,
+             deps=["dedup", "mirror"] if bundle else ["deploy", "mirror"]),
+    ]
+
+
+class _StepOutput(io.TextIOBase):
+    """sys.stdout replacement that prefixes each line with the step running on this thread"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        prefix = getattr(self.local, 'prefix', '')
+        if not prefix:
+            with _print_lock:
+                self.stream.write(text)
+            return len(text)
+        buffered = getattr(self.local, 'buffer', '') + text
+        *lines, self.local.buffer = buffered.split('\n')
+        if lines:
+            with _print_lock:
+                for line in lines:
+                    self.stream.write(prefix + line + '\n')
+                self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def begin(self, prefix):
+        self.local.prefix = prefix
+        self.local.buffer = ''
+
+    def end(self):
+        rest = getattr(self.local, 'buffer', '')
+        prefix = getattr(self.local, 'prefix', '')
+        self.local.prefix = ''
+        self.local.buffer = ''
+        if rest:
+            with _print_lock:
+                self.stream.write(prefix + rest + '\n')
+
+
+def log(message):
+    line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+    stream = sys.stdout.stream if isinstance(sys.stdout, _StepOutput) else sys.stdout
+    with _print_lock:
+        stream.write(line)
+        stream.flush()
+
+
+def validate_steps(steps):
+    """Check that every dependency exists and the graph has no cycles"""
+    by_name = {s.name: s for s in steps}
+    for step in steps:
+        for dep in step.deps:
+            if dep not in by_name:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through step '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for step in steps:
+        visit(step.name)
+    return by_name
+
+
+def _exit_status(code):
+    """Map a SystemExit code the same way the interpreter would"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code)
+    return 1
+
+
+def run_module_step(step, ctx):
+    """Call a stage's run(ctx) in-process, with its output prefixed like a subprocess"""
+    out = sys.stdout
+    if isinstance(out, _StepOutput):
+        out.begin(f"[{step.name}] ")
+    try:
+        module = importlib.import_module(step.module)
+        module.run(ctx)
+        step.returncode = 0
+    except SystemExit as e:
+        step.returncode = _exit_status(e.code)
+    except Exception as e:
+        step.returncode = 1
+        step.reason = f"{type(e).__name__}: {e}"
+        print(f"❌ {step.reason}")
+    finally:
+        if isinstance(out, _StepOutput):
+            out.end()
+
+
+def run_step(step, ctx=None):
+    """Run one step in-process or as a subprocess, streaming its output with a step prefix"""
+    step.started = time.time()
+    if step.module:
+        run_module_step(step, ctx)
+        step.duration = time.time() - step.started
+        return step
+
+    prefix = f"[{step.name}] "
+    if step.remote and ctx is not None:
+        # Starts the shared master and exports LH_SSH_CONTROL_PATH; the script's Python
+        # helpers (SSHTransport) take their control path from it
+        ctx.remote.connect()
+    try:
+        proc = subprocess.Popen(
+            step.command, cwd=SCRIPT_DIR, env=dict(os.environ),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1
+        )
+        stream = sys.stdout.stream if isinstance(sys.stdout, _StepOutput) else sys.stdout
+        for line in proc.stdout:
+            with _print_lock:
+                stream.write(prefix + line)
+                stream.flush()
+        step.returncode = proc.wait()
+    except OSError as e:
+        step.returncode = 127
+        step.reason = str(e)
+    if step.remote and ctx is not None and ctx._mirror is not None:
+        # The script's uploads updated the mirror manifest on disk; drop our stale copy
+        ctx.mirror.reload()
+    step.duration = time.time() - step.started
+    return step
+
+
+def blocked_reason(step, by_name):
+    """Return why a step can never run, or '' if its dependencies allow it"""
+    for dep in step.deps:
+        dep_step = by_name[dep]
+        if dep_step.status == SKIPPED:
+            return f"dependency '{dep}' skipped"
+        if dep_step.status == FAILED and not dep_step.optional:
+            return f"dependency '{dep}' failed"
+    return ""
+
+
+def is_ready(step, by_name):
+    return all(by_name[dep].status in (OK, FAILED) for dep in step.deps)
+
+
+def import_stages(steps):
+    """Import every in-process stage once, before any thread starts"""
+    for step in steps:
+        if step.module:
+            try:
+                importlib.import_module(step.module)
+            except Exception as e:
+                # The step itself will fail with this error when it runs
+                log(f"⚠️ Could not import {step.module}: {e}")
+
+
+def clean_outputs(ctx):
+    """Remove the previous run's generated files before a fresh run"""
+    patterns = ['*.html', '*.jpg', 'today_topic.json']
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(ctx.output_dir, pattern)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    ctx.bundle.clear()
+
+
+def run_pipeline(steps, workers=DEFAULT_WORKERS, ctx=None, manifest=None, resume=False):
+    """Execute steps concurrently in dependency order"""
+    by_name = validate_steps(steps)
+    ctx = ctx or RunContext.load()
+    running = {}
+
+    import_stages(steps)
+    original_stdout = sys.stdout
+    sys.stdout = _StepOutput(original_stdout)
+    try:
+        _schedule(steps, by_name, workers, ctx, running, manifest, resume)
+    finally:
+        sys.stdout = original_stdout
+    return steps
+
+
+def _schedule(steps, by_name, workers, ctx, running, manifest, resume):
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while True:
+            changed = True
+            while changed:
+                changed = False
+                # Propagate failures down their dependent branches
+                for step in steps:
+                    if step.status == PENDING:
+                        reason = blocked_reason(step, by_name)
+                        if reason:
+                            step.status = SKIPPED
+                            step.reason = reason
+                            log(f"⏭️ {step.label}: skipped ({reason})")
+                            changed = True
+
+                for step in steps:
+                    if step.status != PENDING or not is_ready(step, by_name):
+                        continue
+                    if manifest:
+                        step.fingerprint = manifest.fingerprint(step, ctx)
+                    if resume and manifest and manifest.is_fresh(step, step.fingerprint):
+                        step.status = OK
+                        step.resumed = True
+                        log(f"♻️ {step.label}: inputs unchanged, reusing previous result")
+                        changed = True
+                        continue
+                    step.status = RUNNING
+                    log(f"▶️ {step.label} started")
+                    running[pool.submit(run_step, step, ctx)] = step
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                future.result()
+                if step.returncode == 0:
+                    step.status = OK
+                    log(f"✅ {step.label} ({step.duration:.1f}s)")
+                else:
+                    step.status = FAILED
+                    step.reason = step.reason or f"exit code {step.returncode}"
+                    icon = "⚠️" if step.optional else "❌"
+                    log(f"{icon} {step.label} failed ({step.reason}, {step.duration:.1f}s)")
+                if manifest:
+                    manifest.record(step, step.fingerprint, ctx)
+
+
+def exit_code(steps):
+    """0 = every step succeeded, 1 = a required step failed or was skipped, 2 = optional failures only"""
+    if any(s.status in (FAILED, SKIPPED) and not s.optional for s in steps):
+        return 1
+    if any(s.status != OK for s in steps):
+        return 2
+    return 0
+
+
+def format_summary(steps):
+    icons = {OK: "✓", FAILED: "✗", SKIPPED: "-", PENDING: " ", RUNNING: " "}
+    lines = []
+    for step in steps:
+        line = f"[{icons[step.status]}] {step.label}"
+        if step.resumed:
+            line += " (resumed)"
+        elif step.status == OK:
+            line += f" ({step.duration:.1f}s)"
+        elif step.reason:
+            line += f" ({step.status}: {step.reason})"
+        lines.append(line)
+    return lines
+
+
+def write_report(steps, code, wall_time, ctx):
+    """Save the daily report with the real status of every step"""
+    blog_data = ctx.blog
+
+    status = {0: "SUCCESS", 1: "FAILED", 2: "PARTIAL"}[code]
+    report_dir = os.path.join(SCRIPT_DIR, 'reports')
+    os.makedirs(report_dir, exist_ok=True)
+    report_file = os.path.join(report_dir, f"{datetime.now().strftime('%Y-%m-%d')}.txt")
+
+    with open(report_file, 'w') as f:
+        f.write("LeadHorizon Daily Blog Report v2.0\n")
+        f.write("===================================\n")
+        f.write(f"Date: {datetime.now().strftime('%Y-%m-%d')}\n")
+        f.write(f"Time: {datetime.now().strftime('%H:%M:%S')}\n\n")
+        f.write("Blog Details:\n")
+        f.write(f"- Title: {blog_data.get('title', '')}\n")
+        f.write(f"- URL: {blog_data.get('url', '')}\n")
+        f.write(f"- Filename: {blog_data.get('filename', '')}\n\n")
+        f.write("Pipeline Status:\n")
+        for line in format_summary(steps):
+            f.write(line + "\n")
+        f.write(f"\nWall time: {wall_time:.1f}s\n")
+        if ctx.remote_stats:
+            f.write(f"Remote: {ctx.remote_stats.summary()}\n")
+        transfers = ctx.ledger.summary()
+        if transfers:
+            f.write(f"Transfers: {transfers}\n")
+        llm = llm_summary(ctx)
+        if llm:
+            f.write(f"LLM: {llm}\n")
+        f.write(f"Status: {status}\n")
+
+    return report_file
+
+
+def main():
+    ctx = RunContext.load()
+    config = ctx.config
+
+    parser = argparse.ArgumentParser(description="Run the LeadHorizon daily pipeline")
+    parser.add_argument('--workers', type=int,
+                        default=int(config.get('PIPELINE_WORKERS', '') or DEFAULT_WORKERS),
+                        help="Maximum number of steps running at the same time")
+    parser.add_argument('--only', nargs='+', metavar='STEP',
+                        help="Run only these steps (dependencies are assumed done)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the last run, skipping steps whose inputs and outputs are unchanged")
+    args = parser.parse_args()
+
+    steps = build_steps(ctx.deploy_mode)
+    if args.only:
+        names = set(args.only)
+        unknown = names - {s.name for s in steps}
+        if unknown:
+            parser.error(f"unknown step(s): {', '.join(sorted(unknown))}")
+        steps = [s for s in steps if s.name in names]
+        for step in steps:
+            step.deps = [d for d in step.deps if d in names]
+
+    manifest = RunManifest.latest() if args.resume else None
+    if manifest:
+        log(f"♻️ Resuming run {manifest.run_id}")
+    else:
+        if args.resume:
+            log("⚠️ No previous run to resume, starting fresh")
+        clean_outputs(ctx)
+        manifest = RunManifest.new(datetime.now().strftime('%Y-%m-%d'))
+
+    # Bundle mode: stages stage their uploads until the deploy step sends them in one go
+    ctx.defer_publish = ctx.deploy_mode == 'bundle' and any(s.name == 'deploy' for s in steps)
+
+    log(f"🧭 Pipeline: {len(steps)} steps, up to {args.workers} in parallel")
+    started = time.time()
+    try:
+        run_pipeline(steps, workers=args.workers, ctx=ctx, manifest=manifest, resume=args.resume)
+    finally:
+        ctx.close()
+    wall_time = time.time() - started
+
+    code = exit_code(steps)
+    log("📊 Pipeline Status:")
+    for line in format_summary(steps):
+        log(f"   {line}")
+    log(f"⏱️ Wall time: {wall_time:.1f}s")
+    if ctx.remote_stats:
+        log(f"🔌 Remote: {ctx.remote_stats.summary()}")
+    if ctx.ledger.summary():
+        log(f"📦 Transfers: {ctx.ledger.summary()}")
+    if llm_summary(ctx):
+        log(f"🧠 LLM: {llm_summary(ctx)}")
+
+    report_file = write_report(steps, code, wall_time, ctx)
+    log(f"📋 Report saved: {report_file}")
+
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
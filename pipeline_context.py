@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Shared Run Context for LeadHorizon Blog Automation
+Parses config.sh and the output/*.json metadata once so every stage can read them in-process
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_VAR_RE = re.compile(r'\$\{(\w+)\}|\$(\w+)')
+
+
+def load_config(config_path=None):
+    """Load configuration from config.sh, expanding $VAR / ${VAR} references"""
+    config = {}
+    config_path = config_path or os.path.join(SCRIPT_DIR, 'config.sh')
+    if not os.path.exists(config_path):
+        return config
+
+    def expand(match):
+        name = match.group(1) or match.group(2)
+        return config.get(name, os.environ.get(name, ''))
+
+    with open(config_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                quoted_single = value.startswith("'")
+                value = value.strip('"').strip("'")
+                if not quoted_single:
+                    value = _VAR_RE.sub(expand, value)
+                config[key] = value
+    return config
+
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@dataclass
+class RunContext:
+    """State shared by every stage of one pipeline run"""
+
+    script_dir: str = SCRIPT_DIR
+    config: dict = field(default_factory=dict)
+    site_url: str = "https://leadhorizon.co.in"
+    _json_cache: dict = field(default_factory=dict, repr=False)
+    _remote: object = field(default=None, repr=False)
+    _mirror: object = field(default=None, repr=False)
+    _bundle: object = field(default=None, repr=False)
+    _ledger: object = field(default=None, repr=False)
+    _published: dict = field(default_factory=dict, repr=False)
+    # Set by pipeline.py while a bundle deploy is pending: publish() stages instead of uploading
+    defer_publish: bool = False
+    _lock: object = field(default_factory=threading.RLock, repr=False)
+
+    @classmethod
+    def load(cls, script_dir=SCRIPT_DIR):
+        config = load_config(os.path.join(script_dir, 'config.sh'))
+        return cls(
+            script_dir=script_dir,
+            config=config,
+            site_url=config.get('SITE_URL', '') or cls.site_url,
+        )
+
+    @property
+    def output_dir(self):
+        return os.path.join(self.script_dir, 'output')
+
+    @property
+    def blog_file(self):
+        return os.path.join(self.output_dir, 'latest_blog.json')
+
+    @property
+    def topic_file(self):
+        return os.path.join(self.output_dir, 'today_topic.json')
+
+    def read_json(self, path):
+        """Parse a JSON file once per version; re-read only when it changes on disk"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._json_cache.pop(path, None)
+            return {}
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._json_cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        try:
+            data = _read_json(path)
+        except ValueError:
+            data = {}
+        self._json_cache[path] = (key, data)
+        return data
+
+    def write_json(self, path, data):
+        """Write JSON metadata and keep the cache in step with the file"""
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        self._json_cache.pop(path, None)
+
+    @property
+    def blog(self):
+        """Metadata of the generated blog (output/latest_blog.json)"""
+        return self.read_json(self.blog_file)
+
+    @property
+    def topic(self):
+        """Today's topic and research (output/today_topic.json)"""
+        return self.read_json(self.topic_file)
+
+    @property
+    def category(self):
+        return self.topic.get('category') or self.blog.get('category') or "Market Trends"
+
+    @property
+    def remote(self):
+        """Shared remote transport (one multiplexed SSH connection per run)"""
+        with self._lock:
+            if self._remote is None:
+                from remote_transport import create_transport
+                self._remote = create_transport(self.config)
+                self._remote.listeners.append(self.mirror.note_upload)
+            return self._remote
+
+    @property
+    def mirror(self):
+        """Local mirror of the live site (output/mirror), see site_mirror.py"""
+        with self._lock:
+            if self._mirror is None:
+                from site_mirror import SiteMirror
+                self._mirror = SiteMirror(os.path.join(self.output_dir, 'mirror'))
+            return self._mirror
+
+    @property
+    def deploy_mode(self):
+        """DEPLOY_MODE: bundle (one upload, applied atomically on the server) or direct"""
+        return self.config.get('DEPLOY_MODE', '') or 'direct'
+
+    @property
+    def bundle(self):
+        """Deploy bundle being staged for this run (output/bundle), see bundle_deploy.py"""
+        with self._lock:
+            if self._bundle is None:
+                from bundle_deploy import DeployBundle
+                self._bundle = DeployBundle(os.path.join(self.output_dir, 'bundle'))
+            return self._bundle
+
+    def publish(self, rel_path, local_path, base=None):
+        """Send a file to the site; returns "staged", "uploaded" or "unchanged".
+
+        While a bundle deploy is pending the file is staged into the bundle (base is the
+        sha256 of the server copy it was derived from, checked before it is replaced);
+        otherwise it is uploaded straight away. A file whose content matches what the
+        deploy ledger last pushed (and the mirror still shows as live) is skipped.
+        """
+        from run_manifest import file_hash
+        digest = file_hash(local_path)
+        if self._published.get(rel_path) == digest:
+            return "unchanged"
+        size = os.path.getsize(local_path)
+        if self.ledger.matches(rel_path, digest) and self._live_matches(rel_path, digest):
+            self.ledger.record_skipped(rel_path, size)
+            self._published[rel_path] = digest
+            return "unchanged"
+        if self.defer_publish:
+            # Recorded in the ledger once the bundle has been applied
+            self.bundle.add(rel_path, local_path, base=base)
+            status = "staged"
+        else:
+            self.remote.upload(local_path, rel_path)
+            self.ledger.record_sent(rel_path, digest, size)
+            status = "uploaded"
+        self._published[rel_path] = digest
+        return status
+
+    def _live_matches(self, rel_path, digest):
+        """Cross-check the ledger against the mirror, in case the server copy was changed"""
+        if not self.mirror.is_current() or rel_path not in self.mirror.files:
+            return True
+        return self.mirror.files[rel_path]['sha256'] == digest
+
+    @property
+    def ledger(self):
+        """Content hashes of everything last pushed to the server, see deploy_ledger.py"""
+        with self._lock:
+            if self._ledger is None:
+                from deploy_ledger import DeployLedger
+                self._ledger = DeployLedger(os.path.join(self.output_dir, 'deploy_ledger.json'))
+            return self._ledger
+
+    @property
+    def archive(self):
+        """Read-only view of the live site: the mirror if synced today, else the server"""
+        if self.mirror.is_current():
+            from remote_transport import LocalTransport
+            return LocalTransport(self.mirror.root)
+        return self.remote
+
+    @property
+    def remote_stats(self):
+        """Transfer/reuse counters, or None if no stage touched the server"""
+        return self._remote.stats if self._remote is not None else None
+
+    def close(self):
+        """Release run-wide resources such as the SSH master connection"""
+        if self._remote is not None:
+            self._remote.close()
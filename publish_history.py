@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Publish History for LeadHorizon Blog Automation
+Append-only ledger of every published post (output/publish_history.jsonl): date, topic,
+slug, primary keyword, category. Loaded into slug/keyword indexes so topic selection
+can skip candidates that would overwrite a live post or repeat a recent keyword, and
+(via keyword_index.py) re-angle or skip ones competing with a live page, before any
+LLM time is spent.
+
+CLI:
+  publish_history.py pick POOL_FILE...      first usable "topic|keyword|secondary" line,
+                                            pools tried in order (seasonal, evergreen, ...)
+  publish_history.py check SLUG KEYWORD     exit 1 if the post would collide
+  publish_history.py record                 add output/latest_blog.json after a deploy
+  publish_history.py                        show recent entries
+"""
+
+import json
+import os
+import re
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+from keyword_index import update_index as update_keyword_index
+from pipeline_context import RunContext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# A primary keyword is not targeted again within this many days (TOPIC_REPEAT_DAYS)
+DEFAULT_REPEAT_DAYS = 90
+
+
+def slugify(text):
+    """Same slug generate_blog.sh builds from the topic"""
+    return re.sub(r'-+', '-', re.sub(r'[^a-z0-9]', '-', text.lower())).strip('-')
+
+
+def keyword_key(keyword):
+    return re.sub(r'\s+', ' ', keyword).strip().lower()
+
+
+class PublishHistory:
+    """Published posts with in-memory indexes by slug and primary keyword"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        self.by_slug = {}
+        self.by_keyword = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+
+    def _index(self, entry):
+        self.entries.append(entry)
+        if entry.get('slug'):
+            self.by_slug[entry['slug']] = entry
+        if entry.get('primary_keyword'):
+            self.by_keyword[keyword_key(entry['primary_keyword'])] = entry
+
+    def record(self, entry):
+        """Append one published post; returns False if it is already recorded"""
+        known = self.by_slug.get(entry.get('slug'))
+        if known and known.get('date') == entry.get('date'):
+            return False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._index(entry)
+        return True
+
+    def conflict(self, slug, keyword, live_slugs=(), repeat_days=DEFAULT_REPEAT_DAYS, today=None):
+        """Why a post with this slug/primary keyword should not be generated (None if fine);
+        re-running today's own post is allowed"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        known = self.by_slug.get(slug)
+        if known and known.get('date') != today:
+            return f"slug '{slug}' already published on {known.get('date')}"
+        if slug in live_slugs and not known:
+            return f"blog/{slug}.html already exists on the site"
+        used = self.by_keyword.get(keyword_key(keyword)) if keyword else None
+        if used and used.get('date') != today:
+            cutoff = (datetime.strptime(today, '%Y-%m-%d') - timedelta(days=repeat_days)).strftime('%Y-%m-%d')
+            if used.get('date', '') >= cutoff:
+                return f"keyword '{keyword_key(keyword)}' targeted on {used.get('date')} ({used.get('slug')})"
+        return None
+
+    def pick(self, pools, live_slugs=(), repeat_days=DEFAULT_REPEAT_DAYS, keywords=None):
+        """First candidate line, pools in order and lines in order, that does not conflict;
+        with a KeywordIndex, topics competing with a live page are re-angled or skipped"""
+        for pool in pools:
+            for line in pool:
+                parts = line.split('|')
+                if len(parts) < 2 or not parts[0].strip():
+                    continue
+                slug = slugify(parts[0])
+                if self.conflict(slug, parts[1], live_slugs, repeat_days):
+                    continue
+                if keywords is None:
+                    return line
+                screened = keywords.screen(line, exclude={f"{slug}.html"})
+                if screened == line:
+                    return line
+                if screened:
+                    title, keyword = screened.split('|')[:2]
+                    if not self.conflict(slugify(title), keyword, live_slugs, repeat_days):
+                        print(f"🔀 Re-angled '{parts[0]}' (competes with a live page): {title}", file=sys.stderr)
+                        return screened
+                print(f"⏭️ Skipped '{parts[0]}': competes with a live page", file=sys.stderr)
+        return None
+
+
+def history_path(ctx):
+    return os.path.join(ctx.output_dir, 'publish_history.jsonl')
+
+
+def live_slugs(ctx):
+    """Post slugs on the site as of the last mirror sync (no server round trip)"""
+    slugs = set()
+    for rel_path in ctx.mirror.files:
+        parts = rel_path.split('/')
+        if len(parts) == 2 and parts[0] == 'blog' and parts[1].endswith('.html'):
+            slugs.add(parts[1][:-len('.html')])
+    return slugs
+
+
+def record_post(ctx):
+    """Add today's post (latest_blog.json) to the history; False if already there"""
+    blog = ctx.blog
+    history = PublishHistory(history_path(ctx))
+    return history.record({
+        "date": blog.get('date') or datetime.now().strftime('%Y-%m-%d'),
+        "topic": blog.get('topic', blog.get('title', '')),
+        "slug": blog['slug'],
+        "filename": blog.get('filename', ''),
+        "primary_keyword": blog.get('primary_keyword', ''),
+        "category": blog.get('category', ''),
+        "url": blog.get('url', ''),
+    })
+
+
+def read_pool(path):
+    """Topic lines from a file (or '-' for stdin), skipping comments and blanks"""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        run_command(ctx)
+    finally:
+        ctx.close()
+
+
+def run_command(ctx):
+    history = PublishHistory(history_path(ctx))
+    repeat_days = int(ctx.config.get('TOPIC_REPEAT_DAYS', '') or DEFAULT_REPEAT_DAYS)
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+
+    if command == 'pick':
+        # stdout is the picked line (captured by the shell scripts); progress goes to stderr
+        with redirect_stdout(sys.stderr):
+            keywords = update_keyword_index(ctx)[0]
+        line = history.pick([read_pool(p) for p in sys.argv[2:]], live_slugs(ctx), repeat_days, keywords)
+        if not line:
+            print("❌ Every candidate topic was published recently or collides with a live post", file=sys.stderr)
+            sys.exit(1)
+        print(line)
+    elif command == 'check' and len(sys.argv) == 4:
+        slug, keyword = sys.argv[2], sys.argv[3]
+        reason = history.conflict(slug, keyword, live_slugs(ctx), repeat_days)
+        if not reason:
+            with redirect_stdout(sys.stderr):
+                hits = update_keyword_index(ctx)[0].conflicts(keyword, exclude={f"{slug}.html"})
+            if hits:
+                score, filename, phrase = hits[0]
+                reason = f"keyword competes with {filename} (\"{phrase}\", {score:.2f} overlap)"
+        if reason:
+            print(f"❌ Topic already covered: {reason}")
+            sys.exit(1)
+    elif command == 'record':
+        if not ctx.blog.get('slug'):
+            print("❌ No blog metadata found.")
+            sys.exit(1)
+        if record_post(ctx):
+            print(f"📒 Recorded in publish history: {ctx.blog['slug']}")
+    elif not command:
+        for entry in history.entries[-20:]:
+            print(f"{entry.get('date', '')}  {entry.get('primary_keyword', '') or '-':<40} {entry.get('slug', '')}")
+        print(f"📒 {len(history.entries)} published posts, {len(history.by_keyword)} keywords")
+    else:
+        print(__doc__.strip().split('CLI:')[1])
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
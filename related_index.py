@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Related-Article Index for LeadHorizon Blog
+Persistent sparse TF-IDF inverted index over every post's title, keywords, category
+and body text (output/related_index.json). Posts are added/updated/removed one at a
+time as the site mirror changes, so a new post never re-indexes the corpus; document
+norms are refreshed lazily when the corpus size drifts. top-k cosine similarity only
+touches the postings of the query's terms.
+"""
+
+import html
+import json
+import math
+import os
+import re
+import sys
+
+from pipeline_context import RunContext
+from run_manifest import file_hash
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Field weights applied to raw term counts before sublinear scaling
+FIELD_WEIGHTS = {"title": 3.0, "keywords": 2.0, "category": 2.0, "body": 1.0}
+
+# Body terms kept per post (by weight); keeps the index small on a 10k-post archive
+MAX_TERMS = 150
+
+# Recompute every norm once the corpus has grown/shrunk by this fraction
+NORM_DRIFT = 0.1
+
+STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its itself just me more most my
+no nor not now of off on once only or other our ours out over own same she should so some such
+than that the their theirs them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with you your yours
+read article blog leadhorizon guide tips
+""".split())
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_SCRIPT_STYLE = re.compile(r'<(script|style)\b.*?</\1>', re.S | re.I)
+_TAG = re.compile(r'<(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+# Everything the pipeline appends to a post (related cards, backlinks) is not its topic
+_APPENDED = re.compile(r'<!-- Related Articles -->.*|<!-- more-reading:start -->.*?<!-- more-reading:end -->|'
+                       r'<div style="max-width:800px;margin:20px auto;padding:10px 20px;"><p[^>]*>📖 Also read:.*?</div>',
+                       re.S)
+
+
+def tokenize(text):
+    """Lower-cased word tokens without stopwords, with a light plural fold"""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) < 2 or token in STOPWORDS or token.isdigit():
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def html_fields(page):
+    """title / keywords / category / body text of a post's HTML"""
+    def first(pattern):
+        match = re.search(pattern, page, re.S | re.I)
+        return html.unescape(match.group(1)) if match else ''
+
+    body = page
+    match = re.search(r'<article\b.*?</article>', page, re.S | re.I) or re.search(r'<body\b.*', page, re.S | re.I)
+    if match:
+        body = match.group(0)
+    return {
+        "title": re.split(r'\s*[|–-]\s*LeadHorizon', first(r'<title>(.*?)</title>'))[0],
+        "keywords": first(r'<meta name="keywords" content="([^"]*)"'),
+        "category": first(r'<span class="badge">(.*?)</span>'),
+        "body": text_of(body),
+    }
+
+
+def text_of(fragment):
+    """Visible text of an HTML fragment, without scripts, styles or pipeline-added link blocks"""
+    fragment = _APPENDED.sub(' ', _SCRIPT_STYLE.sub(' ', fragment))
+    return html.unescape(_TAG.sub(' ', fragment))
+
+
+def term_weights(fields):
+    """Field-weighted, sublinear term frequencies, capped to the strongest MAX_TERMS"""
+    counts = {}
+    for name, text in fields.items():
+        weight = FIELD_WEIGHTS.get(name, 1.0)
+        for token in tokenize(text or ''):
+            counts[token] = counts.get(token, 0.0) + weight
+    weights = {t: round(1.0 + math.log(c), 3) for t, c in counts.items()}
+    if len(weights) > MAX_TERMS:
+        weights = dict(sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))[:MAX_TERMS])
+    return weights
+
+
+class RelatedIndex:
+    """Inverted index: term -> {doc id: tf}, plus per-document metadata and norms"""
+
+    def __init__(self, path, data=None):
+        self.path = path
+        data = data or {}
+        self.docs = data.get("docs", {})          # filename -> {"id", "sha256", "title", "terms"}
+        self.postings = data.get("postings", {})  # term -> {doc id: tf}
+        self.norms = data.get("norms", {})        # doc id -> |tf-idf vector|
+        self.norms_n = data.get("norms_n", 0)
+        self.next_id = data.get("next_id", 1)
+        self.names = {str(d["id"]): name for name, d in self.docs.items()}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r') as f:
+                return cls(path, json.load(f))
+        except (OSError, ValueError):
+            return cls(path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "docs": self.docs,
+                "postings": self.postings,
+                "norms": self.norms,
+                "norms_n": self.norms_n,
+                "next_id": self.next_id,
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def idf(self, term):
+        return math.log((len(self.docs) + 1) / (len(self.postings.get(term, ())) + 1)) + 1.0
+
+    def _norm(self, weights):
+        return math.sqrt(sum((tf * self.idf(t)) ** 2 for t, tf in weights.items())) or 1.0
+
+    def add(self, name, fields, sha256=None):
+        """Index (or re-index) one post"""
+        self.remove(name)
+        doc_id = str(self.next_id)
+        self.next_id += 1
+        weights = term_weights(fields)
+        for term, tf in weights.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self.docs[name] = {"id": int(doc_id), "sha256": sha256, "title": fields.get("title", ""),
+                           "terms": sorted(weights)}
+        self.names[doc_id] = name
+        self.norms[doc_id] = self._norm(weights)
+
+    def remove(self, name):
+        doc = self.docs.pop(name, None)
+        if not doc:
+            return
+        doc_id = str(doc["id"])
+        for term in doc["terms"]:
+            plist = self.postings.get(term)
+            if plist is not None:
+                plist.pop(doc_id, None)
+                if not plist:
+                    del self.postings[term]
+        self.norms.pop(doc_id, None)
+        self.names.pop(doc_id, None)
+
+    def refresh_norms(self, force=False):
+        """Recompute all norms only when idf has drifted (corpus size changed by NORM_DRIFT)"""
+        n = len(self.docs)
+        if not force and self.norms_n and abs(n - self.norms_n) <= NORM_DRIFT * self.norms_n:
+            return False
+        sums = {}
+        for term, plist in self.postings.items():
+            idf = self.idf(term)
+            for doc_id, tf in plist.items():
+                sums[doc_id] = sums.get(doc_id, 0.0) + (tf * idf) ** 2
+        self.norms = {doc_id: math.sqrt(s) or 1.0 for doc_id, s in sums.items()}
+        self.norms_n = n
+        return True
+
+    def similar(self, name, k=5, exclude=()):
+        """Top-k (filename, cosine) for an indexed post, best first"""
+        doc = self.docs.get(name)
+        if not doc:
+            return []
+        self.refresh_norms()
+        query_id = str(doc["id"])
+        query = {}
+        for term in doc["terms"]:
+            query[term] = self.postings[term][query_id] * self.idf(term)
+        query_norm = math.sqrt(sum(w * w for w in query.values())) or 1.0
+
+        scores = {}
+        for term, q_weight in query.items():
+            idf = self.idf(term)
+            for doc_id, tf in self.postings[term].items():
+                if doc_id != query_id:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + q_weight * tf * idf
+
+        skip = set(exclude)
+        ranked = []
+        for doc_id, score in scores.items():
+            other = self.names.get(doc_id)
+            if other and other not in skip:
+                ranked.append((score / (query_norm * self.norms.get(doc_id, 1.0)), other))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [(other, round(score, 4)) for score, other in ranked[:k]]
+
+
+def index_path(ctx):
+    return os.path.join(ctx.output_dir, 'related_index.json')
+
+
+def update_index(ctx, extra=None):
+    """Load the index and bring it in step with the site mirror (only changed posts are
+    re-indexed); extra is {filename: local html path} for posts not deployed yet"""
+    index = RelatedIndex.load(index_path(ctx))
+    added = removed = 0
+
+    mirror = ctx.mirror
+    if mirror.is_current():
+        live = {}
+        for rel_path, entry in mirror.files.items():
+            parts = rel_path.split('/')
+            if len(parts) == 2 and parts[0] == 'blog' and parts[1].endswith('.html'):
+                live[parts[1]] = (mirror.path(rel_path), entry['sha256'])
+        for name in [n for n in index.docs if n not in live and n not in (extra or {})]:
+            index.remove(name)
+            removed += 1
+        for name, (path, sha256) in live.items():
+            if index.docs.get(name, {}).get("sha256") != sha256:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    index.add(name, html_fields(f.read()), sha256)
+                added += 1
+
+    for name, path in (extra or {}).items():
+        sha256 = file_hash(path)
+        if sha256 and index.docs.get(name, {}).get("sha256") != sha256:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                index.add(name, html_fields(f.read()), sha256)
+            added += 1
+
+    # Settle norms here, so the (persisted) index answers queries without a full pass
+    if index.refresh_norms() or added or removed:
+        index.save()
+    return index, added, removed
+
+
+def main():
+    ctx = RunContext.load()
+    blog = ctx.blog
+    extra = {}
+    if blog.get('filename') and os.path.exists(os.path.join(ctx.output_dir, blog['filename'])):
+        extra[blog['filename']] = os.path.join(ctx.output_dir, blog['filename'])
+
+    index, added, removed = update_index(ctx, extra)
+    print(f"📚 Related index: {len(index)} posts, {len(index.postings)} terms "
+          f"({added} indexed, {removed} removed)")
+
+    name = sys.argv[1] if len(sys.argv) > 1 else blog.get('filename', '')
+    for other, score in index.similar(name, k=5):
+        print(f"  {score:.3f}  {other}  {index.docs[other]['title']}")
+
+
+if __name__ == "__main__":
+    main()
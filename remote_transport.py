@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Remote Transport for LeadHorizon Blog Automation
+One multiplexed SSH connection (ControlMaster) per run, shared by every stage and deploy.sh.
+Paths are relative to the site root (REMOTE_PATH), so the server can be swapped for a
+local directory with REMOTE_TRANSPORT="local:/path/to/site" (config.sh or environment).
+"""
+
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+
+# Control socket of the pipeline's SSH master, exported for the scripts it starts
+# (deploy.sh and the Python stages it runs attach to it instead of opening their own)
+CONTROL_PATH_ENV = "LH_SSH_CONTROL_PATH"
+
+
+class TransportError(Exception):
+    """A remote command or file transfer failed"""
+
+
+class TransportStats:
+    """Connection reuse and transfer counters for the run report"""
+
+    def __init__(self):
+        self.connections = 0
+        self.reused = 0
+        self.commands = 0
+        self.uploads = 0
+        self.downloads = 0
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.seconds = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, **counts):
+        with self.lock:
+            for key, value in counts.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def as_dict(self):
+        return {
+            "connections": self.connections,
+            "reused": self.reused,
+            "commands": self.commands,
+            "uploads": self.uploads,
+            "downloads": self.downloads,
+            "bytes_up": self.bytes_up,
+            "bytes_down": self.bytes_down,
+            "seconds": round(self.seconds, 2),
+        }
+
+    def summary(self):
+        ops = self.commands + self.uploads + self.downloads
+        return (f"{ops} remote ops over {self.connections} connection(s), "
+                f"{self.reused} reused, {self.bytes_up:,} B up / {self.bytes_down:,} B down")
+
+
+def _rel(path):
+    return path.lstrip('/')
+
+
+def _decoded(result):
+    """CompletedProcess with bytes output turned into text"""
+    return subprocess.CompletedProcess(result.args, result.returncode,
+                                       result.stdout.decode('utf-8', 'replace'),
+                                       result.stderr.decode('utf-8', 'replace'))
+
+
+class _CountingReader:
+    """File-like wrapper that counts the bytes read through it"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.count += len(data)
+        return data
+
+
+def _extract_files(tar, local_root):
+    """Extract regular files from a streamed tar, refusing paths outside local_root"""
+    root = os.path.abspath(local_root)
+    safety = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    names = []
+    for member in tar:
+        target = os.path.abspath(os.path.join(root, member.name))
+        if not member.isreg() or not target.startswith(root + os.sep):
+            continue
+        tar.extract(member, root, set_attrs=False, **safety)
+        os.utime(target, (member.mtime, member.mtime))
+        names.append(member.name)
+    return names
+
+
+class _Transport:
+    """Shared bookkeeping: stats and upload listeners (e.g. the local site mirror)"""
+
+    def __init__(self):
+        self.stats = TransportStats()
+        self.listeners = []
+
+    def _uploaded(self, local_path, rel_path):
+        for listener in self.listeners:
+            listener(local_path, _rel(rel_path))
+
+
+class SSHTransport(_Transport):
+    """Runs commands and transfers files over a single SSH ControlMaster connection"""
+
+    kind = "ssh"
+
+    def __init__(self, host, port, user, password, root, persist=600):
+        super().__init__()
+        self.host = host
+        self.port = str(port or '22')
+        self.user = user
+        self.password = password
+        self.root = root.rstrip('/')
+        self.persist = persist
+        digest = hashlib.sha1(f"{user}@{host}:{self.port}".encode()).hexdigest()[:12]
+        self.control_path = (os.environ.get(CONTROL_PATH_ENV)
+                             or os.path.join(tempfile.gettempdir(), f"lh-ssh-{digest}"))
+        self.owns_master = False
+        self.multiplexed = False
+        self._lock = threading.Lock()
+
+    @property
+    def target(self):
+        return f"{self.user}@{self.host}"
+
+    def _auth(self):
+        """sshpass prefix when password auth is configured"""
+        if self.password and shutil.which('sshpass'):
+            return ['sshpass', '-p', self.password]
+        return []
+
+    def _ssh_opts(self):
+        opts = ['-o', 'StrictHostKeyChecking=no']
+        if self.multiplexed:
+            opts += ['-o', 'ControlMaster=no', '-o', f'ControlPath={self.control_path}']
+        return opts
+
+    def _master_alive(self):
+        result = subprocess.run(
+            ['ssh', '-o', f'ControlPath={self.control_path}', '-O', 'check', '-p', self.port, self.target],
+            capture_output=True, text=True
+        )
+        return result.returncode == 0
+
+    def connect(self):
+        """Start (or attach to) the shared master connection"""
+        with self._lock:
+            if self.multiplexed:
+                return True
+            if os.path.exists(self.control_path) and self._master_alive():
+                self.multiplexed = True
+                return True
+            cmd = self._auth() + [
+                'ssh', '-M', '-N', '-f',
+                '-o', 'StrictHostKeyChecking=no',
+                '-o', 'ControlMaster=yes',
+                '-o', f'ControlPath={self.control_path}',
+                '-o', f'ControlPersist={self.persist}',
+                '-o', 'ServerAliveInterval=30',
+                '-p', self.port, self.target,
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                ok = result.returncode == 0 and self._master_alive()
+            except (OSError, subprocess.TimeoutExpired):
+                ok = False
+            self.stats.add(connections=1)
+            if ok:
+                self.multiplexed = True
+                self.owns_master = True
+                os.environ[CONTROL_PATH_ENV] = self.control_path
+            else:
+                print("  ⚠️ SSH multiplexing unavailable, using one connection per operation")
+            return ok
+
+    def _count_session(self):
+        if self.multiplexed:
+            self.stats.add(reused=1)
+        else:
+            self.stats.add(connections=1)
+
+    def _exec(self, argv, input=None, timeout=60, binary=False):
+        started = time.time()
+        try:
+            result = subprocess.run(argv, input=input, capture_output=True, text=not binary, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            raise TransportError(f"timed out after {timeout}s: {' '.join(argv[:1])}") from e
+        finally:
+            self.stats.add(seconds=time.time() - started)
+        return result
+
+    def ssh_command(self, command):
+        """argv for running a shell command in the site root"""
+        remote = f"cd {shlex.quote(self.root)} && {command}" if self.root else command
+        return self._auth() + ['ssh'] + self._ssh_opts() + ['-p', self.port, self.target, remote]
+
+    def run(self, command, input=None, timeout=60, check=False):
+        """Run a shell command in the site root; returns CompletedProcess"""
+        self.connect()
+        self._count_session()
+        self.stats.add(commands=1)
+        result = self._exec(self.ssh_command(command), input=input, timeout=timeout)
+        if check and result.returncode != 0:
+            raise TransportError(f"remote command failed ({result.returncode}): {result.stderr.strip()[:200]}")
+        return result
+
+    def send(self, command, data, timeout=300):
+        """Run a command with binary data on its stdin (upload and apply in one round trip)"""
+        self.connect()
+        self._count_session()
+        self.stats.add(commands=1, uploads=1, bytes_up=len(data))
+        result = self._exec(self.ssh_command(command), input=data, timeout=timeout, binary=True)
+        return _decoded(result)
+
+    def stream(self, command, input=None):
+        """Run a command and yield its stdout line by line as it arrives"""
+        self.connect()
+        self._count_session()
+        self.stats.add(commands=1)
+        started = time.time()
+        # stderr goes to a file: a pipe nobody reads would block a chatty remote command
+        with tempfile.TemporaryFile(mode='w+') as errors:
+            proc = subprocess.Popen(self.ssh_command(command), stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE, stderr=errors, text=True)
+            if input is not None:
+                proc.stdin.write(input)
+            proc.stdin.close()
+            try:
+                for line in proc.stdout:
+                    self.stats.add(bytes_down=len(line))
+                    yield line
+            finally:
+                proc.wait()
+                self.stats.add(seconds=time.time() - started)
+            if proc.returncode != 0:
+                errors.seek(0)
+                raise TransportError(f"remote command failed ({proc.returncode}): {errors.read().strip()[:200]}")
+
+    def _remote(self, rel_path):
+        """scp argument for a file under the site root (the remote side parses it like a shell word)"""
+        return f"{self.target}:{shlex.quote(f'{self.root}/{_rel(rel_path)}')}"
+
+    def _scp(self, src, dst, timeout):
+        argv = self._auth() + ['scp', '-q'] + self._ssh_opts() + ['-P', self.port, src, dst]
+        return self._exec(argv, timeout=timeout)
+
+    def upload(self, local_path, rel_path, timeout=120):
+        self.connect()
+        self._count_session()
+        result = self._scp(local_path, self._remote(rel_path), timeout)
+        if result.returncode != 0 and '/' in _rel(rel_path):
+            # first file in a new directory (e.g. assets/): create it and try once more
+            self.run(f"mkdir -p {shlex.quote(os.path.dirname(_rel(rel_path)))}")
+            result = self._scp(local_path, self._remote(rel_path), timeout)
+        if result.returncode != 0:
+            raise TransportError(f"upload of {rel_path} failed: {result.stderr.strip()[:200]}")
+        self.stats.add(uploads=1, bytes_up=os.path.getsize(local_path))
+        self._uploaded(local_path, rel_path)
+        return True
+
+    def download(self, rel_path, local_path, timeout=120):
+        self.connect()
+        self._count_session()
+        result = self._scp(self._remote(rel_path), local_path, timeout)
+        if result.returncode != 0:
+            raise TransportError(f"download of {rel_path} failed: {result.stderr.strip()[:200]}")
+        self.stats.add(downloads=1, bytes_down=os.path.getsize(local_path))
+        return True
+
+    def download_many(self, rel_paths, local_root, timeout=600):
+        """Fetch several files through one tar stream, keeping their site-relative paths"""
+        if not rel_paths:
+            return []
+        self.connect()
+        self._count_session()
+        started = time.time()
+        names = ''.join(_rel(p) + '\0' for p in rel_paths).encode('utf-8')
+        proc = subprocess.Popen(self.ssh_command("tar -cf - --null -T -"), stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        def feed():
+            try:
+                proc.stdin.write(names)
+            except OSError:
+                pass
+            finally:
+                proc.stdin.close()
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        reader = _CountingReader(proc.stdout)
+        try:
+            with tarfile.open(fileobj=reader, mode='r|') as tar:
+                fetched = _extract_files(tar, local_root)
+        except tarfile.TarError as e:
+            proc.kill()
+            raise TransportError(f"bulk download failed: {e}") from e
+        finally:
+            feeder.join()
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            self.stats.add(downloads=len(rel_paths), bytes_down=reader.count,
+                           seconds=time.time() - started)
+        if proc.returncode != 0 and len(fetched) < len(rel_paths):
+            raise TransportError(f"bulk download incomplete: {len(fetched)}/{len(rel_paths)} files")
+        return fetched
+
+    def close(self):
+        """Stop the master connection if this transport started it"""
+        if self.owns_master:
+            subprocess.run(['ssh', '-o', f'ControlPath={self.control_path}', '-O', 'exit',
+                            '-p', self.port, self.target], capture_output=True)
+            self.owns_master = False
+            if os.environ.get(CONTROL_PATH_ENV) == self.control_path:
+                del os.environ[CONTROL_PATH_ENV]
+        self.multiplexed = False
+
+
+class LocalTransport(_Transport):
+    """Same interface as SSHTransport, backed by a local directory (tests and dry runs)"""
+
+    kind = "local"
+
+    def __init__(self, root):
+        super().__init__()
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, rel_path):
+        return os.path.join(self.root, _rel(rel_path))
+
+    def connect(self):
+        return True
+
+    def run(self, command, input=None, timeout=60, check=False):
+        self.stats.add(commands=1, reused=1)
+        result = subprocess.run(['bash', '-c', command], cwd=self.root, input=input,
+                                capture_output=True, text=True, timeout=timeout)
+        if check and result.returncode != 0:
+            raise TransportError(f"command failed ({result.returncode}): {result.stderr.strip()[:200]}")
+        return result
+
+    def send(self, command, data, timeout=300):
+        self.stats.add(commands=1, uploads=1, reused=1, bytes_up=len(data))
+        result = subprocess.run(['bash', '-c', command], cwd=self.root, input=data,
+                                capture_output=True, timeout=timeout)
+        return _decoded(result)
+
+    def stream(self, command, input=None):
+        result = self.run(command, input=input)
+        for line in result.stdout.splitlines(True):
+            self.stats.add(bytes_down=len(line))
+            yield line
+        if result.returncode != 0:
+            raise TransportError(f"command failed ({result.returncode}): {result.stderr.strip()[:200]}")
+
+    def upload(self, local_path, rel_path, timeout=120):
+        target = self._path(rel_path)
+        if target.endswith('/') or os.path.isdir(target):
+            target = os.path.join(target, os.path.basename(local_path))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(local_path, target)
+        self.stats.add(uploads=1, reused=1, bytes_up=os.path.getsize(local_path))
+        self._uploaded(local_path, rel_path)
+        return True
+
+    def download(self, rel_path, local_path, timeout=120):
+        source = self._path(rel_path)
+        if not os.path.isfile(source):
+            raise TransportError(f"download of {rel_path} failed: no such file")
+        shutil.copyfile(source, local_path)
+        self.stats.add(downloads=1, reused=1, bytes_down=os.path.getsize(local_path))
+        return True
+
+    def download_many(self, rel_paths, local_root, timeout=600):
+        fetched = []
+        for rel_path in rel_paths:
+            source = self._path(rel_path)
+            if not os.path.isfile(source):
+                continue
+            target = os.path.join(local_root, _rel(rel_path))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target)
+            self.stats.add(bytes_down=os.path.getsize(target))
+            fetched.append(_rel(rel_path))
+        self.stats.add(downloads=len(fetched), reused=1)
+        return fetched
+
+    def close(self):
+        pass
+
+
+def create_transport(config):
+    """Build the transport selected by REMOTE_TRANSPORT (environment wins over config.sh)"""
+    spec = os.environ.get('REMOTE_TRANSPORT') or config.get('REMOTE_TRANSPORT', '') or 'ssh'
+    if spec.startswith('local:'):
+        return LocalTransport(os.path.expanduser(spec[len('local:'):]))
+    return SSHTransport(
+        host=config.get('SSH_HOST', ''),
+        port=config.get('SSH_PORT', '22'),
+        user=config.get('SSH_USER', ''),
+        password=config.get('SSH_PASS', ''),
+        root=config.get('REMOTE_PATH', ''),
+    )
+
+
+def main():
+    """Small CLI: check the connection and print reuse metrics"""
+    from pipeline_context import RunContext
+
+    ctx = RunContext.load()
+    remote = ctx.remote
+    print(f"🔌 Transport: {remote.kind}")
+    result = remote.run("ls -1 | head -5")
+    print(result.stdout.strip() or result.stderr.strip())
+    print(f"📊 {remote.stats.summary()}")
+    ctx.close()
+    sys.exit(0 if result.returncode == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
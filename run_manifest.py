@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Run Manifest for the LeadHorizon pipeline
+Records each step's input fingerprint and content-hashed outputs so a resumed run
+can skip every step whose inputs are unchanged and whose outputs are still on disk
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNS_DIR = os.path.join(SCRIPT_DIR, 'output', 'runs')
+
+
+def file_hash(path):
+    """sha256 of a file's contents, or None if it does not exist"""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _rel(path):
+    return os.path.relpath(os.path.abspath(path), SCRIPT_DIR)
+
+
+class RunManifest:
+    """Per-run record of step fingerprints, statuses and output hashes"""
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {"run_id": "", "created": "", "files": {}, "steps": {}}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def new(cls, run_id):
+        path = os.path.join(RUNS_DIR, f"{run_id}.json")
+        return cls(path, {
+            "run_id": run_id,
+            "created": datetime.now().isoformat(),
+            "files": {},
+            "steps": {},
+        })
+
+    @classmethod
+    def latest(cls):
+        """Load the most recent run manifest, or None if no run was recorded"""
+        if not os.path.isdir(RUNS_DIR):
+            return None
+        names = sorted(n for n in os.listdir(RUNS_DIR) if n.endswith('.json'))
+        if not names:
+            return None
+        return cls.load(os.path.join(RUNS_DIR, names[-1]))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls(path, json.load(f))
+
+    @property
+    def run_id(self):
+        return self.data.get("run_id", "")
+
+    def fingerprint(self, step, ctx):
+        """Hash everything a step's result depends on: its source, config, params and upstream results"""
+        parts = {
+            "step": step.name,
+            "sources": {_rel(p): file_hash(p) for p in step.sources()},
+            "config": {k: ctx.config.get(k, '') for k in step.config_keys},
+            "params": step.params(ctx) if step.params else {},
+            "deps": {},
+        }
+        for dep in step.deps:
+            record = self.data["steps"].get(dep, {})
+            parts["deps"][dep] = [record.get("fingerprint"), record.get("outputs", {})]
+        blob = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(blob).hexdigest()
+
+    def is_fresh(self, step, fingerprint):
+        """True if the step already succeeded with these inputs and its outputs were not touched since"""
+        record = self.data["steps"].get(step.name)
+        if not record or record.get("status") != "ok" or record.get("fingerprint") != fingerprint:
+            return False
+        for rel_path in record.get("outputs", {}):
+            current = file_hash(os.path.join(SCRIPT_DIR, rel_path))
+            if current is None or current != self.data["files"].get(rel_path):
+                return False
+        return True
+
+    def record(self, step, fingerprint, ctx):
+        """Store a finished step's status and the hashes of the outputs it left behind"""
+        outputs = {}
+        if step.status == "ok" and step.outputs:
+            for path in step.outputs(ctx):
+                digest = file_hash(path)
+                if digest:
+                    outputs[_rel(path)] = digest
+        with self.lock:
+            self.data["steps"][step.name] = {
+                "status": step.status,
+                "fingerprint": fingerprint,
+                "outputs": outputs,
+                "duration": round(step.duration, 2),
+                "finished": datetime.now().isoformat(),
+            }
+            self.data["files"].update(outputs)
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Site Mirror for LeadHorizon Blog Automation
+Keeps a local copy of the live archive (blog/, images/, assets/, sitemaps, blog.html, rss.xml)
+in output/mirror, tracked by a manifest of size, mtime and sha256.
+Each sync is one listing round trip plus one tar stream of the files whose hash changed.
+"""
+
+import fnmatch
+import json
+import os
+import shlex
+import sys
+import threading
+from datetime import datetime
+
+from pipeline_context import RunContext
+from remote_transport import TransportError
+from run_manifest import file_hash
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MIRROR_DIR = os.path.join(SCRIPT_DIR, 'output', 'mirror')
+MANIFEST_NAME = '.manifest.json'
+
+# Site-relative paths (or glob patterns) mirrored from the server; style.css and
+# script.js only so page_template.py can version them by content
+TRACKED = ('blog', 'images', 'assets', 'sitemap*.xml*', 'blog.html', 'rss.xml', 'style.css', 'script.js')
+
+# Runs on the server: reads the known {path: [size, mtime, sha256]} on stdin and
+# prints [path, size, mtime, sha256] per file, hashing only files whose size/mtime moved
+REMOTE_SCRIPT = r'''
+import glob, hashlib, json, os, sys
+known = json.load(sys.stdin)
+def sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+def emit(rel):
+    try:
+        st = os.stat(rel)
+    except OSError:
+        return
+    size, mtime = st.st_size, int(st.st_mtime)
+    prev = known.get(rel)
+    if prev and prev[0] == size and prev[1] == mtime:
+        digest = prev[2]
+    else:
+        try:
+            digest = sha256(rel)
+        except OSError:
+            return
+    sys.stdout.write(json.dumps([rel, size, mtime, digest]) + "\n")
+for pattern in sys.argv[1:]:
+    for top in sorted(glob.glob(pattern)):
+        if os.path.isdir(top):
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    emit(os.path.join(dirpath, name))
+        else:
+            emit(top)
+'''
+
+
+class SiteMirror:
+    """Local mirror of the live site plus the manifest describing it"""
+
+    def __init__(self, root=MIRROR_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"synced_at": "", "files": {}}
+
+    def reload(self):
+        """Pick up the manifest as another process (deploy.sh) left it"""
+        with self.lock:
+            self.data = self._load()
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @property
+    def files(self):
+        return self.data["files"]
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path.lstrip('/'))
+
+    def is_current(self):
+        """True once the mirror has been synced today"""
+        return self.data.get("synced_at", "")[:10] == datetime.now().strftime('%Y-%m-%d')
+
+    def exists(self, rel_path):
+        return rel_path.lstrip('/') in self.files
+
+    def list(self, prefix):
+        """Mirrored site-relative paths under a directory, sorted"""
+        prefix = prefix.rstrip('/') + '/'
+        return sorted(p for p in self.files if p.startswith(prefix))
+
+    def read_text(self, rel_path):
+        with open(self.path(rel_path), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _is_tracked(self, rel_path):
+        return any(fnmatch.fnmatchcase(rel_path, top) or rel_path.startswith(top + '/') for top in TRACKED)
+
+    def remote_listing(self, remote):
+        """{path: [size, mtime, sha256]} for every tracked file on the server"""
+        known = {rel: [e["size"], e["mtime"], e["sha256"]] for rel, e in self.files.items()}
+        command = f"python3 -c {shlex.quote(REMOTE_SCRIPT)} " + ' '.join(shlex.quote(t) for t in TRACKED)
+        listing = {}
+        for line in remote.stream(command, input=json.dumps(known)):
+            line = line.strip()
+            if line:
+                rel, size, mtime, digest = json.loads(line)
+                listing[rel] = [size, mtime, digest]
+        return listing
+
+    def sync(self, remote):
+        """Bring the mirror up to date; returns counts of what moved"""
+        listing = self.remote_listing(remote)
+
+        changed = []
+        for rel, (size, mtime, digest) in listing.items():
+            entry = self.files.get(rel)
+            if not entry or entry["sha256"] != digest or not os.path.isfile(self.path(rel)):
+                changed.append(rel)
+        removed = [rel for rel in self.files if rel not in listing]
+
+        fetched = remote.download_many(changed, self.root) if changed else []
+
+        with self.lock:
+            for rel in removed:
+                try:
+                    os.remove(self.path(rel))
+                except OSError:
+                    pass
+                del self.files[rel]
+            missing = set(changed) - set(fetched)
+            for rel, (size, mtime, digest) in listing.items():
+                if rel in missing:
+                    continue
+                self.files[rel] = {"size": size, "mtime": mtime, "sha256": digest}
+            self.data["synced_at"] = datetime.now().isoformat()
+            self.save()
+
+        return {
+            "files": len(listing),
+            "downloaded": len(fetched),
+            "removed": len(removed),
+            "unchanged": len(listing) - len(changed),
+        }
+
+    def note_upload(self, local_path, rel_path):
+        """Write-through: keep the mirror in step with files this run uploads"""
+        if not self._is_tracked(rel_path) or not os.path.isfile(local_path):
+            return
+        target = self.path(rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(local_path, 'rb') as src, open(target, 'wb') as dst:
+            dst.write(src.read())
+        with self.lock:
+            # mtime unknown until the next listing, which re-hashes only this file
+            self.files[rel_path] = {"size": os.path.getsize(target), "mtime": 0,
+                                    "sha256": file_hash(target)}
+            self.save()
+
+
+def live_hashes(ctx, patterns):
+    """sha256 of live files matching the glob patterns: the mirror manifest when it
+    is current, otherwise one sha256sum on the server"""
+    if ctx.mirror.is_current():
+        return {rel: entry['sha256'] for rel, entry in ctx.mirror.files.items()
+                if any(fnmatch.fnmatchcase(rel, p) for p in patterns)}
+    try:
+        result = ctx.remote.run(f"sha256sum {' '.join(patterns)} 2>/dev/null || true", timeout=30)
+    except TransportError:
+        return {}
+    hashes = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            hashes[parts[1].lstrip('*')] = parts[0]
+    return hashes
+
+
+def run(ctx):
+    print("🪞 Site Mirror Sync")
+    print("=" * 50)
+
+    mirror = ctx.mirror
+    print(f"📁 Mirror: {mirror.root}")
+    print(f"📚 Known files: {len(mirror.files)}")
+
+    try:
+        counts = mirror.sync(ctx.remote)
+    except (TransportError, ValueError) as e:
+        print(f"❌ Sync failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ {counts['files']} files: {counts['downloaded']} downloaded, "
+          f"{counts['removed']} removed, {counts['unchanged']} unchanged")
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Sitemap Builder for LeadHorizon Blog
+Generates sitemap.xml locally from the post catalog instead of editing it on the server:
+a sitemap index pointing at child sitemaps (non-blog pages + post shards within the
+protocol limits of 50,000 URLs / 50 MB each), gzipped variants and image entries for
+/images/{slug}.jpg. Only files whose content hash differs from the live copy are published.
+"""
+
+import gzip
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from blog_catalog import site_posts
+from pipeline_context import RunContext
+from remote_transport import TransportError
+from run_manifest import file_hash
+from site_mirror import live_hashes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+PAGES_SITEMAP = 'sitemap-pages.xml'
+POSTS_SITEMAP = 'sitemap-posts-{n}.xml'
+
+URLSET_HEAD = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+               'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n')
+URLSET_TAIL = '</urlset>\n'
+INDEX_HEAD = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+INDEX_TAIL = '</sitemapindex>\n'
+
+_URL_BLOCK = re.compile(r'[ \t]*<url>.*?</url>[ \t]*\n?', re.S)
+_LOC = re.compile(r'<loc>\s*([^<]*?)\s*</loc>')
+_LASTMOD = re.compile(r'<lastmod>\s*([^<]*?)\s*</lastmod>')
+
+
+def is_post_url(url):
+    return '/blog/' in url and url.endswith('.html')
+
+
+def url_entry(post):
+    """<url> block for one post, with its featured image when there is one"""
+    lines = [
+        '    <url>',
+        f'        <loc>{escape(post["url"])}</loc>',
+        f'        <lastmod>{post["lastmod"]}</lastmod>',
+        '        <changefreq>monthly</changefreq>',
+        '        <priority>0.8</priority>',
+    ]
+    if post.get('image'):
+        lines += [
+            '        <image:image>',
+            f'            <image:loc>{escape(post["image"])}</image:loc>',
+            '        </image:image>',
+        ]
+    lines.append('    </url>\n')
+    return '\n'.join(lines)
+
+
+def image_names(ctx):
+    """Filenames under images/ on the live site (one listing)"""
+    try:
+        result = ctx.archive.run("ls -1 images 2>/dev/null || true", timeout=30)
+    except TransportError:
+        return set()
+    return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+
+
+def collect_posts(ctx):
+    """Every published post plus today's, oldest first so existing shards stay stable"""
+    images = image_names(ctx)
+    blog = ctx.blog
+    if blog.get('slug') and os.path.exists(os.path.join(ctx.output_dir, f"{blog['slug']}.jpg")):
+        images.add(f"{blog['slug']}.jpg")
+
+    posts = []
+    for record in site_posts(ctx):
+        image = f"{record['slug']}.jpg"
+        posts.append({
+            "url": f"{ctx.site_url}/blog/{record['filename']}",
+            "lastmod": record['modified'] or datetime.now().strftime('%Y-%m-%d'),
+            "image": f"{ctx.site_url}/images/{image}" if image in images else '',
+        })
+    return posts
+
+
+def existing_page_entries(ctx):
+    """<url> blocks for everything that is not a blog post, taken from the live sitemap"""
+    with tempfile.TemporaryDirectory() as workdir:
+        for rel_path in (PAGES_SITEMAP, 'sitemap.xml'):
+            local_path = os.path.join(workdir, rel_path)
+            try:
+                ctx.archive.download(rel_path, local_path)
+            except TransportError:
+                continue
+            with open(local_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if '<urlset' not in text:
+                continue  # sitemap.xml is already an index
+            blocks = []
+            for block in _URL_BLOCK.findall(text):
+                loc = _LOC.search(block)
+                if loc and not is_post_url(loc.group(1)):
+                    blocks.append(block if block.endswith('\n') else block + '\n')
+            return blocks
+    return []
+
+
+def shard(entries):
+    """Split rendered <url> entries into urlsets within the protocol limits"""
+    shards, current, size = [], [], 0
+    overhead = len(URLSET_HEAD.encode('utf-8')) + len(URLSET_TAIL.encode('utf-8'))
+    for entry in entries:
+        entry_size = len(entry.encode('utf-8'))
+        if current and (len(current) >= MAX_URLS or overhead + size + entry_size > MAX_BYTES):
+            shards.append(current)
+            current, size = [], 0
+        current.append(entry)
+        size += entry_size
+    if current:
+        shards.append(current)
+    return shards
+
+
+def build(ctx):
+    """{site path: bytes} for the index, every child sitemap and their .gz variants"""
+    posts = collect_posts(ctx)
+    pages = existing_page_entries(ctx)
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    children = []
+    if pages:
+        lastmods = [m.group(1)[:10] for m in map(_LASTMOD.search, pages) if m]
+        children.append((PAGES_SITEMAP, pages, max(lastmods) if lastmods else today))
+    entries = [url_entry(post) for post in posts]
+    start = 0
+    for n, entries_in_shard in enumerate(shard(entries), 1):
+        shard_posts = posts[start:start + len(entries_in_shard)]
+        start += len(entries_in_shard)
+        lastmod = max(p['lastmod'] for p in shard_posts)
+        children.append((POSTS_SITEMAP.format(n=n), entries_in_shard, lastmod))
+
+    files = {}
+    index = [INDEX_HEAD]
+    for name, child_entries, lastmod in children:
+        data = (URLSET_HEAD + ''.join(child_entries) + URLSET_TAIL).encode('utf-8')
+        files[name] = data
+        files[name + '.gz'] = gzip.compress(data, mtime=0)
+        index.append(f'    <sitemap>\n        <loc>{ctx.site_url}/{name}.gz</loc>\n'
+                     f'        <lastmod>{lastmod}</lastmod>\n    </sitemap>\n')
+    index.append(INDEX_TAIL)
+    files['sitemap.xml'] = ''.join(index).encode('utf-8')
+    files['sitemap.xml.gz'] = gzip.compress(files['sitemap.xml'], mtime=0)
+    return files, len(posts), len(pages)
+
+
+def publish_changed(ctx, files):
+    """Write the sitemaps to output/sitemaps and publish the ones whose hash changed"""
+    out_dir = os.path.join(ctx.output_dir, 'sitemaps')
+    os.makedirs(out_dir, exist_ok=True)
+    live = live_hashes(ctx, ['sitemap*.xml*'])
+
+    published, unchanged = [], []
+    # Children first, so the index never points at a sitemap that is not there yet
+    for name in sorted(files, key=lambda n: (n.startswith('sitemap.xml'), n)):
+        local_path = os.path.join(out_dir, name)
+        with open(local_path, 'wb') as f:
+            f.write(files[name])
+        if live.get(name) == file_hash(local_path):
+            unchanged.append(name)
+            continue
+        ctx.publish(name, local_path)
+        published.append(name)
+    return published, unchanged
+
+
+def run(ctx):
+    print("🗺️ Sitemap Builder")
+    print("=" * 50)
+
+    files, post_count, page_count = build(ctx)
+    print(f"📚 {post_count} posts, {page_count} other pages, "
+          f"{len([n for n in files if n.startswith('sitemap-') and n.endswith('.xml')])} child sitemaps")
+
+    try:
+        published, unchanged = publish_changed(ctx, files)
+    except TransportError as e:
+        print(f"❌ Sitemap upload failed: {e}")
+        sys.exit(1)
+
+    for name in published:
+        print(f"  📤 {name}")
+    print(f"✅ Sitemap updated: {len(published)} files published, {len(unchanged)} unchanged")
+
+
+def main():
+    ctx = RunContext.load()
+    try:
+        run(ctx)
+    finally:
+        ctx.close()
+
+
+if __name__ == "__main__":
+    main()
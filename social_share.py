@@ -4,27 +4,16 @@ Social Media Auto-Share for LeadHorizon Blogs
 Shares new blog posts to Facebook, LinkedIn, and Instagram automatically
 """
 
-import json
 import os
 import sys
 import requests
 from datetime import datetime
 
+from pipeline_context import RunContext
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SITE_URL = "https://leadhorizon.co.in"
 
-def load_config():
-    """Load configuration from config.sh"""
-    config = {}
-    config_path = os.path.join(SCRIPT_DIR, 'config.sh')
-    with open(config_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key] = value.strip('"').strip("'")
-    return config
-
 def get_category_hashtags(category):
     """Get relevant hashtags based on blog category"""
     base_tags = "#RealEstate #DigitalMarketing #LeadHorizon"
@@ -239,34 +228,29 @@ Expert insights on real estate digital marketing.
 
 # ==================== MAIN ====================
 
-def main():
+def run(ctx):
     print("🚀 Social Media Auto-Share")
     print("=" * 60)
 
-    config = load_config()
+    config = ctx.config
 
     # Load blog metadata
-    blog_file = os.path.join(SCRIPT_DIR, 'output', 'latest_blog.json')
-    if not os.path.exists(blog_file):
+    blog_data = ctx.blog
+    if not blog_data:
         print("❌ No blog metadata found. Run generate_blog.sh first.")
         sys.exit(1)
 
-    with open(blog_file, 'r') as f:
-        blog_data = json.load(f)
-
     title = blog_data.get('title', 'New Blog Post')
     url = blog_data.get('url', '')
     slug = blog_data.get('slug', '')
 
     # Load topic data for description & category
-    topic_file = os.path.join(SCRIPT_DIR, 'output', 'today_topic.json')
     description = "Expert insights on real estate digital marketing for builders and developers."
     category = "Market Trends"
-    if os.path.exists(topic_file):
-        with open(topic_file, 'r') as f:
-            topic_data = json.load(f)
-            description = topic_data.get('market_analysis', description)[:300]
-            category = topic_data.get('category', category)
+    topic_data = ctx.topic
+    if topic_data:
+        description = topic_data.get('market_analysis', description)[:300]
+        category = topic_data.get('category', category)
 
     print(f"📄 Title: {title}")
     print(f"🔗 URL: {url}")
@@ -322,5 +306,8 @@ def main():
     print("")
     print("✅ Social sharing complete!")
 
+def main():
+    run(RunContext.load())
+
 if __name__ == "__main__":
     main()
@@ -106,22 +106,22 @@ Referral Marketing Strategies for Real Estate Builders|referral marketing builde
 # Get topics
 SEASONAL=$(get_seasonal_topics)
 
+# First seasonal, then evergreen candidate (in listed order) that was not published
+# recently, would not overwrite a live post and does not compete with a live page's
+# keyword (re-angled when it does) - see publish_history.py / keyword_index.py
+PICK="$(dirname "$0")/publish_history.py"
+TOPIC_TYPE="seasonal"
+SELECTED_TOPIC=""
 if [ -n "$SEASONAL" ]; then
-    # Use seasonal topic
-    if command -v gshuf &> /dev/null; then
-        SELECTED_TOPIC=$(echo "$SEASONAL" | gshuf -n 1)
-    else
-        SELECTED_TOPIC=$(echo "$SEASONAL" | sort -R | head -1)
-    fi
-    TOPIC_TYPE="seasonal"
-else
-    # Use evergreen topic
-    if command -v gshuf &> /dev/null; then
-        SELECTED_TOPIC=$(echo "$EVERGREEN_TOPICS" | gshuf -n 1)
-    else
-        SELECTED_TOPIC=$(echo "$EVERGREEN_TOPICS" | sort -R | head -1)
-    fi
+    SELECTED_TOPIC=$(python3 "$PICK" pick <(echo "$SEASONAL") 2>/dev/null)
+fi
+if [ -z "$SELECTED_TOPIC" ]; then
     TOPIC_TYPE="evergreen"
+    SELECTED_TOPIC=$(python3 "$PICK" pick <(echo "$EVERGREEN_TOPICS") "$(dirname "$0")/topics.txt")
+fi
+if [ -z "$SELECTED_TOPIC" ]; then
+    echo "❌ No unused topic left in the seasonal, evergreen or topics.txt pools"
+    exit 1
 fi
 
 # Parse topic parts
@@ -139,8 +139,8 @@ echo "📊 Analyzing market trend..."
 
 ANALYSIS_PROMPT="You are a real estate market analyst in India. In 2-3 sentences, explain why '$TOPIC_TITLE' is relevant for real estate digital marketing right now in $(date '+%B %Y'). Consider current market conditions, buyer behavior, and seasonal factors."
 
-# Get analysis from Ollama
-MARKET_ANALYSIS=$(echo "$ANALYSIS_PROMPT" | timeout 90 ollama run llama3.2:latest 2>/dev/null | tr '\n' ' ' | head -c 500)
+# Get analysis from Ollama (same HTTP client and resident model as the article)
+MARKET_ANALYSIS=$(echo "$ANALYSIS_PROMPT" | python3 "$(dirname "$0")/ollama_client.py" generate --label market_analysis --num-predict 200 --timeout 90 | tr '\n' ' ' | head -c 500)
 
 if [ -z "$MARKET_ANALYSIS" ]; then
     MARKET_ANALYSIS="This topic is highly relevant for real estate marketers in the current market scenario, helping builders connect with potential buyers effectively."